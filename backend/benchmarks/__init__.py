@@ -0,0 +1 @@
+# P&L Model Backend Benchmarks
@@ -0,0 +1,107 @@
+"""
+冷启动导入耗时报告
+
+在全新的子进程中以 `python -X importtime` 导入目标模块，汇总各模块的自身 / 累计耗时，
+并列出启动时已导入的重型依赖（scipy、pandas、pyarrow 等应延迟到首次使用时导入）。
+
+用法（在 backend 目录下）：
+    python -m benchmarks.import_time                    # 默认目标 main（API 服务）
+    python -m benchmarks.import_time sweep_cli --top 20
+    python -m benchmarks.import_time main --repeat 5 --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 应延迟导入的重型依赖
+HEAVY_MODULES = ("scipy", "pandas", "pyarrow", "msgpack", "brotli", "httpx")
+
+
+def measure_imports(target: str, python: str = sys.executable) -> List[Dict]:
+    """
+    在子进程中导入 target，解析 -X importtime 输出
+
+    Returns:
+        [{"module", "self_us", "cumulative_us", "depth"}]，按导入完成顺序排列
+    """
+    completed = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    records = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        records.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+        })
+    return records
+
+
+def heavy_imports(records: List[Dict]) -> Dict[str, int]:
+    """启动时已导入的重型依赖 {顶层包: 累计耗时（微秒）}"""
+    return {
+        record["module"]: record["cumulative_us"]
+        for record in records
+        if record["module"] in HEAVY_MODULES
+    }
+
+
+def report(target: str, repeat: int = 3, top: int = 15) -> Dict:
+    """
+    多次冷启动导入，返回总耗时中位数、最慢的模块与已导入的重型依赖
+
+    总耗时取目标模块的累计耗时；各模块耗时取最后一次运行
+    """
+    runs = [measure_imports(target) for _ in range(repeat)]
+    totals = [next(r["cumulative_us"] for r in records if r["module"] == target) for records in runs]
+    records = runs[-1]
+    slowest = sorted(records, key=lambda r: r["cumulative_us"], reverse=True)
+    return {
+        "target": target,
+        "repeat": repeat,
+        "total_ms": statistics.median(totals) / 1000,
+        "heavy_imports_ms": {name: us / 1000 for name, us in heavy_imports(records).items()},
+        "slowest": [
+            {"module": r["module"], "cumulative_ms": r["cumulative_us"] / 1000, "self_ms": r["self_us"] / 1000}
+            for r in slowest[:top]
+        ],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="冷启动导入耗时报告")
+    parser.add_argument("target", nargs="?", default="main", help="导入的模块（默认 main）")
+    parser.add_argument("--repeat", type=int, default=3, help="冷启动次数（总耗时取中位数）")
+    parser.add_argument("--top", type=int, default=15, help="列出累计耗时最长的模块数")
+    parser.add_argument("--json", action="store_true", help="输出 JSON")
+    args = parser.parse_args(argv)
+
+    result = report(args.target, args.repeat, args.top)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"import {result['target']}: {result['total_ms']:.1f} ms（{result['repeat']} 次冷启动中位数）")
+    heavy = result["heavy_imports_ms"]
+    print("启动时导入的重型依赖: " + (", ".join(f"{k} {v:.1f} ms" for k, v in heavy.items()) or "无"))
+    print(f"\n{'累计 (ms)':>10} {'自身 (ms)':>10}  模块")
+    for r in result["slowest"]:
+        print(f"{r['cumulative_ms']:>10.1f} {r['self_ms']:>10.1f}  {r['module']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
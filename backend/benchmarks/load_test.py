@@ -0,0 +1,473 @@
+"""
+本地 HTTP 压测
+
+在子进程中启动 `uvicorn main:app`（结果存储与场景库放在临时目录，不影响本地数据），
+等待 /ready 后以固定并发回放 /api/simulate、/api/validate、/api/export 请求，
+请求体为 examples/sample_config.json 的变体（模拟天数、预算比例、CPI、ARPU 随机扰动）。
+
+报告：
+- 各接口与总体的吞吐量、p50/p95/p99 延迟（仅成功请求）、错误率与状态码分布（429 为准入控制拒绝）
+- 按采样间隔的时间线：吞吐量、错误数、服务进程（含子进程）CPU 占用与 RSS
+
+CPU / RSS 在 Linux 上读取 /proc，安装 psutil 时使用 psutil；均不可用时时间线只包含吞吐量。
+客户端只使用标准库（http.client，每个并发线程一个 keep-alive 连接）。
+
+用法（在 backend 目录下）：
+    python -m benchmarks.load_test                                  # 4 并发，20 秒
+    python -m benchmarks.load_test --concurrency 16 --duration 60 --workers 2
+    python -m benchmarks.load_test --requests 500 --mix simulate=1 --json
+    python -m benchmarks.load_test --url http://localhost:8000 --pid 12345   # 压测已启动的服务
+"""
+
+import argparse
+import copy
+import http.client
+import importlib
+import importlib.util
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_CONFIG = os.path.join(BACKEND_DIR, "examples", "sample_config.json")
+
+ENDPOINTS = {
+    "simulate": "/api/simulate",
+    "validate": "/api/validate",
+    "export": "/api/export?format=csv",
+}
+
+# 默认请求比例
+DEFAULT_MIX = {"simulate": 6, "validate": 3, "export": 1}
+
+# 变体的模拟天数
+VARIANT_DAYS = (30, 90, 180, 365)
+
+# 等待服务就绪的超时（秒）
+STARTUP_TIMEOUT = 60.0
+
+# 单个请求超时（秒）
+REQUEST_TIMEOUT = 120.0
+
+
+def has_psutil() -> bool:
+    return importlib.util.find_spec("psutil") is not None
+
+
+def make_variants(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    sample_config.json 的变体
+
+    第一个为原始配置；其余随机选择模拟天数，并对预算比例、CPI、IAP ARPU 做 ±20–50% 扰动
+    """
+    with open(SAMPLE_CONFIG, encoding="utf-8") as f:
+        base = json.load(f)
+    rng = random.Random(seed)
+    variants = [base]
+    for _ in range(count - 1):
+        config = copy.deepcopy(base)
+        config["simulation_days"] = rng.choice(VARIANT_DAYS)
+        config["budget"]["base_ratio"] = round(base["budget"]["base_ratio"] * rng.uniform(0.5, 1.5), 3)
+        config["defaults"]["cpi"] = round(base["defaults"]["cpi"] * rng.uniform(0.8, 1.2), 3)
+        config["defaults"]["arpu_iap"] = round(base["defaults"]["arpu_iap"] * rng.uniform(0.8, 1.2), 5)
+        variants.append(config)
+    return variants[:count]
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """解析请求比例，如 "simulate=6,validate=3,export=1"（未列出的接口不请求）"""
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"未知的接口: {name}（可选 {', '.join(ENDPOINTS)}）")
+        mix[name] = float(weight) if weight else 1.0
+    if not any(weight > 0 for weight in mix.values()):
+        raise ValueError("请求比例之和必须大于 0")
+    return mix
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(
+    port: Optional[int] = None, workers: int = 1, env: Optional[Dict[str, str]] = None
+) -> Tuple[subprocess.Popen, str, tempfile.TemporaryDirectory]:
+    """
+    在子进程中启动 uvicorn main:app 并等待 /ready
+
+    Returns:
+        (进程, 服务地址, 临时目录)；调用方负责 stop_server()
+
+    Raises:
+        RuntimeError: 服务退出或超时未就绪
+    """
+    port = port or _free_port()
+    data_dir = tempfile.TemporaryDirectory(prefix="pl_load_test_")
+    server_env = dict(os.environ)
+    server_env.update({
+        "PL_RESULT_STORE_DIR": os.path.join(data_dir.name, "results"),
+        "PL_SCENARIO_DB": os.path.join(data_dir.name, "scenarios.sqlite3"),
+    })
+    server_env.update(env or {})
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        cwd=BACKEND_DIR, env=server_env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            data_dir.cleanup()
+            raise RuntimeError(f"服务启动失败（退出码 {process.returncode}）")
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+        try:
+            connection.request("GET", "/ready")
+            if connection.getresponse().status == 200:
+                return process, base_url, data_dir
+        except OSError:
+            pass
+        finally:
+            connection.close()
+        time.sleep(0.1)
+
+    stop_server(process, data_dir)
+    raise RuntimeError(f"服务在 {STARTUP_TIMEOUT:.0f} 秒内未就绪")
+
+
+def stop_server(process: subprocess.Popen, data_dir: Optional[tempfile.TemporaryDirectory] = None) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    if data_dir is not None:
+        data_dir.cleanup()
+
+
+def _proc_tree(pid: int) -> List[int]:
+    """进程及其所有子进程（读取 /proc/<pid>/task/*/children）"""
+    pids = [pid]
+    for current in pids:
+        task_dir = f"/proc/{current}/task"
+        for task in os.listdir(task_dir) if os.path.isdir(task_dir) else ():
+            try:
+                with open(f"{task_dir}/{task}/children") as f:
+                    pids.extend(int(child) for child in f.read().split())
+            except OSError:
+                continue
+    return pids
+
+
+def process_usage(pid: int) -> Optional[Tuple[float, int]]:
+    """
+    进程（含子进程）累计 CPU 时间（秒）与 RSS（字节）
+
+    Returns:
+        进程不存在或平台不支持时返回 None
+    """
+    if has_psutil():
+        psutil = importlib.import_module("psutil")
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+            cpu = rss = 0
+            for process in processes:
+                times = process.cpu_times()
+                cpu += times.user + times.system
+                rss += process.memory_info().rss
+            return cpu, rss
+        except psutil.Error:
+            return None
+
+    if not os.path.exists(f"/proc/{pid}/stat"):
+        return None
+    ticks = os.sysconf("SC_CLK_TCK")
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    cpu = rss = 0
+    for current in _proc_tree(pid):
+        try:
+            with open(f"/proc/{current}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{current}/statm") as f:
+                resident = int(f.read().split()[1])
+        except OSError:
+            continue
+        # fields[0] 为状态（stat 第 3 列），utime / stime 为第 14 / 15 列
+        cpu += (int(fields[11]) + int(fields[12])) / ticks
+        rss += resident * page_size
+    return cpu, rss
+
+
+class _Sampler(threading.Thread):
+    """按间隔记录吞吐量、错误数与服务进程 CPU / RSS"""
+
+    def __init__(self, records: List[Tuple], pid: Optional[int], interval: float):
+        super().__init__(name="pl-load-sampler", daemon=True)
+        self.records = records
+        self.pid = pid
+        self.interval = interval
+        self.timeline: List[Dict[str, Any]] = []
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+    def run(self) -> None:
+        start = last_time = time.perf_counter()
+        last_count = 0
+        last_usage = process_usage(self.pid) if self.pid else None
+        while not self._stop_event.wait(self.interval):
+            now = time.perf_counter()
+            records = self.records[last_count:]
+            sample = {
+                "t": round(now - start, 2),
+                "throughput_rps": round(len(records) / (now - last_time), 2),
+                "errors": sum(1 for record in records if not 200 <= record[1] < 300),
+            }
+            usage = process_usage(self.pid) if self.pid else None
+            if usage and last_usage:
+                sample["cpu_percent"] = round((usage[0] - last_usage[0]) / (now - last_time) * 100, 1)
+                sample["rss_mb"] = round(usage[1] / 1024 / 1024, 1)
+            self.timeline.append(sample)
+            last_time, last_count, last_usage = now, last_count + len(records), usage
+
+
+def _worker(
+    base_url: str,
+    bodies: List[bytes],
+    mix: Dict[str, float],
+    records: List[Tuple],
+    deadline: float,
+    remaining: List[Optional[int]],
+    lock: threading.Lock,
+    seed: int,
+) -> None:
+    """单个并发连接：按比例随机选择接口与请求体，直到超时或请求数用完"""
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    url = urlsplit(base_url)
+    connection = http.client.HTTPConnection(url.hostname, url.port, timeout=REQUEST_TIMEOUT)
+    headers = {"Content-Type": "application/json", "Accept": "application/json"}
+
+    while time.perf_counter() < deadline:
+        with lock:
+            if remaining[0] is not None:
+                if remaining[0] == 0:
+                    break
+                remaining[0] -= 1
+        name = rng.choices(names, weights)[0]
+        body = rng.choice(bodies)
+        start = time.perf_counter()
+        try:
+            connection.request("POST", ENDPOINTS[name], body=body, headers=headers)
+            response = connection.getresponse()
+            size = len(response.read())
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            connection = http.client.HTTPConnection(url.hostname, url.port, timeout=REQUEST_TIMEOUT)
+            size, status = 0, 0
+        end = time.perf_counter()
+        records.append((name, status, end - start, end, size))
+    connection.close()
+
+
+def _latency_stats(records: List[Tuple], elapsed: float) -> Dict[str, Any]:
+    statuses: Dict[str, int] = {}
+    for record in records:
+        statuses[str(record[1])] = statuses.get(str(record[1]), 0) + 1
+    errors = sum(1 for record in records if not 200 <= record[1] < 300)
+    latencies = np.array([record[2] for record in records if 200 <= record[1] < 300]) * 1000
+    stats = {
+        "requests": len(records),
+        "errors": errors,
+        "error_rate": round(errors / len(records), 4) if records else 0.0,
+        "status_codes": statuses,
+        "throughput_rps": round(len(records) / elapsed, 2) if elapsed > 0 else 0.0,
+        "bytes": sum(record[4] for record in records),
+    }
+    if len(latencies):
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        stats.update({
+            "mean_ms": round(float(latencies.mean()), 2),
+            "p50_ms": round(float(p50), 2),
+            "p95_ms": round(float(p95), 2),
+            "p99_ms": round(float(p99), 2),
+            "max_ms": round(float(latencies.max()), 2),
+        })
+    return stats
+
+
+def summarize(records: List[Tuple], elapsed: float) -> Dict[str, Any]:
+    """
+    汇总请求记录
+
+    Args:
+        records: [(接口, 状态码, 延迟秒, 完成时刻, 响应字节数)]，状态码 0 表示连接错误
+        elapsed: 压测时长（秒）
+    """
+    by_endpoint = {
+        name: _latency_stats([record for record in records if record[0] == name], elapsed)
+        for name in ENDPOINTS
+        if any(record[0] == name for record in records)
+    }
+    return {"total": _latency_stats(records, elapsed), "by_endpoint": by_endpoint}
+
+
+def run_load_test(
+    base_url: str,
+    concurrency: int = 4,
+    duration: float = 20.0,
+    requests: Optional[int] = None,
+    mix: Optional[Dict[str, float]] = None,
+    variants: int = 20,
+    seed: int = 0,
+    pid: Optional[int] = None,
+    sample_interval: float = 1.0,
+) -> Dict[str, Any]:
+    """
+    对运行中的服务压测
+
+    Args:
+        base_url: 服务地址
+        concurrency: 并发连接数
+        duration: 压测时长（秒）；指定 requests 时为上限
+        requests: 总请求数（为空时按时长）
+        mix: 接口请求比例，默认 DEFAULT_MIX
+        variants: 请求体变体数（越少缓存命中越多）
+        seed: 随机种子
+        pid: 服务进程号（用于采样 CPU / RSS，为空时不采样）
+        sample_interval: 时间线采样间隔（秒）
+
+    Returns:
+        {"settings", "elapsed_s", "total", "by_endpoint", "timeline"}
+    """
+    mix = mix or dict(DEFAULT_MIX)
+    bodies = [json.dumps(config).encode() for config in make_variants(variants, seed)]
+    records: List[Tuple] = []
+    remaining: List[Optional[int]] = [requests]
+    lock = threading.Lock()
+
+    sampler = _Sampler(records, pid, sample_interval)
+    start = time.perf_counter()
+    deadline = start + duration if requests is None else float("inf")
+    threads = [
+        threading.Thread(
+            target=_worker,
+            args=(base_url, bodies, mix, records, deadline, remaining, lock, seed * 1000 + i),
+            name=f"pl-load-{i}", daemon=True,
+        )
+        for i in range(concurrency)
+    ]
+    sampler.start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    sampler.stop()
+
+    return {
+        "settings": {
+            "base_url": base_url,
+            "concurrency": concurrency,
+            "duration_s": duration if requests is None else None,
+            "requests": requests,
+            "mix": mix,
+            "variants": variants,
+            "seed": seed,
+        },
+        "elapsed_s": round(elapsed, 2),
+        **summarize(records, elapsed),
+        "timeline": sampler.timeline,
+    }
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    settings = report["settings"]
+    print(f"{settings['base_url']}  并发 {settings['concurrency']}  时长 {report['elapsed_s']:.1f} s  变体 {settings['variants']}")
+    print(f"\n{'接口':<10} {'请求数':>8} {'错误率':>8} {'吞吐 (rps)':>11} {'p50 (ms)':>10} {'p95 (ms)':>10} {'p99 (ms)':>10}  状态码")
+    rows = list(report["by_endpoint"].items()) + [("total", report["total"])]
+    for name, stats in rows:
+        print(
+            f"{name:<10} {stats['requests']:>8} {stats['error_rate']:>8.2%} {stats['throughput_rps']:>11.2f} "
+            f"{stats.get('p50_ms', float('nan')):>10.1f} {stats.get('p95_ms', float('nan')):>10.1f} "
+            f"{stats.get('p99_ms', float('nan')):>10.1f}  {stats['status_codes']}"
+        )
+    if report["timeline"]:
+        print(f"\n{'t (s)':>7} {'吞吐 (rps)':>11} {'错误':>6} {'CPU (%)':>8} {'RSS (MB)':>9}")
+        for sample in report["timeline"]:
+            print(
+                f"{sample['t']:>7.1f} {sample['throughput_rps']:>11.2f} {sample['errors']:>6} "
+                f"{sample.get('cpu_percent', float('nan')):>8.1f} {sample.get('rss_mb', float('nan')):>9.1f}"
+            )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="本地 HTTP 压测")
+    parser.add_argument("--concurrency", type=int, default=4, help="并发连接数")
+    parser.add_argument("--duration", type=float, default=20.0, help="压测时长（秒）")
+    parser.add_argument("--requests", type=int, help="总请求数（指定时忽略 --duration）")
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX), help="请求比例，如 simulate=6,validate=3,export=1")
+    parser.add_argument("--variants", type=int, default=20, help="请求体变体数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 工作进程数")
+    parser.add_argument("--url", help="压测已启动的服务（不启动本地服务）")
+    parser.add_argument("--pid", type=int, help="与 --url 一起使用：服务进程号，用于采样 CPU / RSS")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="时间线采样间隔（秒）")
+    parser.add_argument("--json", action="store_true", help="输出 JSON")
+    parser.add_argument("--output", help="同时把 JSON 报告写入文件")
+    args = parser.parse_args(argv)
+
+    process = data_dir = None
+    if args.url:
+        base_url, pid = args.url.rstrip("/"), args.pid
+    else:
+        process, base_url, data_dir = start_server(workers=args.workers)
+        pid = process.pid
+    try:
+        report = run_load_test(
+            base_url, args.concurrency, args.duration, args.requests, args.mix,
+            args.variants, args.seed, pid, args.sample_interval,
+        )
+    finally:
+        if process is not None:
+            stop_server(process, data_dir)
+    report["settings"]["workers"] = None if args.url else args.workers
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        _print_report(report)
+    return 1 if report["total"]["requests"] == 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
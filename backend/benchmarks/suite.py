@@ -0,0 +1,373 @@
+"""
+热点路径性能基准
+
+计时对象：
+- simulate: run_simulation，模拟天数 × 地区数（quick: 30/180/365 天 × 1/6 个地区；full: 30/180/365/730 天 × 1/6/50 个地区）
+- fit_retention: 留存曲线拟合（绕过 fit_retention_params 的缓存）
+- calculate_dau: DAUCalculator.calculate_dau 单次调用，历史 DNU 长度 100/200/400/800
+- validate_config: 配置 JSON 解析 + validate_config
+- serialize_result: SimulationResult.model_dump_json，180/365/730 天
+
+每个用例多轮计时，报告 ops/sec、p50/p95/p99（毫秒）与单轮峰值内存（tracemalloc，仅统计 Python 分配，含 NumPy 数组）。
+同一组内按规模（天数 / 历史长度）拟合 log(最短耗时) 对 log(规模) 的斜率作为复杂度指数，
+超过 SCALING_LIMITS 加 SCALING_SLACK 视为回退（模拟为逐日遍历历史队列，上限为二次）。
+回退检查使用每轮最短耗时（min）：调度与其他进程的干扰只会让单轮变慢，最短耗时比 p50 稳定得多。
+
+基线为 baselines/<profile>.json（与机器相关，应在同一台机器上保存与比较）。用法（在 backend 目录下）：
+    python -m benchmarks.suite                          # quick 档位，打印结果
+    python -m benchmarks.suite --profile full --save    # 保存基线
+    python -m benchmarks.suite --compare                # 与基线比较，最短耗时变慢超过 2 倍或指数超限时返回 1
+    python -m benchmarks.suite --filter simulate --json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from src.core.dau import DAUCalculator
+from src.core.retention import fit_retention_params
+from src.core.simulator import ENGINE_VERSION, run_simulation
+from src.models.config import BudgetConfig, SimulationConfig
+from src.models.results import SimulationResult
+from src.utils.validation import validate_config
+
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+PROFILES = {
+    "quick": {"days": (30, 180, 365), "regions": (1, 6), "history": (100, 200, 400, 800), "serialize_days": (180, 365)},
+    "full": {"days": (30, 180, 365, 730), "regions": (1, 6, 50), "history": (100, 200, 400, 800), "serialize_days": (180, 365, 730)},
+}
+
+# 每个用例的计时轮数与时间预算：至少 MIN_ROUNDS 轮，累计超过 MIN_TIME 秒或达到 MAX_ROUNDS 轮后停止
+MIN_ROUNDS = 3
+MAX_ROUNDS = 200
+MIN_TIME = 0.5
+
+# 最短耗时变慢超过该倍数视为回退（高于同一机器上重复运行的波动）
+REGRESSION_TOLERANCE = 2.0
+
+# 变慢的绝对值不超过该值（毫秒）时不视为回退：亚毫秒用例受机器频率与调度影响，相对波动可达 2 倍以上
+REGRESSION_FLOOR_MS = 0.5
+
+# 各组复杂度指数上限（按组名 "/" 前的部分匹配）与允许的测量误差
+SCALING_LIMITS = {"simulate": 2.0, "calculate_dau": 1.0, "serialize_result": 1.0}
+SCALING_SLACK = 0.35
+
+START_DATE = "2025-01-01"
+
+
+def make_config(days: int, n_regions: int) -> SimulationConfig:
+    """n_regions 个地区、均分预算的配置；6 个地区时使用默认地区分配"""
+    if n_regions == 6:
+        budget = BudgetConfig()
+    else:
+        budget = BudgetConfig(region_distribution={f"R{i:02d}": 1 / n_regions for i in range(n_regions)})
+    return SimulationConfig(simulation_days=days, start_date=START_DATE, budget=budget)
+
+
+@lru_cache(maxsize=None)
+def _result(days: int) -> SimulationResult:
+    return run_simulation(make_config(days, 6))
+
+
+@lru_cache(maxsize=None)
+def _calculator() -> DAUCalculator:
+    return DAUCalculator(300000, *fit_retention_params(*SimulationConfig().defaults.retention.to_list()))
+
+
+def _dau_calculator(history: int) -> DAUCalculator:
+    """复用同一个计算器（留存率缓存已预热，与模拟中逐日调用的情形一致），重置历史 DNU"""
+    calculator = _calculator()
+    calculator.dnu_history = [1000] * history
+    calculator.current_day = history
+    return calculator
+
+
+def build_cases(profile: str = "quick") -> List[Dict[str, Any]]:
+    """
+    生成用例列表
+
+    每个用例为 {"name", "group", "size", "setup", "func"}：setup() 在每轮计时前调用（不计时），
+    返回值传给 func；size 为组内规模（用于拟合复杂度指数），无规模的用例为 None
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"未知的档位: {profile}（可选 {', '.join(PROFILES)}）")
+    spec = PROFILES[profile]
+    cases = []
+
+    for n_regions in spec["regions"]:
+        for days in spec["days"]:
+            cases.append({
+                "name": f"simulate[{days}d-{n_regions}r]",
+                "group": f"simulate/{n_regions}r",
+                "size": days,
+                "setup": lambda days=days, n_regions=n_regions: make_config(days, n_regions),
+                "func": run_simulation,
+            })
+
+    retention = SimulationConfig().defaults.retention.to_list()
+    cases.append({
+        "name": "fit_retention",
+        "group": "fit_retention",
+        "size": None,
+        "setup": lambda: retention,
+        "func": lambda values: fit_retention_params.__wrapped__(*values),
+    })
+
+    for history in spec["history"]:
+        cases.append({
+            "name": f"calculate_dau[{history}]",
+            "group": "calculate_dau",
+            "size": history,
+            "setup": lambda history=history: _dau_calculator(history),
+            "func": lambda calculator: calculator.calculate_dau(1000),
+        })
+
+    payload = make_config(365, 6).model_dump_json()
+    cases.append({
+        "name": "validate_config",
+        "group": "validate_config",
+        "size": None,
+        "setup": lambda: payload,
+        "func": lambda data: validate_config(SimulationConfig.model_validate_json(data)),
+    })
+
+    for days in spec["serialize_days"]:
+        cases.append({
+            "name": f"serialize_result[{days}d]",
+            "group": "serialize_result",
+            "size": days,
+            "setup": lambda days=days: _result(days),
+            "func": lambda result: result.model_dump_json(),
+        })
+    return cases
+
+
+def measure(
+    func: Callable[[Any], Any],
+    setup: Callable[[], Any] = lambda: None,
+    min_rounds: int = MIN_ROUNDS,
+    max_rounds: int = MAX_ROUNDS,
+    min_time: float = MIN_TIME,
+) -> Dict[str, float]:
+    """
+    多轮计时单个用例
+
+    Returns:
+        {"rounds", "ops_per_sec", "mean_ms", "min_ms", "p50_ms", "p95_ms", "p99_ms", "peak_memory_kb"}；
+        峰值内存另跑一轮测量（tracemalloc 会拖慢计时）
+    """
+    func(setup())  # 预热（首次调用的导入与缓存开销不计入）
+    timings = []
+    elapsed = 0.0
+    while len(timings) < max_rounds and (len(timings) < min_rounds or elapsed < min_time):
+        args = setup()
+        gc.collect()
+        start = time.perf_counter()
+        func(args)
+        duration = time.perf_counter() - start
+        timings.append(duration)
+        elapsed += duration
+
+    args = setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    ms = np.array(timings) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "rounds": len(timings),
+        "ops_per_sec": round(1000 / ms.mean(), 3),
+        "mean_ms": round(float(ms.mean()), 4),
+        "min_ms": round(float(ms.min()), 4),
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def scaling_exponents(cases: List[Dict[str, Any]], results: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+    """各组 log(最短耗时) 对 log(规模) 的最小二乘斜率（组内至少 2 个规模）"""
+    groups: Dict[str, List[tuple]] = {}
+    for case in cases:
+        if case["size"] is not None and case["name"] in results:
+            groups.setdefault(case["group"], []).append((case["size"], results[case["name"]]["min_ms"]))
+    exponents = {}
+    for group, points in groups.items():
+        if len(points) >= 2:
+            sizes, times = np.array(points, dtype=np.float64).T
+            exponents[group] = round(float(np.polyfit(np.log(sizes), np.log(times), 1)[0]), 3)
+    return exponents
+
+
+def run_suite(
+    profile: str = "quick",
+    name_filter: Optional[str] = None,
+    progress: Optional[Callable[[str, Dict[str, float]], None]] = None,
+    **measure_options: Any,
+) -> Dict[str, Any]:
+    """
+    运行基准
+
+    Args:
+        profile: 档位（quick / full）
+        name_filter: 只运行名称包含该子串的用例
+        progress: 每个用例完成后的回调 (name, stats)
+        measure_options: 传给 measure() 的计时参数
+
+    Returns:
+        {"profile", "created", "machine", "engine", "results": {用例: 统计}, "scaling": {组: 指数}}
+    """
+    cases = [case for case in build_cases(profile) if not name_filter or name_filter in case["name"]]
+    results = {}
+    for case in cases:
+        results[case["name"]] = measure(case["func"], case["setup"], **measure_options)
+        if progress:
+            progress(case["name"], results[case["name"]])
+    return {
+        "profile": profile,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "machine": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "engine": {"version": ENGINE_VERSION, "revision": git_revision()},
+        "results": results,
+        "scaling": scaling_exponents(cases, results),
+    }
+
+
+def git_revision() -> Optional[str]:
+    """当前代码的 git 提交（基线记录所测的引擎版本；不在 git 仓库中时返回 None）"""
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def baseline_path(profile: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{profile}.json")
+
+
+def save_baseline(report: Dict[str, Any], path: Optional[str] = None) -> str:
+    path = path or baseline_path(report["profile"])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    return path
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(
+    report: Dict[str, Any],
+    baseline: Optional[Dict[str, Any]] = None,
+    tolerance: float = REGRESSION_TOLERANCE,
+) -> List[str]:
+    """
+    检查回退
+
+    - 两边都有的用例最短耗时变慢超过 tolerance 倍，且绝对值超过 REGRESSION_FLOOR_MS
+    - 复杂度指数超过 SCALING_LIMITS + SCALING_SLACK（不依赖基线）
+
+    Returns:
+        回退说明列表，为空表示无回退
+    """
+    regressions = []
+    if baseline is not None:
+        for name, stats in report["results"].items():
+            previous = baseline["results"].get(name)
+            if (
+                previous
+                and stats["min_ms"] > previous["min_ms"] * tolerance
+                and stats["min_ms"] - previous["min_ms"] > REGRESSION_FLOOR_MS
+            ):
+                regressions.append(
+                    f"{name}: 最短 {stats['min_ms']:.3f} ms，基线 {previous['min_ms']:.3f} ms"
+                    f"（{stats['min_ms'] / previous['min_ms']:.2f}x）"
+                )
+    for group, exponent in report["scaling"].items():
+        limit = SCALING_LIMITS.get(group.split("/")[0])
+        if limit is not None and exponent > limit + SCALING_SLACK:
+            regressions.append(f"{group}: 复杂度指数 {exponent:.2f}，上限 {limit:.1f}")
+    return regressions
+
+
+def _print_row(name: str, stats: Dict[str, float]) -> None:
+    print(
+        f"{name:<28} {stats['ops_per_sec']:>12.2f} {stats['p50_ms']:>11.3f} {stats['p95_ms']:>11.3f} "
+        f"{stats['p99_ms']:>11.3f} {stats['peak_memory_kb']:>12.1f} {stats['rounds']:>6}"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="热点路径性能基准")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick", help="档位（默认 quick）")
+    parser.add_argument("--filter", dest="name_filter", help="只运行名称包含该子串的用例")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME, help="每个用例的最短计时时间（秒）")
+    parser.add_argument("--save", nargs="?", const="", metavar="PATH", help="保存为基线（默认 baselines/<profile>.json）")
+    parser.add_argument("--compare", nargs="?", const="", metavar="PATH", help="与基线比较，有回退时返回 1")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE, help="最短耗时允许变慢的倍数")
+    parser.add_argument("--json", action="store_true", help="输出 JSON")
+    args = parser.parse_args(argv)
+
+    if not args.json:
+        print(f"{'用例':<28} {'ops/sec':>12} {'p50 (ms)':>11} {'p95 (ms)':>11} {'p99 (ms)':>11} {'峰值内存 (KB)':>12} {'轮数':>6}")
+    report = run_suite(
+        args.profile, args.name_filter,
+        progress=None if args.json else _print_row,
+        min_time=args.min_time,
+    )
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print("\n复杂度指数: " + (", ".join(f"{k} {v:.2f}" for k, v in report["scaling"].items()) or "无"))
+
+    if args.save is not None:
+        path = save_baseline(report, args.save or None)
+        print(f"基线已保存: {path}", file=sys.stderr)
+
+    if args.compare is not None:
+        path = args.compare or baseline_path(args.profile)
+        baseline = load_baseline(path) if os.path.exists(path) else None
+        if baseline is None:
+            print(f"基线不存在: {path}，只检查复杂度指数", file=sys.stderr)
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"回退: {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,17 +3,33 @@ P&L Model API Server
 
 启动命令：
     uvicorn main:app --reload --host 0.0.0.0 --port 8000
+
+每个工作进程启动时在后台预热（见 src/core/warmup.py，深度由 PL_WARMUP_DEPTH 控制），
+预热完成前 /ready 返回 503；/health 只表示进程存活。
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from src.api import router
+from src.api import routes
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """启动时在后台线程中预热"""
+    routes.warmup_state.start()
+    yield
+
 
 app = FastAPI(
     title="P&L Model API",
     description="P&L（损益）预估模型 API，支持多地区、多维度参数配置的 DAU 和财务模拟",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS 配置，允许前端跨域访问
@@ -35,6 +51,13 @@ async def health_check():
     return {"status": "healthy", "service": "pl-model-api"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """就绪检查接口：启动预热完成前返回 503，完成后返回预热各阶段耗时"""
+    warmup = routes.warmup_state.to_dict()
+    return JSONResponse(status_code=200 if warmup["ready"] else 503, content=warmup)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -2,25 +2,129 @@
 FastAPI 路由定义
 """
 
-import io
-import csv
-from typing import Optional
-from fastapi import APIRouter, HTTPException, Query
+import json
+import os
+import time
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from pydantic import ValidationError
 from fastapi.responses import StreamingResponse
 
-from ..models.config import SimulationConfig
-from ..models.results import SimulationResult, ValidationResult
-from ..core.simulator import run_simulation
+from ..models.config import (
+    SimulationConfig, SensitivityRequest, MonteCarloConfig, SweepConfig, PatchOperation, ScenarioCreate, JobRequest,
+)
+from ..models.results import (
+    SimulationResult, ValidationResult, SensitivityResult, MonteCarloResult, SweepResult,
+    ScenarioSummary, ScenarioList, JobStatus,
+)
+from ..core.incremental import IncrementalSimulator
+from ..core.jobs import JobManager
+from ..core.simulator import ENGINE_VERSION, SimulationEngine
+from ..core.sensitivity import run_sensitivity
+from ..core.montecarlo import run_monte_carlo
+from ..core.sweep import run_sweep, grid_size
+from ..core.parallel import default_workers, run_monte_carlo_parallel, run_sweep_parallel
+from ..core.warmup import WarmupState
 from ..utils.validation import validate_config
+from ..utils.jsonpatch import PatchError, patch_config
+from ..utils.etag import make_etag, etag_matches
+from ..utils.encoding import MSGPACK_MEDIA_TYPE, encoded_response, negotiate
+from ..utils.admission import AdmissionController, AdmissionRejected, request_cost
+from ..store.results import ResultStore, StoredResult, result_id_for
+from ..store.scenarios import ScenarioLibrary
 
 router = APIRouter()
 
+# /api/sweep 同步执行的最大网格点数（与蒙特卡洛样本数上限一致；更大的网格通过 /api/jobs 或 sweep_cli.py 运行）
+MAX_SWEEP_POINTS = int(os.environ.get("PL_MAX_SWEEP_POINTS", 100_000))
+
+# 增量模拟器：缓存最近配置的检查点，修改后段参数时只重算变化之后的天数
+incremental_simulator = IncrementalSimulator()
+
+# 结果存储：按结果 ID 读取与导出，无需重新模拟
+result_store = ResultStore()
+
+# 场景库：保存配置、汇总指标与压缩时序，按索引的汇总列筛选排序
+scenario_library = ScenarioLibrary()
+
+# 后台任务：耗时的模拟 / 蒙特卡洛 / 网格扫描（设置 PL_JOB_QUEUE_DIR 时任务在重启后恢复）
+job_manager = JobManager()
+
+
+# 准入控制：限制同时运行的计算请求数与总成本，超出时以 429 拒绝
+admission = AdmissionController()
+
+# 启动预热状态（由 main.py 在启动时开始预热，/ready 据此报告就绪）
+warmup_state = WarmupState()
+
+
+async def _run_admitted(cost: int, func, *args):
+    """申请准入后在线程池中执行计算（不阻塞事件循环）"""
+    try:
+        async with admission.admit(cost):
+            return await run_in_threadpool(func, *args)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=429,
+            detail={"message": f"服务繁忙（{e.reason}），请稍后重试", "retry_after": e.retry_after},
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+def _simulate_and_store(config: SimulationConfig) -> SimulationResult:
+    """运行模拟并写入结果存储，返回带 result_id 的结果"""
+    result = incremental_simulator.simulate(config)
+    result.result_id = result_store.put(result_id_for(config), result)
+    return result
+
+
+# 按 ID 读取的结果由配置指纹决定、内容不变，允许本地反向代理缓存
+RESULT_CACHE_CONTROL = "public, max-age=3600"
+
+
+def _not_modified(request: Request, etag: str, cache_control: str = "no-cache") -> Optional[Response]:
+    """If-None-Match 命中时返回 304（不运行模拟、不序列化结果）"""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    return None
+
+
+def _negotiate(request: Request):
+    """协商 (内容类型, 压缩方式)，不接受 JSON 与 msgpack 时返回 406"""
+    media_type, encoding = negotiate(request.headers)
+    if media_type is None:
+        raise HTTPException(
+            status_code=406,
+            detail={"message": "不支持请求的内容类型，可用 application/json 或 application/msgpack（需安装 msgpack）"},
+        )
+    return media_type, encoding
+
+
+def _encode_result(result: SimulationResult, media_type: str, encoding: Optional[str], headers) -> Response:
+    """按协商结果编码 SimulationResult（msgpack 时时序直接由内存中的结果转为数组，不读取结果存储）"""
+    def msgpack_payload():
+        stored = StoredResult.from_result(result.result_id, result)
+        return {
+            "status": result.status,
+            "execution_time_ms": result.execution_time_ms,
+            **stored.project(None, 0, stored.days, arrays=True),
+        }
+
+    return encoded_response(
+        media_type, encoding, lambda: result.model_dump_json().encode(), msgpack_payload, headers,
+    )
+
 
 @router.post("/simulate", response_model=SimulationResult)
-async def simulate(config: SimulationConfig) -> SimulationResult:
+async def simulate(config: SimulationConfig, request: Request) -> SimulationResult:
     """
     运行 P&L 模拟
     
+    响应附带由配置指纹与引擎版本生成的 ETag；请求的 If-None-Match 命中时直接返回 304。
+    按 Accept 返回 JSON 或 MessagePack，按 Accept-Encoding 以 br / gzip 压缩
+    
     Args:
         config: 模拟配置
         
@@ -40,9 +144,16 @@ async def simulate(config: SimulationConfig) -> SimulationResult:
                 }
             )
         
-        # 运行模拟
-        result = run_simulation(config)
-        return result
+        media_type, encoding = _negotiate(request)
+        etag = make_etag(config.fingerprint(), ENGINE_VERSION, media_type, encoding or "identity")
+        not_modified = _not_modified(request, etag)
+        if not_modified is not None:
+            return not_modified
+        
+        # 运行模拟（复用缓存中输入相同的前缀）并保存结果
+        result = await _run_admitted(request_cost(config), _simulate_and_store, config)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        return await run_in_threadpool(_encode_result, result, media_type, encoding, headers)
     
     except HTTPException:
         raise
@@ -53,6 +164,304 @@ async def simulate(config: SimulationConfig) -> SimulationResult:
         )
 
 
+@router.post("/simulate/stream")
+async def simulate_stream(
+    config: SimulationConfig,
+    batch: str = Query(default="week", pattern="^(week|month)$", description="每批天数：week（7 天）或 month（自然月）"),
+):
+    """
+    流式运行模拟（Server-Sent Events）
+    
+    事件：
+    - start: 模拟天数、开始日期、活跃地区
+    - batch: 每周 / 每月一批的汇总与分地区时序，附当前累计值与里程碑
+    - done: 汇总信息与 result_id（完整结果可由 /api/results/{id} 读取）
+    - error: 模拟失败
+    
+    客户端断开连接后模拟随即停止
+    
+    与其他计算接口一样经过准入控制；开始推送后无法再返回 429，
+    被拒绝时以 error 事件（含 retry_after）结束
+    """
+    return _stream_simulation(config, batch)
+
+
+@router.get("/simulate/stream")
+async def simulate_stream_get(
+    config: Optional[str] = Query(default=None, description="JSON 编码的 SimulationConfig，为空时使用默认配置"),
+    batch: str = Query(default="week", pattern="^(week|month)$", description="每批天数：week（7 天）或 month（自然月）"),
+):
+    """流式运行模拟（GET 形式，供浏览器 EventSource 使用）"""
+    try:
+        parsed = SimulationConfig.model_validate_json(config) if config else SimulationConfig()
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "配置校验失败", "errors": [err["msg"] for err in e.errors()]}
+        )
+    return _stream_simulation(parsed, batch)
+
+
+def _stream_simulation(config: SimulationConfig, batch: str) -> StreamingResponse:
+    validation = validate_config(config)
+    if not validation.valid:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "配置校验失败", "errors": validation.errors, "warnings": validation.warnings},
+        )
+    return StreamingResponse(
+        _admitted_events(config, batch),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _admitted_events(config: SimulationConfig, batch: str):
+    """
+    申请准入后在线程池中逐批生成事件，推送结束或客户端断开时释放
+
+    准入在响应体开始迭代时申请，生成器未启动时不会占用名额
+    """
+    try:
+        async with admission.admit(request_cost(config)):
+            async for event in iterate_in_threadpool(_simulation_events(config, batch)):
+                yield event
+    except AdmissionRejected as e:
+        yield _sse("error", {"message": f"服务繁忙（{e.reason}），请稍后重试", "retry_after": e.retry_after})
+
+
+def _simulation_events(config: SimulationConfig, batch: str):
+    """逐批生成 SSE 事件（同步生成器，每批在线程池中运行）"""
+    start_time = time.time()
+    try:
+        engine = SimulationEngine(config)
+        yield _sse("start", {
+            "simulation_days": config.simulation_days,
+            "start_date": engine.start_date.isoformat(),
+            "regions": engine.active_regions,
+            "batch": batch,
+        })
+        for metrics in engine.iter_batches(batch):
+            yield _sse("batch", metrics)
+        
+        result = engine.result(start_time)
+        result.result_id = result_store.put(result_id_for(config), result)
+        yield _sse("done", {
+            "result_id": result.result_id,
+            "config_hash": result.config_hash,
+            "execution_time_ms": result.execution_time_ms,
+            "summary": result.summary.model_dump(mode="json"),
+        })
+    except Exception as e:
+        yield _sse("error", {"message": f"模拟执行失败: {str(e)}"})
+
+
+def _sse(event: str, data: dict) -> str:
+    """一条 SSE 消息"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/simulate/{base_hash}/delta", response_model=SimulationResult)
+async def simulate_delta(base_hash: str, operations: List[PatchOperation], request: Request) -> SimulationResult:
+    """
+    基于已缓存配置的增量模拟
+    
+    请求体为针对基准配置的 JSON Patch（RFC 6902），只校验补丁涉及的字段，
+    并通过增量重算复用与基准配置相同的前缀。
+    与 /api/simulate 相同：ETag 由补丁后配置的指纹生成（If-None-Match 命中时返回 304），
+    按 Accept / Accept-Encoding 协商 JSON 或 MessagePack 与压缩方式
+    
+    Args:
+        base_hash: 基准配置的 config_hash（来自之前的模拟结果）
+        operations: JSON Patch 操作列表
+        
+    Returns:
+        SimulationResult 对象（其 config_hash 可作为下一次增量请求的基准）
+    """
+    base = incremental_simulator.get_config(base_hash)
+    if base is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"message": f"基准配置 {base_hash} 不在缓存中，请先提交完整配置"}
+        )
+    
+    try:
+        config = patch_config(base, operations)
+    except PatchError as e:
+        raise HTTPException(status_code=400, detail={"message": str(e)})
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "配置校验失败", "errors": [err["msg"] for err in e.errors()]}
+        )
+    
+    validation = validate_config(config)
+    if not validation.valid:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "配置校验失败",
+                "errors": validation.errors,
+                "warnings": validation.warnings,
+            }
+        )
+    
+    media_type, encoding = _negotiate(request)
+    etag = make_etag(config.fingerprint(), ENGINE_VERSION, media_type, encoding or "identity")
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+    
+    try:
+        result = await _run_admitted(request_cost(config), _simulate_and_store, config)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        return await run_in_threadpool(_encode_result, result, media_type, encoding, headers)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={"message": f"模拟执行失败: {str(e)}"}
+        )
+
+
+@router.post("/sensitivity", response_model=SensitivityResult)
+async def sensitivity(request: SensitivityRequest) -> SensitivityResult:
+    """
+    参数敏感度分析
+    
+    单次前向传播，返回汇总指标对所选输入字段的精确梯度
+    
+    Args:
+        request: 模拟配置 + 求导的输入字段路径
+        
+    Returns:
+        SensitivityResult 对象
+    """
+    validation = validate_config(request.config)
+    if not validation.valid:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "配置校验失败",
+                "errors": validation.errors,
+                "warnings": validation.warnings,
+            }
+        )
+    
+    try:
+        # 前向模式自动微分：每个输入一个导数通道
+        cost = request_cost(request.config, len(request.inputs) + 1)
+        return await _run_admitted(cost, run_sensitivity, request.config, request.inputs)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"message": str(e)})
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={"message": f"敏感度分析失败: {str(e)}"}
+        )
+
+
+@router.post("/monte-carlo", response_model=MonteCarloResult)
+async def monte_carlo(
+    mc_config: MonteCarloConfig,
+    workers: int = Query(1, ge=1, le=64, description="工作进程数，大于 1 时多进程分片执行")
+) -> MonteCarloResult:
+    """
+    蒙特卡洛不确定性模拟
+    
+    按字段分布抽样，返回 DAU / 收入 / 利润的 P5/P50/P95 扇形图区间
+    
+    Args:
+        mc_config: 蒙特卡洛配置
+        workers: 工作进程数（结果与进程数无关）
+        
+    Returns:
+        MonteCarloResult 对象
+    """
+    validation = validate_config(mc_config.config)
+    if not validation.valid:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "配置校验失败",
+                "errors": validation.errors,
+                "warnings": validation.warnings,
+            }
+        )
+    
+    try:
+        cost = request_cost(mc_config.config, mc_config.samples)
+        workers = min(workers, default_workers())
+        if workers > 1:
+            return await _run_admitted(cost, run_monte_carlo_parallel, mc_config, workers)
+        return await _run_admitted(cost, run_monte_carlo, mc_config)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"message": str(e)})
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={"message": f"蒙特卡洛模拟失败: {str(e)}"}
+        )
+
+
+@router.post("/sweep", response_model=SweepResult)
+async def sweep(
+    sweep_config: SweepConfig,
+    workers: int = Query(1, ge=1, le=64, description="工作进程数，大于 1 时多进程分片执行")
+) -> SweepResult:
+    """
+    参数网格扫描
+    
+    对网格中每个点运行模拟，返回目标最优的前 k 个点及汇总指标分布
+    
+    Args:
+        sweep_config: 网格扫描配置
+        workers: 工作进程数（结果与进程数无关）
+        
+    Returns:
+        SweepResult 对象
+    """
+    validation = validate_config(sweep_config.config)
+    if not validation.valid:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "配置校验失败",
+                "errors": validation.errors,
+                "warnings": validation.warnings,
+            }
+        )
+    
+    points = grid_size(sweep_config.grid)
+    if points > MAX_SWEEP_POINTS:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": f"网格点数 {points} 超过上限 {MAX_SWEEP_POINTS}，请缩小网格或通过 /api/jobs 提交后台任务"},
+        )
+
+    # 工作进程数不超过 CPU 核数
+    workers = min(workers, default_workers())
+    try:
+        cost = request_cost(sweep_config.config, points)
+        if workers > 1:
+            return await _run_admitted(cost, run_sweep_parallel, sweep_config, workers)
+        return await _run_admitted(cost, run_sweep, sweep_config)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"message": str(e)})
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={"message": f"网格扫描失败: {str(e)}"}
+        )
+
+
 @router.post("/validate", response_model=ValidationResult)
 async def validate(config: SimulationConfig) -> ValidationResult:
     """
@@ -74,6 +483,8 @@ async def export_data(
     """
     导出模拟数据
     
+    相同配置已模拟过时直接从结果存储导出，不重新模拟；否则经准入控制后模拟
+    
     Args:
         config: 模拟配置
         format: 导出格式 (csv/json)
@@ -82,50 +493,26 @@ async def export_data(
         文件下载
     """
     try:
-        # 运行模拟
-        result = run_simulation(config)
+        result_id = result_id_for(config)
+        if not result_store.exists(result_id):
+            result = await _run_admitted(request_cost(config), _simulate_and_store, config)
+            result_id = result.result_id
         
+        stored = result_store.get(result_id)
         if format == "json":
             # JSON 格式
-            return result.model_dump()
+            return stored.to_result().model_dump()
         
-        else:
-            # CSV 格式
-            output = io.StringIO()
-            writer = csv.writer(output)
-            
-            # 写入表头
-            writer.writerow([
-                "Day", "Date", "DAU", "DNU_Organic", "DNU_Paid",
-                "Revenue", "Cost", "Profit", "Cumulative_Profit"
-            ])
-            
-            # 写入数据
-            cumulative_profit = 0.0
-            for i, day in enumerate(result.timeseries.days):
-                profit = result.timeseries.totals.profit[i]
-                cumulative_profit += profit
-                writer.writerow([
-                    day,
-                    result.timeseries.dates[i],
-                    result.timeseries.totals.dau[i],
-                    result.timeseries.totals.dnu_organic[i],
-                    result.timeseries.totals.dnu_paid[i],
-                    round(result.timeseries.totals.revenue[i], 2),
-                    round(result.timeseries.totals.cost[i], 2),
-                    round(profit, 2),
-                    round(cumulative_profit, 2),
-                ])
-            
-            output.seek(0)
-            return StreamingResponse(
-                iter([output.getvalue()]),
-                media_type="text/csv",
-                headers={
-                    "Content-Disposition": "attachment; filename=pl_simulation.csv"
-                }
-            )
+        return StreamingResponse(
+            stored.iter_csv(0, stored.days),
+            media_type="text/csv",
+            headers={
+                "Content-Disposition": "attachment; filename=pl_simulation.csv"
+            }
+        )
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -133,15 +520,296 @@ async def export_data(
         )
 
 
+@router.get("/results/{result_id}")
+async def get_result(
+    result_id: str,
+    request: Request,
+    fields: Optional[str] = Query(default=None, description="逗号分隔的字段路径，如 summary.milestones,timeseries.totals.dau"),
+    start_date: Optional[date] = Query(default=None, description="起始日期（含）"),
+    end_date: Optional[date] = Query(default=None, description="结束日期（含）"),
+    offset: int = Query(default=0, ge=0, description="在日期区间内跳过的天数"),
+    limit: Optional[int] = Query(default=None, ge=1, description="返回的最大天数"),
+    max_points: Optional[int] = Query(
+        default=None, ge=3, le=10000, description="每条时序最多返回的点数（LTTB 降采样，用于图表）；为空时返回逐日精确值",
+    ),
+):
+    """
+    按结果 ID 读取已保存的模拟结果
+    
+    支持字段投影、日期区间切片与分页；时序字段只返回所选区间。
+    给定 max_points 时每条时序按 LTTB 降采样为 {"days", "values"}，图表数据量与模拟天数无关。
+    响应可被反向代理缓存（Cache-Control），If-None-Match 命中时返回 304；
+    按 Accept 返回 JSON 或 MessagePack（时序为打包的数组），按 Accept-Encoding 压缩
+    
+    Returns:
+        与 SimulationResult 结构相同的字典（只含所选字段），附 total_days 与 range
+    """
+    if not result_store.exists(result_id):
+        raise HTTPException(status_code=404, detail={"message": f"结果 {result_id} 不存在"})
+    media_type, encoding = _negotiate(request)
+    etag = _result_etag(request, media_type, encoding or "identity")
+    not_modified = _not_modified(request, etag, RESULT_CACHE_CONTROL)
+    if not_modified is not None:
+        return not_modified
+    
+    try:
+        stored = result_store.get(result_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail={"message": f"结果 {result_id} 不存在"})
+    
+    i0, i1 = stored.day_range(start_date, end_date, offset, limit)
+    try:
+        output = stored.project(
+            _split_fields(fields), i0, i1, arrays=media_type == MSGPACK_MEDIA_TYPE, max_points=max_points,
+        )
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail={"message": str(e.args[0])})
+    return encoded_response(
+        media_type,
+        encoding,
+        lambda: json.dumps(output, ensure_ascii=False, separators=(",", ":")).encode(),
+        lambda: output,
+        {"ETag": etag, "Cache-Control": RESULT_CACHE_CONTROL},
+    )
+
+
+@router.get("/results/{result_id}/export")
+async def export_result(
+    result_id: str,
+    request: Request,
+    format: str = Query(default="csv", pattern="^(csv|json)$"),
+    fields: Optional[str] = Query(default=None, description="JSON 格式的字段投影"),
+    start_date: Optional[date] = Query(default=None, description="起始日期（含）"),
+    end_date: Optional[date] = Query(default=None, description="结束日期（含）"),
+):
+    """
+    从结果存储流式导出（不重新模拟）
+    
+    Args:
+        result_id: 结果 ID
+        format: 导出格式 (csv/json)
+    """
+    if not result_store.exists(result_id):
+        raise HTTPException(status_code=404, detail={"message": f"结果 {result_id} 不存在"})
+    etag = _result_etag(request)
+    not_modified = _not_modified(request, etag, RESULT_CACHE_CONTROL)
+    if not_modified is not None:
+        return not_modified
+    
+    try:
+        stored = result_store.get(result_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail={"message": f"结果 {result_id} 不存在"})
+    
+    cache_headers = {"ETag": etag, "Cache-Control": RESULT_CACHE_CONTROL}
+    i0, i1 = stored.day_range(start_date, end_date)
+    if format == "json":
+        try:
+            # 先投影一次以便在开始流式输出前报告字段错误
+            stored.project(_split_fields(fields), 0, 0)
+        except KeyError as e:
+            raise HTTPException(status_code=400, detail={"message": str(e.args[0])})
+        return StreamingResponse(
+            stored.iter_json(_split_fields(fields), i0, i1),
+            media_type="application/json",
+            headers={"Content-Disposition": f"attachment; filename=pl_{result_id[:8]}.json", **cache_headers},
+        )
+    
+    return StreamingResponse(
+        stored.iter_csv(i0, i1),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename=pl_{result_id[:8]}.csv", **cache_headers},
+    )
+
+
+def _result_etag(request: Request, *variant: str) -> str:
+    """
+    结果资源的 ETag：结果 ID 由配置指纹决定，
+    不同查询参数（投影、区间、格式）与编码（variant）为不同表示
+    """
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    return make_etag(request.url.path, query, ENGINE_VERSION, *variant)
+
+
+def _split_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """解析逗号分隔的字段列表"""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()]
+
+
+@router.post("/jobs", response_model=JobStatus, status_code=202)
+async def submit_job(job_request: JobRequest) -> JobStatus:
+    """
+    提交后台任务，立即返回任务 ID
+    
+    用 GET /api/jobs/{id} 查询进度与部分结果
+    """
+    try:
+        job = job_manager.submit(job_request.kind, job_request.request)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "任务请求校验失败", "errors": [err["msg"] for err in e.errors()]},
+        )
+    return JobStatus(**job.to_dict())
+
+
+@router.get("/jobs", response_model=List[JobStatus])
+async def list_jobs() -> List[JobStatus]:
+    """列出全部任务（不含结果）"""
+    return [JobStatus(**job.to_dict(include_result=False)) for job in job_manager.list()]
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str) -> JobStatus:
+    """查询任务状态、完成百分比与部分聚合结果；成功后返回完整结果"""
+    try:
+        return JobStatus(**job_manager.get(job_id).to_dict())
+    except KeyError:
+        raise HTTPException(status_code=404, detail={"message": f"任务 {job_id} 不存在"})
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=JobStatus)
+async def cancel_job(job_id: str) -> JobStatus:
+    """取消任务（运行中的任务在当前批次完成后停止）"""
+    try:
+        job = job_manager.get(job_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail={"message": f"任务 {job_id} 不存在"})
+    if job.finished:
+        raise HTTPException(status_code=409, detail={"message": f"任务 {job_id} 已结束（{job.status}）"})
+    return JobStatus(**job_manager.cancel(job_id).to_dict(include_result=False))
+
+
+@router.post("/scenarios", response_model=ScenarioSummary)
+async def save_scenario(request: ScenarioCreate) -> ScenarioSummary:
+    """
+    运行模拟并保存到场景库
+    
+    相同配置重复保存时只更新名称
+    """
+    validation = validate_config(request.config)
+    if not validation.valid:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "配置校验失败", "errors": validation.errors, "warnings": validation.warnings},
+        )
+    try:
+        result = await _run_admitted(request_cost(request.config), _simulate_and_store, request.config)
+        scenario_id = scenario_library.save(request.config, result, request.name)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail={"message": f"保存场景失败: {str(e)}"})
+    
+    summary, _, _ = scenario_library.get(scenario_id)
+    return ScenarioSummary(**summary)
+
+
+@router.get("/scenarios", response_model=ScenarioList)
+async def list_scenarios(
+    min_roi: Optional[float] = Query(default=None, description="最小 ROI"),
+    max_roi: Optional[float] = Query(default=None, description="最大 ROI"),
+    min_net_profit: Optional[float] = Query(default=None, description="最小净利润"),
+    max_net_profit: Optional[float] = Query(default=None, description="最大净利润"),
+    break_even_before: Optional[int] = Query(default=None, ge=1, description="盈亏平衡日不晚于该天（排除未达到的场景）"),
+    min_peak_dau: Optional[int] = Query(default=None, ge=0, description="最小 DAU 峰值"),
+    min_final_dau: Optional[int] = Query(default=None, ge=0, description="最小最终 DAU"),
+    max_final_dau: Optional[int] = Query(default=None, ge=0, description="最大最终 DAU"),
+    sort_by: str = Query(
+        default="created_at",
+        pattern="^(created_at|name|roi|net_profit|total_revenue|total_cost|break_even_day|first_profitable_day|peak_dau_value|final_dau)$",
+    ),
+    order: str = Query(default="desc", pattern="^(asc|desc)$"),
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+) -> ScenarioList:
+    """
+    按汇总指标筛选、排序、分页列出场景
+    
+    只读取数据库中索引的汇总列，不加载时序数据
+    """
+    bounds = {
+        "roi": (">=", min_roi, "<=", max_roi),
+        "net_profit": (">=", min_net_profit, "<=", max_net_profit),
+        "break_even_day": ("<=", break_even_before, None, None),
+        "peak_dau_value": (">=", min_peak_dau, None, None),
+        "final_dau": (">=", min_final_dau, "<=", max_final_dau),
+    }
+    filters = []
+    for column, (low_op, low, high_op, high) in bounds.items():
+        if low is not None:
+            filters.append((column, low_op, low))
+        if high is not None:
+            filters.append((column, high_op, high))
+    
+    total, rows = scenario_library.query(filters, sort_by, order == "desc", limit, offset)
+    return ScenarioList(
+        total=total, offset=offset, limit=limit, items=[ScenarioSummary(**row) for row in rows],
+    )
+
+
+@router.get("/scenarios/{scenario_id}")
+async def get_scenario(
+    scenario_id: str,
+    fields: Optional[str] = Query(default=None, description="逗号分隔的字段路径，如 summary.milestones,timeseries.totals.dau"),
+    start_date: Optional[date] = Query(default=None, description="起始日期（含）"),
+    end_date: Optional[date] = Query(default=None, description="结束日期（含）"),
+    max_points: Optional[int] = Query(default=None, ge=3, le=10000, description="每条时序最多返回的点数（LTTB 降采样）"),
+):
+    """
+    读取场景：汇总指标、配置与（按字段投影、日期区间切片、可降采样的）模拟结果
+    """
+    try:
+        summary, config, stored = scenario_library.get(scenario_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail={"message": f"场景 {scenario_id} 不存在"})
+    
+    i0, i1 = stored.day_range(start_date, end_date)
+    try:
+        result = stored.project(_split_fields(fields), i0, i1, max_points=max_points)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail={"message": str(e.args[0])})
+    return {"scenario": summary, "config": config.model_dump(mode="json"), "result": result}
+
+
+@router.delete("/scenarios/{scenario_id}")
+async def delete_scenario(scenario_id: str):
+    """从场景库删除场景"""
+    if not scenario_library.delete(scenario_id):
+        raise HTTPException(status_code=404, detail={"message": f"场景 {scenario_id} 不存在"})
+    return {"status": "success", "id": scenario_id}
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    运行指标：准入控制（运行数、队列深度、拒绝数）、增量模拟缓存与启动预热
+    """
+    return {
+        "admission": admission.metrics(),
+        "incremental": dict(incremental_simulator.stats),
+        "warmup": warmup_state.to_dict(),
+    }
+
+
 @router.get("/default-config", response_model=SimulationConfig)
-async def get_default_config() -> SimulationConfig:
+async def get_default_config(request: Request, response: Response) -> SimulationConfig:
     """
-    获取默认配置
+    获取默认配置（附 ETag，If-None-Match 命中时返回 304）
     
     Returns:
         默认的 SimulationConfig
     """
-    return SimulationConfig()
+    config = SimulationConfig()
+    etag = make_etag(config.model_dump_json(), ENGINE_VERSION)
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return config
 
 
 @router.get("/regions")
@@ -1,6 +1,15 @@
 from .retention import fit_retention_params, calc_retention_new, calc_retention_active
 from .dau import calculate_dau
-from .simulator import run_simulation
+from .simulator import run_simulation, SimulationEngine, branch
+from .checkpoint import SimulationState
+from .compiled import compile_config, CompiledConfig
+from .sensitivity import run_sensitivity
+from .batch import simulate_batch, BatchResult
+from .montecarlo import run_monte_carlo
+from .sweep import run_sweep
+from .parallel import run_monte_carlo_parallel, run_sweep_parallel
+from .preview import run_preview, estimate_error
+from .warmup import warm_up, WarmupState
 
 __all__ = [
     "fit_retention_params",
@@ -8,4 +17,20 @@ __all__ = [
     "calc_retention_active",
     "calculate_dau",
     "run_simulation",
+    "SimulationEngine",
+    "SimulationState",
+    "branch",
+    "compile_config",
+    "CompiledConfig",
+    "run_sensitivity",
+    "simulate_batch",
+    "BatchResult",
+    "run_monte_carlo",
+    "run_sweep",
+    "run_monte_carlo_parallel",
+    "run_sweep_parallel",
+    "run_preview",
+    "estimate_error",
+    "warm_up",
+    "WarmupState",
 ]
@@ -0,0 +1,170 @@
+"""
+流式聚合模块
+
+为蒙特卡洛等批量模拟提供固定内存、可合并的统计量：
+- RunningMoments: 计数、均值、方差、最值
+- QuantileSketch: 分位数草图（每列最多保留 size 个加权质心）
+
+所有统计量按列独立（如按天），逐批 update、按序 merge，
+相同的输入序列总是得到逐位相同的结果。
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+
+class RunningMoments:
+    """按列的流式均值/方差（Chan 并行合并公式）"""
+
+    def __init__(self, n_columns: int):
+        self.count = 0
+        self.mean = np.zeros(n_columns, dtype=np.float64)
+        self.m2 = np.zeros(n_columns, dtype=np.float64)
+        self.min = np.full(n_columns, np.inf)
+        self.max = np.full(n_columns, -np.inf)
+
+    def update(self, data: np.ndarray) -> "RunningMoments":
+        """
+        加入一批观测
+
+        Args:
+            data: (n, n_columns) 观测值
+        """
+        other = RunningMoments(data.shape[1])
+        other.count = data.shape[0]
+        if other.count:
+            other.mean = data.mean(axis=0)
+            other.m2 = ((data - other.mean) ** 2).sum(axis=0)
+            other.min = data.min(axis=0)
+            other.max = data.max(axis=0)
+        return self.merge(other)
+
+    def merge(self, other: "RunningMoments") -> "RunningMoments":
+        """合并另一组统计量（原地更新并返回自身）"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count = other.count
+            self.mean = other.mean.copy()
+            self.m2 = other.m2.copy()
+            self.min = other.min.copy()
+            self.max = other.max.copy()
+            return self
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.count / count)
+        self.m2 = self.m2 + other.m2 + delta ** 2 * (self.count * other.count / count)
+        self.count = count
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        return self
+
+    @property
+    def std(self) -> np.ndarray:
+        """样本标准差"""
+        if self.count < 2:
+            return np.zeros_like(self.mean)
+        return np.sqrt(self.m2 / (self.count - 1))
+
+
+class QuantileSketch:
+    """
+    按列的固定内存分位数草图
+
+    每列保存至多 size 个 (值, 权重) 质心。观测数超过 size 时，
+    按累计权重把排序后的质心等分为 size 组并取加权平均，
+    分位数的秩误差约为 1 / size，内存与样本数无关。
+    """
+
+    def __init__(self, n_columns: int, size: int = 512):
+        self.size = size
+        self.values = np.empty((n_columns, 0), dtype=np.float64)
+        self.weights = np.empty((n_columns, 0), dtype=np.float64)
+        self.min = np.full(n_columns, np.inf)
+        self.max = np.full(n_columns, -np.inf)
+
+    @property
+    def count(self) -> float:
+        return float(self.weights[0].sum()) if self.weights.shape[1] else 0.0
+
+    def update(self, data: np.ndarray) -> "QuantileSketch":
+        """
+        加入一批观测
+
+        Args:
+            data: (n, n_columns) 观测值
+        """
+        other = QuantileSketch(data.shape[1], self.size)
+        if data.shape[0]:
+            other.values = np.ascontiguousarray(data.T, dtype=np.float64)
+            other.weights = np.ones_like(other.values)
+            other.min = data.min(axis=0)
+            other.max = data.max(axis=0)
+            other._compress()
+        return self.merge(other)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """合并另一个草图（原地更新并返回自身）"""
+        self.values = np.concatenate([self.values, other.values], axis=1)
+        self.weights = np.concatenate([self.weights, other.weights], axis=1)
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self._compress()
+        return self
+
+    def _compress(self) -> None:
+        """排序并把质心压缩到至多 size 个"""
+        n_columns, n = self.values.shape
+        order = np.argsort(self.values, axis=1, kind="stable")
+        values = np.take_along_axis(self.values, order, axis=1)
+        weights = np.take_along_axis(self.weights, order, axis=1)
+        if n <= self.size:
+            self.values, self.weights = values, weights
+            return
+
+        # 每列总权重相同；按质心中点的累计权重分组
+        cumulative = np.cumsum(weights, axis=1)
+        total = cumulative[:, -1:]
+        bucket = np.floor((cumulative - weights / 2) / total * self.size).astype(np.int64)
+        bucket = np.clip(bucket, 0, self.size - 1)
+
+        flat = (np.arange(n_columns)[:, None] * self.size + bucket).ravel()
+        sum_weights = np.bincount(flat, weights=weights.ravel(), minlength=n_columns * self.size)
+        sum_values = np.bincount(flat, weights=(values * weights).ravel(), minlength=n_columns * self.size)
+        sum_weights = sum_weights.reshape(n_columns, self.size)
+        sum_values = sum_values.reshape(n_columns, self.size)
+
+        # 空组的权重为 0，取值用组内已有的最小非空邻居占位，不影响分位数
+        filled = sum_weights > 0
+        means = np.where(filled, sum_values / np.where(filled, sum_weights, 1.0), np.nan)
+        means = np.fmax.accumulate(np.where(filled, means, -np.inf), axis=1)
+        self.values = np.where(np.isfinite(means), means, values[:, :1])
+        self.weights = sum_weights
+
+    def quantile(self, qs: Sequence[float]) -> np.ndarray:
+        """
+        查询分位数
+
+        Args:
+            qs: 分位点，如 [0.05, 0.5, 0.95]
+
+        Returns:
+            (len(qs), n_columns) 数组
+        """
+        qs = np.asarray(qs, dtype=np.float64)
+        n_columns = self.values.shape[0]
+        if self.values.shape[1] == 0:
+            return np.full((len(qs), n_columns), np.nan)
+
+        cumulative = np.cumsum(self.weights, axis=1)
+        centers = cumulative - self.weights / 2
+        total = cumulative[:, -1]
+        result = np.empty((len(qs), n_columns))
+        for column in range(n_columns):
+            # 首尾用精确最值锚定，避免尾部分位数被质心均值拉向中间
+            positions = np.concatenate([[0.0], centers[column], [total[column]]])
+            values = np.concatenate([[self.min[column]], self.values[column], [self.max[column]]])
+            result[:, column] = np.interp(qs * total[column], positions, values)
+        return result
@@ -0,0 +1,281 @@
+"""
+批量模拟引擎
+
+以 (样本, 地区) 数组一次推进多组参数，按天循环的逻辑与 run_simulation 一致：
+预算计算 -> DNU 计算 -> DAU 计算 -> 财务计算。
+
+未替换任何字段时，每个样本的结果与 run_simulation 逐位一致；
+替换字段通过来源路径（见 compiled.py）写入对应的参数表单元格。
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from .compiled import CompiledConfig, REGION_PARAMS, NO_SOURCE
+from .retention import fit_retention_params, retention_table, active_retention_table
+
+
+# 自然量增长上限
+ORGANIC_CAP = 0.02
+
+
+class BatchResult:
+    """
+    批量模拟结果
+
+    属性（S = 样本数，D = 模拟天数，R = 活跃地区数）：
+    - dau / dnu_organic / dnu_paid / revenue / cost / profit: (S, D) 每日汇总
+    - revenue_iap / revenue_ad / cost_marketing / cost_operational / cost_fixed: (S,) 累计值
+    - break_even_day / first_profitable_day: (S,) 里程碑日，未达到时为 0
+    - peak_dau / peak_dau_day: (S,) DAU 峰值及其日期
+    - by_region: include_regions=True 时为 {指标: (S, R, D)}，否则为 None
+    """
+
+    def __init__(self, samples: int, days: int, n_regions: int, include_regions: bool):
+        self.samples = samples
+        self.days = days
+        for name in ("dau", "dnu_organic", "dnu_paid", "revenue", "cost", "profit"):
+            setattr(self, name, np.zeros((samples, days), dtype=np.float64))
+        for name in ("revenue_iap", "revenue_ad", "cost_marketing", "cost_operational", "cost_fixed"):
+            setattr(self, name, np.zeros(samples, dtype=np.float64))
+        self.break_even_day = np.zeros(samples, dtype=np.int64)
+        self.first_profitable_day = np.zeros(samples, dtype=np.int64)
+        self.peak_dau = np.zeros(samples, dtype=np.float64)
+        self.peak_dau_day = np.zeros(samples, dtype=np.int64)
+        self.by_region: Optional[Dict[str, np.ndarray]] = None
+        if include_regions:
+            self.by_region = {
+                name: np.zeros((samples, n_regions, days), dtype=np.float64)
+                for name in ("dau", "dnu_organic", "dnu_paid", "revenue", "cost", "profit")
+            }
+
+    @property
+    def total_revenue(self) -> np.ndarray:
+        return self.revenue_iap + self.revenue_ad
+
+    @property
+    def total_cost(self) -> np.ndarray:
+        return self.cost_marketing + self.cost_operational + self.cost_fixed
+
+    @property
+    def net_profit(self) -> np.ndarray:
+        return self.total_revenue - self.total_cost
+
+    @property
+    def roi(self) -> np.ndarray:
+        total_cost = self.total_cost
+        safe_cost = np.where(total_cost > 0, total_cost, 1.0)
+        return np.where(total_cost > 0, self.total_revenue / safe_cost, 0.0)
+
+    @property
+    def final_dau(self) -> np.ndarray:
+        return self.dau[:, -1]
+
+
+class _BatchTables:
+    """按样本展开后的参数表，未被替换的表保持共享（不复制）"""
+
+    def __init__(self, compiled: CompiledConfig, samples: int, overrides: Dict[str, np.ndarray]):
+        self.params = dict(compiled.params)
+        self.base_ratio = compiled.base_ratio
+        self.additional_budget = compiled.additional_budget
+        self.distribution = compiled.distribution
+        self.global_fixed_cost = np.float64(compiled.global_fixed_cost)
+        self.initial_dau = compiled.initial_dau
+        retention_points = None
+
+        for path, values in overrides.items():
+            index = compiled.source_index(path)
+            if index == NO_SOURCE:
+                raise ValueError(f"字段未被任何参数引用: {path}")
+            values = np.asarray(values, dtype=np.float64)
+            if values.shape != (samples,):
+                raise ValueError(f"字段 {path} 的取值数量应为 {samples}")
+
+            for name in REGION_PARAMS:
+                self.params[name] = self._apply(
+                    self.params[name], compiled.param_sources[name], index, values, samples
+                )
+            self.base_ratio = self._apply(self.base_ratio, compiled.base_ratio_sources, index, values, samples)
+            self.additional_budget = self._apply(
+                self.additional_budget, compiled.additional_budget_sources, index, values, samples
+            )
+            self.distribution = self._apply(
+                self.distribution, compiled.distribution_sources, index, values, samples
+            )
+            if index == compiled.global_fixed_cost_source:
+                self.global_fixed_cost = values
+
+            mask = compiled.initial_dau_sources == index
+            if mask.any():
+                if self.initial_dau.ndim == 1:
+                    self.initial_dau = np.broadcast_to(self.initial_dau, (samples,) + self.initial_dau.shape).copy()
+                # 与 get_initial_dau 一致：int(字段值 × 折算比例)
+                self.initial_dau[:, mask] = np.trunc(values[:, None] * compiled.initial_dau_scales[mask])
+
+            mask = compiled.retention_sources == index
+            if mask.any():
+                if retention_points is None:
+                    retention_points = np.broadcast_to(
+                        compiled.retention, (samples,) + compiled.retention.shape
+                    ).copy()
+                retention_points[:, mask] = np.clip(values, 0.0, 1.0)[:, None]
+
+        days = compiled.simulation_days
+        if retention_points is None:
+            self.retention_new, self.retention_active = compiled.retention_tables()
+        else:
+            # 留存率被替换时需要逐样本重新拟合
+            n_regions = len(compiled.regions)
+            alpha = np.empty((samples, n_regions))
+            beta = np.empty((samples, n_regions))
+            gamma = np.empty((samples, n_regions))
+            for s in range(samples):
+                for r in range(n_regions):
+                    alpha[s, r], beta[s, r], gamma[s, r] = fit_retention_params(*retention_points[s, r].tolist())
+            self.retention_new = retention_table(alpha, beta, gamma, days)
+            self.retention_active = active_retention_table(gamma, days)
+
+    @staticmethod
+    def _apply(table: np.ndarray, sources: np.ndarray, index: int, values: np.ndarray, samples: int) -> np.ndarray:
+        """将样本取值写入来源为 index 的单元格，必要时把共享表展开为 (S, ...)"""
+        mask = sources == index
+        if not mask.any():
+            return table
+        if table.ndim == sources.ndim:
+            table = np.broadcast_to(table, (samples,) + table.shape).copy()
+        table[:, mask] = values[:, None]
+        return table
+
+
+def simulate_batch(
+    compiled: CompiledConfig,
+    samples: int = 1,
+    overrides: Optional[Dict[str, np.ndarray]] = None,
+    include_regions: bool = False,
+) -> BatchResult:
+    """
+    批量运行模拟
+
+    Args:
+        compiled: 编译后的配置
+        samples: 样本数
+        overrides: 字段替换 {来源路径: (S,) 取值}，路径需被编译配置引用
+        include_regions: 是否保留分地区时序
+
+    Returns:
+        BatchResult 对象
+    """
+    tables = _BatchTables(compiled, samples, overrides or {})
+    days = compiled.simulation_days
+    n_regions = len(compiled.regions)
+    out = BatchResult(samples, days, n_regions, include_regions)
+
+    params = tables.params
+    shared = {name: table is compiled.params[name] for name, table in params.items()}
+
+    initial_dau = np.broadcast_to(tables.initial_dau, (samples, n_regions))
+    retention_new = tables.retention_new
+    retention_active = tables.retention_active
+
+    def param(name: str, t: int) -> np.ndarray:
+        """取第 t 天的地区参数：共享表 (D, R) 或样本表 (S, D, R)"""
+        table = params[name]
+        return table[t] if shared[name] else table[:, t]
+
+    def daily(table: np.ndarray, shared_table: np.ndarray, t: int) -> np.ndarray:
+        """取第 t 天的预算参数：未被替换时为共享表"""
+        return table[t] if table is shared_table else table[:, t]
+
+    # 前一日税后收入（IAP 收入按 70% 计算，广告收入按 100% 计算）
+    after_tax = param("arpu_iap", 0) * 0.7 + param("arpu_ad", 0) * 1.0
+    prev_revenue = _region_sum(initial_dau * after_tax)
+    prev_dau = initial_dau.astype(np.float64)
+
+    dnu_history = np.zeros((samples, n_regions, days), dtype=np.float64)
+    cumulative_profit = np.zeros(samples, dtype=np.float64)
+
+    for t in range(days):
+        # 1. 当日总预算
+        base_ratio = daily(tables.base_ratio, compiled.base_ratio, t)
+        additional = daily(tables.additional_budget, compiled.additional_budget, t)
+        total_budget = prev_revenue * base_ratio + additional
+
+        # 2. 地区预算分配
+        region_budget = total_budget[:, None] * daily(tables.distribution, compiled.distribution, t)
+
+        # 3. DNU
+        dnu_paid = np.trunc(region_budget / param("cpi", t))
+        safe_rate = np.minimum(param("organic_growth_rate", t), ORGANIC_CAP)
+        dnu_organic = np.minimum(np.trunc(prev_dau * safe_rate), np.trunc(prev_dau * ORGANIC_CAP))
+        dnu_total = dnu_organic + dnu_paid
+
+        # 4. DAU = 今日新增 + 历史新增留存 + 初始存量
+        kernel = retention_new[..., t:0:-1]
+        dau_from_history = np.trunc(dnu_history[..., :t] * kernel).sum(axis=-1)
+        dau_from_initial = np.trunc(initial_dau * retention_active[..., t])
+        dnu_history[..., t] = dnu_total
+        dau = dnu_total + dau_from_history + dau_from_initial
+
+        # 5. 财务指标
+        arpu_iap = param("arpu_iap", t)
+        arpu_ad = param("arpu_ad", t)
+        revenue_iap = dau * arpu_iap
+        revenue_ad = dau * arpu_ad
+        revenue_total = revenue_iap + revenue_ad
+        cost_operational = dau * param("unit_cost_operational", t)
+        region_cost = region_budget + cost_operational
+
+        # 按地区顺序累加，保证数值与 run_simulation 一致
+        day_revenue = np.zeros(samples)
+        day_cost = np.zeros(samples)
+        for r in range(n_regions):
+            out.revenue_iap += revenue_iap[:, r]
+            out.revenue_ad += revenue_ad[:, r]
+            out.cost_marketing += region_budget[:, r]
+            out.cost_operational += cost_operational[:, r]
+            day_revenue += revenue_total[:, r]
+            day_cost += region_cost[:, r]
+        day_cost += tables.global_fixed_cost
+        out.cost_fixed += tables.global_fixed_cost
+        day_profit = day_revenue - day_cost
+        day_dau = dau.sum(axis=1)
+
+        out.dau[:, t] = day_dau
+        out.dnu_organic[:, t] = dnu_organic.sum(axis=1)
+        out.dnu_paid[:, t] = dnu_paid.sum(axis=1)
+        out.revenue[:, t] = day_revenue
+        out.cost[:, t] = day_cost
+        out.profit[:, t] = day_profit
+        if out.by_region is not None:
+            out.by_region["dau"][:, :, t] = dau
+            out.by_region["dnu_organic"][:, :, t] = dnu_organic
+            out.by_region["dnu_paid"][:, :, t] = dnu_paid
+            out.by_region["revenue"][:, :, t] = revenue_total
+            out.by_region["cost"][:, :, t] = region_cost
+            out.by_region["profit"][:, :, t] = revenue_total - region_cost
+
+        # 6. 里程碑
+        cumulative_profit += day_profit
+        reached = (day_profit > 0) & (out.first_profitable_day == 0)
+        out.first_profitable_day[reached] = t + 1
+        reached = (cumulative_profit >= 0) & (out.break_even_day == 0)
+        out.break_even_day[reached] = t + 1
+        reached = day_dau > out.peak_dau
+        out.peak_dau[reached] = day_dau[reached]
+        out.peak_dau_day[reached] = t + 1
+
+        # 7. 前一日税后收入
+        prev_revenue = _region_sum(dau * (arpu_iap * 0.7 + arpu_ad * 1.0))
+        prev_dau = dau
+
+    return out
+
+
+def _region_sum(values: np.ndarray) -> np.ndarray:
+    """按地区顺序累加 (S, R) -> (S,)，与逐地区 sum() 的结果一致"""
+    total = np.zeros(values.shape[0])
+    for r in range(values.shape[1]):
+        total += values[:, r]
+    return total
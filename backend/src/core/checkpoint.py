@@ -0,0 +1,126 @@
+"""
+模拟状态检查点模块
+
+SimulationState 记录 SimulationEngine 在某一天结束时的全部状态：
+各地区的新增用户队列（DNU 历史）与前一日 DAU、留存率拟合参数、
+累计指标、里程碑跟踪、前一日税后收入，以及已生成的时序数据。
+不含时序的轻量检查点（snapshot(include_series=False)）只保存继续模拟所需的状态，
+恢复前须由调用方补上前缀时序（增量重算从缓存的完整时序中截取）。
+
+检查点可序列化为紧凑的二进制形式（压缩的 npz：整数/浮点数组 + JSON 元数据），
+恢复后继续模拟的结果与不中断的模拟逐位一致。
+"""
+
+import io
+import json
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+# 时序指标：(名称, 数据类型)
+SERIES_FIELDS = (
+    ("dau", np.int64),
+    ("dnu_organic", np.int64),
+    ("dnu_paid", np.int64),
+    ("revenue", np.float64),
+    ("cost", np.float64),
+    ("profit", np.float64),
+)
+
+_META_KEY = "__meta__"
+
+
+class SimulationState:
+    """
+    模拟引擎在第 day 天结束时的状态（day 为已模拟的天数）
+
+    Attributes:
+        config_json: 生成该状态的模拟配置（JSON）
+        start_date: 开始日期（ISO 格式）
+        day: 已模拟的天数
+        regions: 活跃地区
+        region_states: {地区: {initial_dau, alpha, beta, gamma, prev_dau}}
+        dnu_history: {地区: 历史 DNU 列表}
+        cumulative: 累计指标
+        trackers: 里程碑跟踪与前一日税后收入
+        totals: {指标: 汇总时序列表}（轻量检查点为 None）
+        by_region: {地区: {指标: 时序列表}}（轻量检查点为 None）
+    """
+
+    def __init__(
+        self,
+        config_json: str,
+        start_date: str,
+        day: int,
+        regions: List[str],
+        region_states: Dict[str, Dict[str, Any]],
+        dnu_history: Dict[str, List[int]],
+        cumulative: Dict[str, float],
+        trackers: Dict[str, Any],
+        totals: Optional[Dict[str, list]],
+        by_region: Optional[Dict[str, Dict[str, list]]],
+    ):
+        self.config_json = config_json
+        self.start_date = start_date
+        self.day = day
+        self.regions = regions
+        self.region_states = region_states
+        self.dnu_history = dnu_history
+        self.cumulative = cumulative
+        self.trackers = trackers
+        self.totals = totals
+        self.by_region = by_region
+
+    def to_bytes(self) -> bytes:
+        """序列化为压缩的二进制形式"""
+        meta = {
+            "config_json": self.config_json,
+            "start_date": self.start_date,
+            "day": self.day,
+            "regions": self.regions,
+            "region_states": self.region_states,
+            "cumulative": self.cumulative,
+            "trackers": self.trackers,
+            "has_series": self.totals is not None,
+        }
+        arrays = {_META_KEY: np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8)}
+        if self.totals is not None:
+            for name, dtype in SERIES_FIELDS:
+                arrays[f"totals.{name}"] = np.asarray(self.totals[name], dtype=dtype)
+                for region in self.regions:
+                    arrays[f"by_region.{region}.{name}"] = np.asarray(self.by_region[region][name], dtype=dtype)
+        for region in self.regions:
+            arrays[f"dnu_history.{region}"] = np.asarray(self.dnu_history[region], dtype=np.int64)
+
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SimulationState":
+        """由 to_bytes 的结果恢复"""
+        with np.load(io.BytesIO(data)) as arrays:
+            meta = json.loads(arrays[_META_KEY].tobytes().decode())
+            regions = meta["regions"]
+            totals = by_region = None
+            if meta.get("has_series", True):
+                totals = {name: arrays[f"totals.{name}"].tolist() for name, _ in SERIES_FIELDS}
+                by_region = {
+                    region: {name: arrays[f"by_region.{region}.{name}"].tolist() for name, _ in SERIES_FIELDS}
+                    for region in regions
+                }
+            dnu_history = {region: arrays[f"dnu_history.{region}"].tolist() for region in regions}
+
+        return cls(
+            config_json=meta["config_json"],
+            start_date=meta["start_date"],
+            day=meta["day"],
+            regions=regions,
+            region_states=meta["region_states"],
+            dnu_history=dnu_history,
+            cumulative=meta["cumulative"],
+            trackers=meta["trackers"],
+            totals=totals,
+            by_region=by_region,
+        )
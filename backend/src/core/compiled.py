@@ -0,0 +1,248 @@
+"""
+参数编译模块
+
+将 SimulationConfig 的"全局默认值 + 地区覆盖 + 月份覆盖"三层结构展开为
+按 (天, 地区) 排列的 NumPy 参数表，供向量化引擎直接按下标读取。
+
+每个参数单元格同时记录其来源字段路径（如 "regions.JP.cpi"），
+敏感度分析据此为指定输入播种导数，其他引擎据此替换字段取值。
+"""
+
+import hashlib
+import json
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ..models.config import SimulationConfig, RetentionConfig
+from .retention import fit_retention_params, retention_table, active_retention_table
+
+
+# 按 (月份, 地区) 覆盖的参数
+REGION_PARAMS = ("cpi", "organic_growth_rate", "arpu_iap", "arpu_ad", "unit_cost_operational")
+
+# 留存率关键节点
+RETENTION_KEYS = tuple(RetentionConfig.model_fields)
+
+# 无来源（常量）的单元格标记
+NO_SOURCE = -1
+
+# 数组属性（不含 params / param_sources，二者按参数名展开为 "params.cpi" 等）
+ARRAY_FIELDS = (
+    "months",
+    "base_ratio", "base_ratio_sources",
+    "additional_budget", "additional_budget_sources",
+    "distribution", "distribution_sources",
+    "initial_dau", "initial_dau_sources", "initial_dau_scales",
+    "retention", "retention_sources",
+    "alpha", "beta", "gamma",
+)
+
+# 标量属性
+SCALAR_FIELDS = (
+    "regions", "dates", "simulation_days", "global_fixed_cost",
+    "global_fixed_cost_source", "source_paths",
+)
+
+
+class CompiledConfig:
+    """
+    编译后的模拟配置
+
+    属性（D = 模拟天数，R = 活跃地区数）：
+    - params[name]: (D, R) 地区参数表，name 取自 REGION_PARAMS
+    - base_ratio / additional_budget: (D,) 每日基准预算比例与额外预算
+    - distribution: (D, R) 每日地区预算分配比例
+    - initial_dau: (R,) 各地区初始 DAU
+    - retention: (R, 7) 各地区留存率关键节点（取开始月份）
+    - alpha / beta / gamma: (R,) 拟合后的留存率参数
+    - *_sources: 与对应参数表同形状的来源下标，指向 source_paths
+
+    config 为原始配置；由 from_arrays() 重建时为 None
+    """
+
+    def __init__(self, config: SimulationConfig):
+        self.config = config
+        self.regions: List[str] = config.get_active_regions()
+        self.start_date: date = config.start_date or date.today()
+        self.simulation_days = config.simulation_days
+        self.global_fixed_cost = config.global_fixed_cost
+
+        self.source_paths: List[str] = []
+        self._source_index: Dict[str, int] = {}
+
+        days = self.simulation_days
+        n_regions = len(self.regions)
+
+        self.dates: List[str] = []
+        self.months = np.empty(days, dtype=np.int64)
+        for day in range(days):
+            current_date = self.start_date + timedelta(days=day)
+            self.dates.append(current_date.isoformat())
+            self.months[day] = current_date.month
+
+        # 按月份解析一次，再按天展开
+        unique_months = list(dict.fromkeys(self.months.tolist()))
+        month_slot = {month: i for i, month in enumerate(unique_months)}
+        day_slot = np.array([month_slot[m] for m in self.months.tolist()], dtype=np.int64)
+
+        self.params: Dict[str, np.ndarray] = {}
+        self.param_sources: Dict[str, np.ndarray] = {}
+        for name in REGION_PARAMS:
+            values = np.empty((len(unique_months), n_regions), dtype=np.float64)
+            sources = np.empty((len(unique_months), n_regions), dtype=np.int64)
+            for i, month in enumerate(unique_months):
+                for j, region in enumerate(self.regions):
+                    value, path = config.resolve_param(name, month, region)
+                    values[i, j] = value
+                    sources[i, j] = self._intern(path)
+            self.params[name] = values[day_slot]
+            self.param_sources[name] = sources[day_slot]
+
+        budget = config.budget
+        base_ratio = np.empty(len(unique_months), dtype=np.float64)
+        base_ratio_sources = np.empty(len(unique_months), dtype=np.int64)
+        additional = np.zeros(len(unique_months), dtype=np.float64)
+        additional_sources = np.full(len(unique_months), NO_SOURCE, dtype=np.int64)
+        distribution = np.zeros((len(unique_months), n_regions), dtype=np.float64)
+        distribution_sources = np.full((len(unique_months), n_regions), NO_SOURCE, dtype=np.int64)
+        for i, month in enumerate(unique_months):
+            month_key = str(month)
+            base_ratio[i] = budget.get_base_ratio(month)
+            base_ratio_sources[i] = self._intern(
+                f"budget.base_ratio_by_month.{month_key}"
+                if month_key in budget.base_ratio_by_month else "budget.base_ratio"
+            )
+            if month_key in budget.additional_by_month:
+                additional[i] = budget.additional_by_month[month_key]
+                additional_sources[i] = self._intern(f"budget.additional_by_month.{month_key}")
+
+            month_distribution = budget.get_region_distribution(month)
+            prefix = (
+                f"budget.region_distribution_by_month.{month_key}"
+                if month_key in budget.region_distribution_by_month else "budget.region_distribution"
+            )
+            for j, region in enumerate(self.regions):
+                if region in month_distribution:
+                    distribution[i, j] = month_distribution[region]
+                    distribution_sources[i, j] = self._intern(f"{prefix}.{region}")
+
+        self.base_ratio = base_ratio[day_slot]
+        self.base_ratio_sources = base_ratio_sources[day_slot]
+        self.additional_budget = additional[day_slot]
+        self.additional_budget_sources = additional_sources[day_slot]
+        self.distribution = distribution[day_slot]
+        self.distribution_sources = distribution_sources[day_slot]
+        self.global_fixed_cost_source = self._intern("global_fixed_cost")
+
+        self.initial_dau = np.empty(n_regions, dtype=np.float64)
+        self.initial_dau_sources = np.empty(n_regions, dtype=np.int64)
+        self.initial_dau_scales = np.empty(n_regions, dtype=np.float64)
+        for j, region in enumerate(self.regions):
+            value, path, scale = config.resolve_initial_dau(region)
+            self.initial_dau[j] = value
+            self.initial_dau_sources[j] = self._intern(path)
+            self.initial_dau_scales[j] = scale
+
+        # 留存率（与 run_simulation 一致，取开始月份的配置）
+        self.retention = np.empty((n_regions, len(RETENTION_KEYS)), dtype=np.float64)
+        self.retention_sources = np.empty((n_regions, len(RETENTION_KEYS)), dtype=np.int64)
+        self.alpha = np.empty(n_regions, dtype=np.float64)
+        self.beta = np.empty(n_regions, dtype=np.float64)
+        self.gamma = np.empty(n_regions, dtype=np.float64)
+        for j, region in enumerate(self.regions):
+            retention_config, sources = config.resolve_retention(self.start_date.month, region)
+            points = retention_config.to_list()
+            self.retention[j] = points
+            self.retention_sources[j] = [self._intern(sources[key]) for key in RETENTION_KEYS]
+            self.alpha[j], self.beta[j], self.gamma[j] = fit_retention_params(*points)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """导出全部数组属性 {名称: 数组}"""
+        arrays = {name: getattr(self, name) for name in ARRAY_FIELDS}
+        for name in REGION_PARAMS:
+            arrays[f"params.{name}"] = self.params[name]
+            arrays[f"param_sources.{name}"] = self.param_sources[name]
+        return arrays
+
+    def metadata(self) -> Dict:
+        """导出标量属性（可 JSON 序列化）"""
+        metadata = {name: getattr(self, name) for name in SCALAR_FIELDS}
+        metadata["start_date"] = self.start_date.isoformat()
+        return metadata
+
+    def digest(self) -> str:
+        """
+        模拟输入摘要
+
+        只取决于参数表的取值（不含来源下标与来源路径）：
+        写法不同但展开后参数完全相同的配置（如月份覆盖取值与全局默认值相同）摘要相同，模拟结果也相同
+        """
+        digest = hashlib.md5(json.dumps([
+            self.start_date.isoformat(), self.regions, self.simulation_days, self.global_fixed_cost,
+        ]).encode())
+        for name, array in sorted(self.to_arrays().items()):
+            if "sources" in name:
+                continue
+            array = np.ascontiguousarray(array)
+            digest.update(f"{name}:{array.dtype.str}:{array.shape}".encode())
+            digest.update(array.tobytes())
+        return digest.hexdigest()
+
+    @classmethod
+    def from_arrays(cls, metadata: Dict, arrays: Dict[str, np.ndarray]) -> "CompiledConfig":
+        """
+        由 to_arrays() / metadata() 的输出重建（不需要原始 SimulationConfig）
+
+        用于跨进程传递：数组可以是共享内存上的只读视图
+        """
+        compiled = cls.__new__(cls)
+        compiled.config = None
+        for name in SCALAR_FIELDS:
+            setattr(compiled, name, metadata[name])
+        compiled.start_date = date.fromisoformat(metadata["start_date"])
+        compiled._source_index = {path: i for i, path in enumerate(compiled.source_paths)}
+        for name in ARRAY_FIELDS:
+            setattr(compiled, name, arrays[name])
+        compiled.params = {name: arrays[f"params.{name}"] for name in REGION_PARAMS}
+        compiled.param_sources = {name: arrays[f"param_sources.{name}"] for name in REGION_PARAMS}
+        return compiled
+
+    def _intern(self, path: str) -> int:
+        """登记来源字段路径，返回其下标"""
+        index = self._source_index.get(path)
+        if index is None:
+            index = len(self.source_paths)
+            self.source_paths.append(path)
+            self._source_index[path] = index
+        return index
+
+    def retention_tables(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        生成各地区的留存率表
+
+        Returns:
+            (new, active)，均为 (R, D)：
+            - new[r, i]: 新用户注册后第 i 天的留存率（new[r, 0] = 1）
+            - active[r, t]: 初始存量用户在模拟第 t 天的活跃率
+        """
+        days = self.simulation_days
+        return retention_table(self.alpha, self.beta, self.gamma, days), active_retention_table(self.gamma, days)
+
+    def source_index(self, path: str) -> int:
+        """获取来源字段路径的下标，未被任何单元格引用时返回 NO_SOURCE"""
+        return self._source_index.get(path, NO_SOURCE)
+
+
+def compile_config(config: SimulationConfig) -> CompiledConfig:
+    """
+    编译模拟配置为参数表
+
+    Args:
+        config: 模拟配置
+
+    Returns:
+        CompiledConfig 对象
+    """
+    return CompiledConfig(config)
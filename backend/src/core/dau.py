@@ -64,14 +64,14 @@ class DAUCalculator:
             )
     
     def _get_retention(self, days_since_acquisition: int) -> float:
-        """获取留存率（使用缓存）"""
+        """获取留存率（使用缓存；超出预计算窗口的天数首次计算后同样缓存）"""
         if days_since_acquisition <= 0:
             return 1.0
-        if days_since_acquisition in self._retention_cache:
-            return self._retention_cache[days_since_acquisition]
-        return calc_retention_new(
-            days_since_acquisition, self.alpha, self.beta, self.gamma
-        )
+        if days_since_acquisition not in self._retention_cache:
+            self._retention_cache[days_since_acquisition] = calc_retention_new(
+                days_since_acquisition, self.alpha, self.beta, self.gamma
+            )
+        return self._retention_cache[days_since_acquisition]
     
     def calculate_dau(self, dnu_today: int) -> Tuple[int, int, int]:
         """
@@ -0,0 +1,256 @@
+"""
+多机网格扫描模块
+
+协调者把网格按分片（见 sweep.py）写入共享目录上的工作队列（src/utils/workqueue.py），
+任意主机上的工作进程领取分片、用批量引擎运行，并把逐点结果写为分片文件；
+全部完成后协调者按分片顺序读取并合并，结果与单机 run_sweep 逐位一致。
+
+作业目录结构：
+
+    root/
+    ├── job.json      扫描配置（SweepConfig）
+    ├── queue/        工作队列
+    ├── shards/       分片结果（<task_id>.parquet，未安装 pyarrow 时为 .csv）
+    ├── points.*      合并后的全部网格点
+    └── result.json   SweepResult
+
+pandas 只在读写分片时导入（约 0.2 秒），查询进度等轻量命令不需要导入。
+"""
+
+import importlib
+import importlib.util
+import os
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+from ..models.config import SweepConfig
+from ..models.results import SweepResult
+from ..utils.workqueue import FileWorkQueue, default_worker_id, temp_path
+from .compiled import compile_config
+from .batch import simulate_batch
+from .montecarlo import SUMMARY_METRICS, summary_matrix
+from .sweep import (
+    SWEEP_CHUNK_SIZE, SweepAggregate, grid_axes, grid_size, grid_values, shard_ranges, build_sweep_result,
+)
+
+
+JOB_FILE = "job.json"
+RESULT_FILE = "result.json"
+
+
+def shard_format() -> str:
+    """分片文件格式：安装了 pyarrow 时为 parquet，否则为 csv"""
+    return "parquet" if importlib.util.find_spec("pyarrow") else "csv"
+
+
+def _pandas():
+    return importlib.import_module("pandas")
+
+
+def write_table(frame: "pd.DataFrame", path: str) -> str:
+    """
+    写出表格（path 不含扩展名），先写临时文件再 rename
+
+    Returns:
+        实际写出的文件路径
+    """
+    fmt = shard_format()
+    final_path = f"{path}.{fmt}"
+    tmp_path = temp_path(path)
+    if fmt == "parquet":
+        frame.to_parquet(tmp_path, index=False)
+    else:
+        frame.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, final_path)
+    return final_path
+
+
+def read_table(path: str) -> "pd.DataFrame":
+    """读取 write_table 写出的表格"""
+    pd = _pandas()
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, float_precision="round_trip")
+
+
+def _task_id(shard_index: int) -> str:
+    return f"{shard_index:08d}"
+
+
+def _shard_paths(root: str) -> Dict[str, str]:
+    """{task_id: 分片文件路径}"""
+    shard_dir = os.path.join(root, "shards")
+    paths = {}
+    for name in os.listdir(shard_dir):
+        task_id, ext = os.path.splitext(name)
+        if ext in (".parquet", ".csv"):
+            paths[task_id] = os.path.join(shard_dir, name)
+    return paths
+
+
+def open_queue(root: str, lease_seconds: float = 600.0, max_attempts: int = 3) -> FileWorkQueue:
+    """打开作业的工作队列"""
+    return FileWorkQueue(os.path.join(root, "queue"), lease_seconds=lease_seconds, max_attempts=max_attempts)
+
+
+def load_job(root: str) -> SweepConfig:
+    """读取作业的扫描配置"""
+    with open(os.path.join(root, JOB_FILE), encoding="utf-8") as f:
+        return SweepConfig.model_validate_json(f.read())
+
+
+def create_sweep_job(sweep_config: SweepConfig, root: str) -> int:
+    """
+    创建扫描作业并把全部分片加入队列
+
+    重复调用是幂等的：已完成的分片不会重新入队
+
+    Returns:
+        分片数
+    """
+    os.makedirs(os.path.join(root, "shards"), exist_ok=True)
+    with open(os.path.join(root, JOB_FILE), "w", encoding="utf-8") as f:
+        f.write(sweep_config.model_dump_json())
+
+    queue = open_queue(root)
+    ranges = shard_ranges(grid_size(sweep_config.grid))
+    for shard_index, (start, stop) in enumerate(ranges):
+        queue.put(_task_id(shard_index), {"shard_index": shard_index, "start": start, "stop": stop})
+    return len(ranges)
+
+
+def run_shard_table(
+    sweep_config: SweepConfig,
+    start: int,
+    stop: int,
+    heartbeat: Optional[Callable[[], None]] = None,
+) -> "pd.DataFrame":
+    """
+    运行网格点 [start, stop)，返回逐点结果表
+
+    列：index、各网格字段、各汇总指标
+    """
+    compiled = compile_config(sweep_config.config)
+    axes = grid_axes(sweep_config.grid)
+    columns: Dict[str, List[np.ndarray]] = {"index": []}
+    for path, _ in axes:
+        columns[path] = []
+    for name in SUMMARY_METRICS:
+        columns[name] = []
+
+    for chunk_start in range(start, stop, SWEEP_CHUNK_SIZE):
+        chunk_stop = min(chunk_start + SWEEP_CHUNK_SIZE, stop)
+        values = grid_values(axes, chunk_start, chunk_stop)
+        batch = simulate_batch(compiled, samples=chunk_stop - chunk_start, overrides=values)
+        summary = summary_matrix(batch)
+
+        columns["index"].append(np.arange(chunk_start, chunk_stop, dtype=np.int64))
+        for path, _ in axes:
+            columns[path].append(values[path])
+        for i, name in enumerate(SUMMARY_METRICS):
+            columns[name].append(summary[:, i])
+        if heartbeat is not None:
+            heartbeat()
+
+    return _pandas().DataFrame({name: np.concatenate(parts) for name, parts in columns.items()})
+
+
+def run_sweep_worker(
+    root: str,
+    worker_id: Optional[str] = None,
+    max_tasks: Optional[int] = None,
+    lease_seconds: float = 600.0,
+    max_attempts: int = 3,
+) -> int:
+    """
+    工作进程主循环：不断领取分片并运行，直到队列为空
+
+    Args:
+        root: 作业目录
+        worker_id: 工作进程标识，默认为 主机名:进程号
+        max_tasks: 最多处理的分片数
+        lease_seconds / max_attempts: 同 FileWorkQueue
+
+    Returns:
+        成功完成的分片数
+    """
+    worker_id = worker_id or default_worker_id()
+    sweep_config = load_job(root)
+    queue = open_queue(root, lease_seconds, max_attempts)
+    completed = 0
+
+    while max_tasks is None or completed < max_tasks:
+        task = queue.claim(worker_id)
+        if task is None:
+            # 顺便回收失效工作进程的任务
+            if queue.requeue_expired() == 0:
+                break
+            continue
+
+        try:
+            frame = run_shard_table(
+                sweep_config, task.payload["start"], task.payload["stop"],
+                heartbeat=lambda: queue.heartbeat(task),
+            )
+            path = write_table(frame, os.path.join(root, "shards", task.task_id))
+        except Exception as e:
+            queue.fail(task, f"{type(e).__name__}: {e}")
+            continue
+
+        queue.complete(task, {"path": os.path.basename(path), "rows": len(frame)})
+        completed += 1
+
+    return completed
+
+
+def merge_sweep_job(root: str, write_points: bool = True) -> SweepResult:
+    """
+    按分片顺序合并全部分片结果
+
+    每个分片内按 SWEEP_CHUNK_SIZE 分批并入聚合结果，与 run_sweep 的合并顺序相同
+
+    Args:
+        root: 作业目录
+        write_points: 是否写出合并后的全部网格点表
+
+    Returns:
+        SweepResult 对象（同时写入 result.json）
+    """
+    start_time = time.time()
+    sweep_config = load_job(root)
+    ranges = shard_ranges(grid_size(sweep_config.grid))
+    paths = _shard_paths(root)
+    missing = [_task_id(i) for i in range(len(ranges)) if _task_id(i) not in paths]
+    if missing:
+        raise ValueError(f"有 {len(missing)} 个分片尚未完成，如 {missing[0]}")
+
+    aggregate = SweepAggregate(sweep_config.objective, sweep_config.maximize, sweep_config.top_k)
+    frames = []
+    for shard_index, (start, stop) in enumerate(ranges):
+        frame = read_table(paths[_task_id(shard_index)])
+        # 与 summary_matrix 相同的 C 连续布局，保证求和顺序一致
+        summary = np.ascontiguousarray(frame[list(SUMMARY_METRICS)].to_numpy(dtype=np.float64))
+        shard = SweepAggregate(sweep_config.objective, sweep_config.maximize, sweep_config.top_k)
+        for offset in range(0, stop - start, SWEEP_CHUNK_SIZE):
+            shard.update(summary[offset:offset + SWEEP_CHUNK_SIZE], start + offset)
+        aggregate.merge(shard)
+        if write_points:
+            frames.append(frame)
+
+    if write_points:
+        write_table(_pandas().concat(frames, ignore_index=True), os.path.join(root, "points"))
+
+    result = build_sweep_result(sweep_config, aggregate, start_time)
+    with open(os.path.join(root, RESULT_FILE), "w", encoding="utf-8") as f:
+        f.write(result.model_dump_json(indent=2))
+    return result
+
+
+def job_progress(root: str) -> Dict[str, int]:
+    """作业进度（各状态的分片数）"""
+    return open_queue(root).progress()
@@ -0,0 +1,207 @@
+"""
+增量重算模块
+
+服务端为最近模拟过的配置保存周期性检查点（每 CHECKPOINT_INTERVAL 天一个）。
+新请求到来时：
+1. 编译新配置，与缓存中各配置的参数表逐天比较，找到第一个输入不同的天（first_divergent_day）
+2. 取该天之前最近的检查点，从检查点恢复引擎，只模拟之后的天数
+3. 检查点只保存继续模拟所需的状态（DNU 历史、累计值、里程碑），不含时序；
+   每个缓存条目保存一份完整时序，恢复时从中截取前缀，继续追加即得到完整结果
+   （检查点总大小与模拟天数近似成正比，而非随每个检查点重复保存前缀时序）
+
+只修改后段月份（如 monthly_overrides、additional_by_month、base_ratio_by_month 的后几个月）时，
+前缀全部复用，结果与完整重算逐位一致。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from ..models.config import SimulationConfig
+from ..models.results import SimulationResult
+from .compiled import REGION_PARAMS, CompiledConfig, compile_config
+from .checkpoint import SimulationState
+from .simulator import SimulationEngine
+
+
+# 检查点间隔（天）
+CHECKPOINT_INTERVAL = 30
+
+# 缓存的配置数
+MAX_ENTRIES = 32
+
+
+def _first_difference(a: np.ndarray, b: np.ndarray) -> int:
+    """两个按天排列的数组第一个不同的天（前 min(len) 天内相同时返回 min(len)）"""
+    days = min(len(a), len(b))
+    diff = a[:days] != b[:days]
+    if diff.ndim > 1:
+        diff = diff.any(axis=tuple(range(1, diff.ndim)))
+    indices = np.flatnonzero(diff)
+    return int(indices[0]) if len(indices) else days
+
+
+def first_divergent_day(a: CompiledConfig, b: CompiledConfig) -> int:
+    """
+    两个编译配置第一个输入不同的天（下标从 0 开始）
+
+    开始日期、活跃地区、初始 DAU、留存率或固定成本不同时，从第 0 天起即不同；
+    否则按天比较预算与地区参数表，返回 min(两者天数) 表示共同天数内输入完全相同。
+    """
+    if (
+        a.start_date != b.start_date
+        or a.regions != b.regions
+        or a.global_fixed_cost != b.global_fixed_cost
+        or not np.array_equal(a.initial_dau, b.initial_dau)
+        or not np.array_equal(a.retention, b.retention)
+    ):
+        return 0
+
+    day = min(a.simulation_days, b.simulation_days)
+    for name in ("base_ratio", "additional_budget", "distribution"):
+        day = min(day, _first_difference(getattr(a, name), getattr(b, name)))
+    for name in REGION_PARAMS:
+        day = min(day, _first_difference(a.params[name], b.params[name]))
+    return day
+
+
+class _CacheEntry:
+    """一个配置的编译结果、检查点与最终结果"""
+
+    def __init__(self, config: SimulationConfig, compiled: CompiledConfig):
+        self.config = config
+        self.compiled = compiled
+        # {天数: 序列化的轻量 SimulationState（不含时序）}
+        self.checkpoints: Dict[int, bytes] = {}
+        # 完整时序（与 SimulationEngine.totals / region_timeseries 结构相同），恢复时截取前缀
+        self.totals: Dict[str, list] = {}
+        self.by_region: Dict[str, Dict[str, list]] = {}
+        self.result: Optional[SimulationResult] = None
+
+    def state_at(self, day: int, data: bytes) -> SimulationState:
+        """由第 day 天的检查点与完整时序的前缀还原完整状态"""
+        state = SimulationState.from_bytes(data)
+        state.totals = {name: values[:day] for name, values in self.totals.items()}
+        state.by_region = {
+            region: {name: values[:day] for name, values in series.items()}
+            for region, series in self.by_region.items()
+        }
+        return state
+
+
+class IncrementalSimulator:
+    """
+    带前缀复用的模拟器（LRU 缓存最近的配置）
+
+    用法：
+        simulator = IncrementalSimulator()
+        result = simulator.simulate(config)
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, checkpoint_interval: int = CHECKPOINT_INTERVAL):
+        self.max_entries = max_entries
+        self.checkpoint_interval = checkpoint_interval
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "resumes": 0, "misses": 0, "reused_days": 0, "simulated_days": 0}
+
+    def simulate(self, config: SimulationConfig) -> SimulationResult:
+        """运行模拟，尽可能复用缓存的前缀"""
+        return self.simulate_with_info(config)[0]
+
+    def simulate_with_info(self, config: SimulationConfig) -> Tuple[SimulationResult, int]:
+        """
+        运行模拟
+
+        Returns:
+            (SimulationResult, 复用的前缀天数)
+        """
+        start_time = time.time()
+        key = config.fingerprint()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.result is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                self.stats["reused_days"] += config.simulation_days
+                result = entry.result.model_copy(deep=True)
+                result.execution_time_ms = int((time.time() - start_time) * 1000)
+                return result, config.simulation_days
+
+        compiled = compile_config(config)
+        reused_day, source, inherited = self._find_prefix(compiled)
+
+        if source is None:
+            engine = SimulationEngine(config)
+        else:
+            engine = SimulationEngine(config, source.state_at(reused_day, inherited[reused_day]))
+
+        entry = _CacheEntry(config, compiled)
+        entry.checkpoints.update(inherited)
+        # 每 checkpoint_interval 天及模拟结束时各保存一个检查点（结束检查点用于延长模拟天数）
+        while engine.day < config.simulation_days:
+            next_checkpoint = (engine.day // self.checkpoint_interval + 1) * self.checkpoint_interval
+            engine.run(next_checkpoint)
+            entry.checkpoints[engine.day] = engine.snapshot(include_series=False).to_bytes()
+        # 引擎不再使用，直接保留其时序（继承的检查点的前缀时序与本条目相同）
+        entry.totals = engine.totals
+        entry.by_region = engine.region_timeseries
+        entry.result = engine.result(start_time)
+
+        with self._lock:
+            self.stats["resumes" if reused_day else "misses"] += 1
+            self.stats["reused_days"] += reused_day
+            self.stats["simulated_days"] += config.simulation_days - reused_day
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return entry.result.model_copy(deep=True), reused_day
+
+    def _find_prefix(self, compiled: CompiledConfig) -> Tuple[int, Optional[_CacheEntry], Dict[int, bytes]]:
+        """
+        在缓存中找最长的可复用前缀
+
+        Returns:
+            (检查点天数, 来源条目, 不晚于该天的检查点)；无可复用前缀时为 (0, None, {})
+        """
+        best_day, best_entry, inherited = 0, None, {}
+        with self._lock:
+            entries = list(self._entries.values())
+
+        for entry in entries:
+            divergent = first_divergent_day(entry.compiled, compiled)
+            usable = [day for day in entry.checkpoints if day <= divergent]
+            if not usable:
+                continue
+            day = max(usable)
+            if day > best_day:
+                best_day, best_entry = day, entry
+                inherited = {d: data for d, data in entry.checkpoints.items() if d <= day}
+        return best_day, best_entry, inherited
+
+    def get_config(self, base_hash: str) -> Optional[SimulationConfig]:
+        """
+        按哈希查找缓存中的配置
+
+        Args:
+            base_hash: 模拟结果中的 config_hash，或 SimulationConfig.fingerprint()
+        """
+        with self._lock:
+            entry = self._entries.get(base_hash)
+            if entry is None:
+                for candidate in reversed(self._entries.values()):
+                    if candidate.result is not None and candidate.result.config_hash == base_hash:
+                        entry = candidate
+                        break
+            return entry.config if entry is not None else None
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
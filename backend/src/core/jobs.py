@@ -0,0 +1,335 @@
+"""
+异步任务模块
+
+耗时的模拟、蒙特卡洛与网格扫描以任务形式在后台线程池中运行：
+1. submit() 校验请求、分配任务 ID 并放入执行队列，立即返回
+2. 工作线程逐批运行（模拟任务每批一个自然月），每批完成后更新进度（已完成的天数 / 样本数 / 网格点数）
+   与部分聚合结果（已完成部分的汇总指标）
+3. cancel() 设置取消标记，工作线程在下一批开始前停止（协作式取消）
+
+给定 queue_dir 时，任务同时写入本地目录型工作队列（见 utils/workqueue.py）：
+未结束的任务保留在 pending/ 中，服务重启后重新运行；
+已结束的任务（含失败与取消）连同状态与结果写入 done/，重启后仍可查询。
+
+内存中最多保留 MAX_FINISHED_JOBS 个已结束的任务，超出时淘汰最早结束的任务。
+给定 queue_dir 时内存中只保留任务状态，结果按需从 done/ 读取；被淘汰的任务仍可按 ID 查询。
+
+后台任务不经过准入控制（见 utils/admission.py）：提交立即返回，
+并发只受 MAX_WORKERS 个工作线程限制，不占用同步接口的并发数与成本预算。
+"""
+
+import os
+import threading
+from collections import deque
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from ..models.config import SimulationConfig, MonteCarloConfig, SweepConfig
+from ..utils.workqueue import FileWorkQueue, QueueTask
+from .compiled import compile_config
+from .montecarlo import MonteCarloAggregate, run_shard, shard_chunks, build_result, metric_distributions
+from .sweep import SweepAggregate, grid_size, run_sweep_shard, shard_ranges, build_sweep_result
+from .simulator import SimulationEngine
+
+
+# 持久化队列目录（为空时只使用进程内队列）
+DEFAULT_QUEUE_DIR = os.environ.get("PL_JOB_QUEUE_DIR") or None
+
+# 后台工作线程数
+MAX_WORKERS = 2
+
+# 内存中保留的已结束任务数
+MAX_FINISHED_JOBS = int(os.environ.get("PL_MAX_FINISHED_JOBS", 100))
+
+# 任务类型: (请求模型, 进度单位)
+JOB_KINDS = {
+    "simulate": (SimulationConfig, "days"),
+    "monte_carlo": (MonteCarloConfig, "samples"),
+    "sweep": (SweepConfig, "points"),
+}
+
+
+class JobCancelled(Exception):
+    """任务已被取消"""
+
+
+class Job:
+    """一个后台任务"""
+
+    def __init__(self, job_id: str, kind: str, request: Dict[str, Any]):
+        self.job_id = job_id
+        self.kind = kind
+        self.request = request
+        self.status = "queued"
+        self.done = 0
+        self.total = 0
+        self.partial: Optional[Dict[str, Any]] = None
+        self._result: Optional[Dict[str, Any]] = None
+        # 结果已写入持久化队列时，从 done/ 读取结果（内存中不保留）
+        self._result_loader: Optional[Callable[[], Optional[Dict[str, Any]]]] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now().isoformat(timespec="seconds")
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self._cancel = threading.Event()
+
+    @property
+    def result(self) -> Optional[Dict[str, Any]]:
+        if self._result is None and self._result_loader is not None:
+            return self._result_loader()
+        return self._result
+
+    @result.setter
+    def result(self, value: Optional[Dict[str, Any]]) -> None:
+        self._result = value
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed", "cancelled")
+
+    def check_cancelled(self) -> None:
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def advance(self, count: int) -> None:
+        """进度回调：累加完成数，并在下一批开始前响应取消"""
+        self.done += count
+        self.check_cancelled()
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status,
+            "unit": JOB_KINDS[self.kind][1],
+            "done": self.done,
+            "total": self.total,
+            "percent": round(100.0 * self.done / self.total, 2) if self.total else 0.0,
+            "partial": self.partial,
+            "result": self.result if include_result else None,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+    @classmethod
+    def from_task(cls, task: QueueTask, record: Optional[Dict[str, Any]] = None) -> "Job":
+        """由持久化队列中的任务恢复（record 为已结束任务保存的状态）"""
+        job = cls(task.task_id, task.payload["kind"], task.payload["request"])
+        job.created_at = task.payload.get("created_at", job.created_at)
+        if record is not None:
+            for name in ("status", "done", "total", "partial", "result", "error", "started_at", "finished_at"):
+                setattr(job, name, record.get(name))
+        return job
+
+
+def _run_simulate(job: Job, config: SimulationConfig) -> BaseModel:
+    start_time = time.time()
+    engine = SimulationEngine(config)
+    job.total = config.simulation_days
+    for metrics in engine.iter_batches("month"):
+        job.partial = {"day": engine.day, **metrics["cumulative"], **metrics["milestones"]}
+        job.advance(engine.day - job.done)
+    return engine.result(start_time)
+
+
+def _run_monte_carlo(job: Job, mc_config: MonteCarloConfig) -> BaseModel:
+    start_time = time.time()
+    compiled = compile_config(mc_config.config)
+    job.total = mc_config.samples
+
+    # 与 run_monte_carlo 相同的分片合并顺序，结果逐位一致
+    aggregate = MonteCarloAggregate(compiled.simulation_days)
+    for shard_index in range(len(shard_chunks(mc_config.samples, mc_config.chunk_size))):
+        job.check_cancelled()
+        aggregate.merge(run_shard(
+            compiled, mc_config.distributions, mc_config.samples,
+            mc_config.seed, mc_config.chunk_size, shard_index, progress=job.advance,
+        ))
+        job.partial = {
+            "samples": aggregate.count,
+            "break_even_probability": aggregate.break_even_count / aggregate.count,
+            "summary": {
+                name: distribution.model_dump()
+                for name, distribution in metric_distributions(
+                    aggregate.summary_sketch, aggregate.summary_moments
+                ).items()
+            },
+        }
+    return build_result(mc_config, compiled, aggregate, start_time)
+
+
+def _run_sweep(job: Job, sweep_config: SweepConfig) -> BaseModel:
+    start_time = time.time()
+    compiled = compile_config(sweep_config.config)
+    job.total = grid_size(sweep_config.grid)
+
+    # 与 run_sweep 相同的分片合并顺序，结果逐位一致
+    aggregate = SweepAggregate(sweep_config.objective, sweep_config.maximize, sweep_config.top_k)
+    for shard_index in range(len(shard_ranges(job.total))):
+        job.check_cancelled()
+        aggregate.merge(run_sweep_shard(
+            compiled, sweep_config.grid, sweep_config.objective,
+            sweep_config.maximize, sweep_config.top_k, shard_index, progress=job.advance,
+        ))
+        job.partial = build_sweep_result(sweep_config, aggregate, start_time).model_dump(
+            include={"points", "objective", "best", "summary"}
+        )
+    return build_sweep_result(sweep_config, aggregate, start_time)
+
+
+_RUNNERS: Dict[str, Callable[[Job, Any], BaseModel]] = {
+    "simulate": _run_simulate,
+    "monte_carlo": _run_monte_carlo,
+    "sweep": _run_sweep,
+}
+
+
+class JobManager:
+    """
+    后台任务管理器
+
+    Args:
+        max_workers: 工作线程数
+        queue_dir: 持久化队列目录；为空时任务只保存在内存中
+        max_finished: 内存中保留的已结束任务数
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS, queue_dir: Optional[str] = DEFAULT_QUEUE_DIR,
+                 max_finished: int = MAX_FINISHED_JOBS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pl-job")
+        self._jobs: Dict[str, Job] = {}
+        self._finished: Deque[str] = deque()
+        self._max_finished = max_finished
+        self._lock = threading.Lock()
+        self._queue = FileWorkQueue(queue_dir) if queue_dir else None
+        if self._queue is not None:
+            self._recover()
+
+    def submit(self, kind: str, request: Dict[str, Any]) -> Job:
+        """
+        提交任务
+
+        Raises:
+            ValueError: 未知的任务类型
+            pydantic.ValidationError: 请求校验失败
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"未知的任务类型: {kind}")
+        model = JOB_KINDS[kind][0].model_validate(request)
+        job = Job(uuid.uuid4().hex, kind, model.model_dump(mode="json"))
+        if self._queue is not None:
+            self._queue.put(job.job_id, {"kind": kind, "request": job.request, "created_at": job.created_at})
+        self._schedule(job)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        """
+        获取任务；已从内存淘汰的任务从持久化队列的 done/ 读取
+
+        Raises:
+            KeyError: 任务不存在
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None and self._queue is not None:
+            done = self._queue.done_task(job_id)
+            if done is not None:
+                job = Job.from_task(*done)
+        if job is None:
+            raise KeyError(f"任务不存在: {job_id}")
+        return job
+
+    def list(self) -> List[Job]:
+        """内存中的任务（不含已淘汰的任务）"""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Job:
+        """
+        取消任务：排队中的任务不再运行，运行中的任务在下一批开始前停止
+
+        Raises:
+            KeyError: 任务不存在
+        """
+        job = self.get(job_id)
+        job._cancel.set()
+        return job
+
+    def shutdown(self, wait: bool = True) -> None:
+        """停止接受新任务；wait 为 False 时同时取消所有未结束的任务"""
+        if not wait:
+            for job in self.list():
+                job._cancel.set()
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def _schedule(self, job: Job) -> None:
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job)
+
+    def _run(self, job: Job) -> None:
+        model_class = JOB_KINDS[job.kind][0]
+        job.started_at = datetime.now().isoformat(timespec="seconds")
+        try:
+            job.check_cancelled()
+            job.status = "running"
+            result = _RUNNERS[job.kind](job, model_class.model_validate(job.request))
+            job.result = result.model_dump(mode="json")
+            job.partial = None
+            job.status = "succeeded"
+        except JobCancelled:
+            job.status = "cancelled"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        job.finished_at = datetime.now().isoformat(timespec="seconds")
+        self._persist(job)
+        self._retain(job)
+
+    def _persist(self, job: Job) -> None:
+        """把已结束的任务（含失败与取消）连同状态写入持久化队列的 done/，内存中只保留状态"""
+        if self._queue is None:
+            return
+        payload = {"kind": job.kind, "request": job.request, "created_at": job.created_at}
+        self._queue.complete(QueueTask(job.job_id, payload, attempts=1), job.to_dict())
+        self._release_result(job)
+
+    def _release_result(self, job: Job) -> None:
+        job._result_loader = lambda: self._load_result(job.job_id)
+        job.result = None
+
+    def _load_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        done = self._queue.done_task(job_id)
+        if done is None or done[1] is None:
+            return None
+        return done[1].get("result")
+
+    def _retain(self, job: Job) -> None:
+        """登记已结束的任务，超出 max_finished 时淘汰最早结束的任务"""
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._finished.append(job.job_id)
+            while len(self._finished) > self._max_finished:
+                self._jobs.pop(self._finished.popleft(), None)
+
+    def _recover(self) -> None:
+        """
+        恢复持久化队列中的任务：最近结束的 max_finished 个任务只读取状态，
+        其余已结束的任务按需读取；未结束的任务重新运行
+        """
+        for task_id in self._queue.recent_task_ids("done", self._max_finished):
+            done = self._queue.done_task(task_id)
+            if done is None:
+                continue
+            job = Job.from_task(*done)
+            self._release_result(job)
+            self._retain(job)
+        for task in self._queue.tasks("pending"):
+            self._schedule(Job.from_task(task))
@@ -0,0 +1,284 @@
+"""
+蒙特卡洛不确定性模拟模块
+
+流程：
+1. 编译基准配置（compile_config）
+2. 按 chunk_size 把样本分批，每批使用由主种子派生的独立随机数流抽样
+3. 每批以 (样本, 地区) 数组运行批量引擎（simulate_batch）
+4. 每批结果并入固定内存的分位数草图，随后即丢弃，内存与 样本数 × 天数 无关
+
+连续的 CHUNKS_PER_SHARD 个批次组成一个分片：分片内按批次顺序合并，
+分片之间再按分片顺序合并。分片只由样本数和 chunk_size 决定，
+因此单进程与多进程（见 parallel.py）执行的结果逐位一致。
+"""
+
+import time
+import hashlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..models.config import MonteCarloConfig, Distribution
+from ..models.results import MonteCarloResult, QuantileBands, MetricDistribution
+from .compiled import CompiledConfig, compile_config
+from .batch import BatchResult, simulate_batch
+from .aggregate import QuantileSketch, RunningMoments
+
+
+# 扇形图分位点
+FAN_QUANTILES = (0.05, 0.5, 0.95)
+
+# 每日分位数区间指标
+BAND_METRICS = ("dau", "revenue", "profit")
+
+# 汇总指标
+SUMMARY_METRICS = ("final_dau", "peak_dau", "total_revenue", "total_cost", "net_profit", "roi")
+
+# 草图质心数
+SKETCH_SIZE = 512
+
+# 每个分片包含的批次数；分片是并行执行与合并的最小单位
+CHUNKS_PER_SHARD = 16
+
+# 字段取值范围（按末级字段名），抽样结果会截断到该范围
+_FIELD_BOUNDS = {
+    "cpi": (1e-6, np.inf),
+    "arpu_iap": (0.0, np.inf),
+    "arpu_ad": (0.0, np.inf),
+    "unit_cost_operational": (0.0, np.inf),
+    "organic_growth_rate": (0.0, 1.0),
+    "initial_dau": (0.0, np.inf),
+    "base_ratio": (0.0, np.inf),
+    "global_fixed_cost": (0.0, np.inf),
+}
+
+
+def sample_distribution(path: str, distribution: Distribution, rng: np.random.Generator, n: int) -> np.ndarray:
+    """
+    按分布抽取 n 个样本
+
+    Args:
+        path: 字段路径（用于确定取值范围）
+        distribution: 分布定义
+        rng: 随机数生成器
+        n: 样本数
+    """
+    if distribution.type == "normal":
+        values = rng.normal(distribution.mean, distribution.std, n)
+    elif distribution.type == "lognormal":
+        # 由目标均值/标准差换算对数空间参数
+        sigma2 = np.log1p((distribution.std / distribution.mean) ** 2)
+        values = rng.lognormal(np.log(distribution.mean) - sigma2 / 2, np.sqrt(sigma2), n)
+    elif distribution.type == "uniform":
+        values = rng.uniform(distribution.low, distribution.high, n)
+    else:
+        values = rng.triangular(distribution.low, distribution.mode, distribution.high, n)
+
+    low = distribution.low if distribution.low is not None else -np.inf
+    high = distribution.high if distribution.high is not None else np.inf
+    field = path.rsplit(".", 1)[-1]
+    if field.startswith("day"):
+        field_low, field_high = 0.0, 1.0
+    else:
+        field_low, field_high = _FIELD_BOUNDS.get(field, (-np.inf, np.inf))
+    return np.clip(values, max(low, field_low), min(high, field_high))
+
+
+def chunk_bounds(samples: int, chunk_size: int) -> List[Tuple[int, int]]:
+    """样本分批 [(start, stop), ...]"""
+    return [(start, min(start + chunk_size, samples)) for start in range(0, samples, chunk_size)]
+
+
+def shard_chunks(samples: int, chunk_size: int) -> List[range]:
+    """分片 -> 批次下标范围"""
+    n_chunks = len(chunk_bounds(samples, chunk_size))
+    return [
+        range(start, min(start + CHUNKS_PER_SHARD, n_chunks))
+        for start in range(0, n_chunks, CHUNKS_PER_SHARD)
+    ]
+
+
+def chunk_rng(seed: int, chunk_index: int) -> np.random.Generator:
+    """
+    第 chunk_index 批的随机数生成器
+
+    由主种子按批次下标派生，与批次的执行顺序和执行进程无关
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(chunk_index,)))
+
+
+class MonteCarloAggregate:
+    """
+    蒙特卡洛部分聚合结果
+
+    各批次独立生成后按批次顺序合并，合并结果与分批执行的位置无关
+    """
+
+    def __init__(self, days: int):
+        self.days = days
+        self.count = 0
+        self.break_even_count = 0
+        self.band_sketches = {name: QuantileSketch(days, SKETCH_SIZE) for name in BAND_METRICS}
+        self.band_moments = {name: RunningMoments(days) for name in BAND_METRICS}
+        self.summary_sketch = QuantileSketch(len(SUMMARY_METRICS), SKETCH_SIZE)
+        self.summary_moments = RunningMoments(len(SUMMARY_METRICS))
+
+    def update(self, batch: BatchResult) -> "MonteCarloAggregate":
+        """并入一批模拟结果"""
+        self.count += batch.samples
+        self.break_even_count += int((batch.break_even_day > 0).sum())
+        for name in BAND_METRICS:
+            data = getattr(batch, name)
+            self.band_sketches[name].update(data)
+            self.band_moments[name].update(data)
+        summary = summary_matrix(batch)
+        self.summary_sketch.update(summary)
+        self.summary_moments.update(summary)
+        return self
+
+    def merge(self, other: "MonteCarloAggregate") -> "MonteCarloAggregate":
+        """合并另一部分聚合结果（原地更新并返回自身）"""
+        self.count += other.count
+        self.break_even_count += other.break_even_count
+        for name in BAND_METRICS:
+            self.band_sketches[name].merge(other.band_sketches[name])
+            self.band_moments[name].merge(other.band_moments[name])
+        self.summary_sketch.merge(other.summary_sketch)
+        self.summary_moments.merge(other.summary_moments)
+        return self
+
+
+def summary_matrix(batch: BatchResult) -> np.ndarray:
+    """批量结果的汇总指标矩阵 (S, len(SUMMARY_METRICS))"""
+    columns = {
+        "final_dau": batch.final_dau,
+        "peak_dau": batch.peak_dau,
+        "total_revenue": batch.total_revenue,
+        "total_cost": batch.total_cost,
+        "net_profit": batch.net_profit,
+        "roi": batch.roi,
+    }
+    return np.stack([columns[name] for name in SUMMARY_METRICS], axis=1)
+
+
+def metric_distributions(sketch: QuantileSketch, moments: RunningMoments) -> Dict[str, MetricDistribution]:
+    """由汇总指标的草图和矩构建 {指标: MetricDistribution}"""
+    quantiles = sketch.quantile(FAN_QUANTILES)
+    return {
+        name: MetricDistribution(
+            mean=float(moments.mean[i]),
+            std=float(moments.std[i]),
+            min=float(moments.min[i]),
+            max=float(moments.max[i]),
+            p5=float(quantiles[0, i]),
+            p50=float(quantiles[1, i]),
+            p95=float(quantiles[2, i]),
+        )
+        for i, name in enumerate(SUMMARY_METRICS)
+    }
+
+
+def run_chunk(
+    compiled: CompiledConfig,
+    distributions: Dict[str, Distribution],
+    samples: int,
+    seed: int,
+    chunk_size: int,
+    chunk_index: int,
+) -> MonteCarloAggregate:
+    """
+    运行一批样本并返回其部分聚合结果
+
+    Args:
+        compiled: 编译后的基准配置
+        distributions: 字段分布
+        samples / seed / chunk_size: 同 MonteCarloConfig
+        chunk_index: 批次下标
+    """
+    start, stop = chunk_bounds(samples, chunk_size)[chunk_index]
+    n = stop - start
+    rng = chunk_rng(seed, chunk_index)
+    overrides: Dict[str, np.ndarray] = {
+        path: sample_distribution(path, distributions[path], rng, n)
+        for path in sorted(distributions)
+    }
+    batch = simulate_batch(compiled, samples=n, overrides=overrides)
+    return MonteCarloAggregate(compiled.simulation_days).update(batch)
+
+
+def run_shard(
+    compiled: CompiledConfig,
+    distributions: Dict[str, Distribution],
+    samples: int,
+    seed: int,
+    chunk_size: int,
+    shard_index: int,
+    progress: Optional[Callable[[int], None]] = None,
+) -> MonteCarloAggregate:
+    """
+    运行一个分片（按批次顺序合并其中各批的结果）
+
+    progress 在每批完成后以该批样本数调用；抛出异常可在批次之间中止分片
+    """
+    aggregate = MonteCarloAggregate(compiled.simulation_days)
+    for chunk_index in shard_chunks(samples, chunk_size)[shard_index]:
+        chunk = run_chunk(compiled, distributions, samples, seed, chunk_size, chunk_index)
+        aggregate.merge(chunk)
+        if progress is not None:
+            progress(chunk.count)
+    return aggregate
+
+
+def run_monte_carlo(mc_config: MonteCarloConfig) -> MonteCarloResult:
+    """
+    运行蒙特卡洛模拟
+
+    Args:
+        mc_config: 蒙特卡洛配置
+
+    Returns:
+        MonteCarloResult 对象
+    """
+    start_time = time.time()
+    compiled = compile_config(mc_config.config)
+
+    aggregate = MonteCarloAggregate(compiled.simulation_days)
+    for shard_index in range(len(shard_chunks(mc_config.samples, mc_config.chunk_size))):
+        aggregate.merge(run_shard(
+            compiled, mc_config.distributions, mc_config.samples,
+            mc_config.seed, mc_config.chunk_size, shard_index,
+        ))
+
+    return build_result(mc_config, compiled, aggregate, start_time)
+
+
+def build_result(
+    mc_config: MonteCarloConfig,
+    compiled: CompiledConfig,
+    aggregate: MonteCarloAggregate,
+    start_time: float,
+) -> MonteCarloResult:
+    """由聚合结果构建 MonteCarloResult"""
+    bands = {}
+    for name in BAND_METRICS:
+        p5, p50, p95 = aggregate.band_sketches[name].quantile(FAN_QUANTILES)
+        bands[name] = QuantileBands(
+            p5=p5.tolist(),
+            p50=p50.tolist(),
+            p95=p95.tolist(),
+            mean=aggregate.band_moments[name].mean.tolist(),
+        )
+
+    summary = metric_distributions(aggregate.summary_sketch, aggregate.summary_moments)
+
+    return MonteCarloResult(
+        execution_time_ms=int((time.time() - start_time) * 1000),
+        config_hash=hashlib.md5(mc_config.model_dump_json().encode()).hexdigest()[:8],
+        samples=aggregate.count,
+        seed=mc_config.seed,
+        dates=compiled.dates,
+        days=list(range(1, compiled.simulation_days + 1)),
+        bands=bands,
+        summary=summary,
+        break_even_probability=aggregate.break_even_count / aggregate.count if aggregate.count else 0.0,
+    )
@@ -0,0 +1,179 @@
+"""
+多进程分片执行模块
+
+把蒙特卡洛样本或网格点按分片（见 montecarlo.py / sweep.py）分发到进程池：
+1. 主进程编译配置，并把全部参数数组写入一块共享内存
+2. 工作进程启动时挂载共享内存，以只读视图重建 CompiledConfig（不传递 pydantic 配置）
+3. 每个任务只携带分片下标等少量参数，返回分片的部分聚合结果
+4. 主进程按分片顺序合并
+
+分片划分、随机数流与合并顺序都与工作进程数无关，因此结果逐位一致。
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from ..models.config import MonteCarloConfig, SweepConfig, Distribution
+from ..models.results import MonteCarloResult, SweepResult
+from .compiled import CompiledConfig, compile_config
+from .montecarlo import MonteCarloAggregate, run_shard, shard_chunks, build_result
+from .sweep import SweepAggregate, run_sweep_shard, shard_ranges, grid_size, build_sweep_result
+
+
+class SharedCompiled:
+    """
+    放在共享内存中的编译配置
+
+    用法：
+        with SharedCompiled(compiled) as shared:
+            ... shared.descriptor 传给工作进程 ...
+    """
+
+    def __init__(self, compiled: CompiledConfig):
+        arrays = compiled.to_arrays()
+        layout = []
+        offset = 0
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            layout.append((name, array.dtype.str, array.shape, offset))
+            # 按 8 字节对齐
+            offset += (array.nbytes + 7) // 8 * 8
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 8))
+        for name, dtype, shape, start in layout:
+            view = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=start)
+            view[...] = arrays[name]
+
+        self.descriptor = {
+            "name": self.shm.name,
+            "layout": layout,
+            "metadata": compiled.metadata(),
+        }
+
+    def close(self) -> None:
+        """释放共享内存"""
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedCompiled":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach_compiled(descriptor: Dict) -> Tuple[CompiledConfig, shared_memory.SharedMemory]:
+    """
+    在工作进程中挂载共享内存并重建 CompiledConfig
+
+    Returns:
+        (compiled, shm)：调用方需保持 shm 存活直至不再使用 compiled
+    """
+    shm = shared_memory.SharedMemory(name=descriptor["name"])
+    arrays = {}
+    for name, dtype, shape, start in descriptor["layout"]:
+        view = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=start)
+        view.flags.writeable = False
+        arrays[name] = view
+    return CompiledConfig.from_arrays(descriptor["metadata"], arrays), shm
+
+
+# 工作进程内的编译配置（由 _init_worker 设置）
+_worker_compiled: Optional[CompiledConfig] = None
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+
+
+def _init_worker(descriptor: Dict) -> None:
+    global _worker_compiled, _worker_shm
+    _worker_compiled, _worker_shm = attach_compiled(descriptor)
+
+
+def _monte_carlo_task(distributions: Dict[str, Dict], samples: int, seed: int, chunk_size: int, shard_index: int):
+    distributions = {path: Distribution(**spec) for path, spec in distributions.items()}
+    return run_shard(_worker_compiled, distributions, samples, seed, chunk_size, shard_index)
+
+
+def _sweep_task(grid: Dict, objective: str, maximize: bool, top_k: int, shard_index: int):
+    return run_sweep_shard(_worker_compiled, grid, objective, maximize, top_k, shard_index)
+
+
+def default_workers() -> int:
+    """默认工作进程数"""
+    return os.cpu_count() or 1
+
+
+def run_monte_carlo_parallel(mc_config: MonteCarloConfig, workers: Optional[int] = None) -> MonteCarloResult:
+    """
+    多进程运行蒙特卡洛模拟
+
+    Args:
+        mc_config: 蒙特卡洛配置
+        workers: 工作进程数，默认为 CPU 核数
+
+    Returns:
+        MonteCarloResult 对象，与 run_monte_carlo 的结果逐位一致
+    """
+    start_time = time.time()
+    compiled = compile_config(mc_config.config)
+    n_shards = len(shard_chunks(mc_config.samples, mc_config.chunk_size))
+    distributions = {path: spec.model_dump() for path, spec in mc_config.distributions.items()}
+
+    aggregate = MonteCarloAggregate(compiled.simulation_days)
+    with SharedCompiled(compiled) as shared:
+        with ProcessPoolExecutor(
+            max_workers=min(workers or default_workers(), n_shards),
+            initializer=_init_worker,
+            initargs=(shared.descriptor,),
+        ) as pool:
+            futures = [
+                pool.submit(
+                    _monte_carlo_task, distributions, mc_config.samples,
+                    mc_config.seed, mc_config.chunk_size, shard_index,
+                )
+                for shard_index in range(n_shards)
+            ]
+            # 按分片顺序合并
+            for future in futures:
+                aggregate.merge(future.result())
+
+    return build_result(mc_config, compiled, aggregate, start_time)
+
+
+def run_sweep_parallel(sweep_config: SweepConfig, workers: Optional[int] = None) -> SweepResult:
+    """
+    多进程运行参数网格扫描
+
+    Args:
+        sweep_config: 网格扫描配置
+        workers: 工作进程数，默认为 CPU 核数
+
+    Returns:
+        SweepResult 对象，与 run_sweep 的结果逐位一致
+    """
+    start_time = time.time()
+    compiled = compile_config(sweep_config.config)
+    n_shards = len(shard_ranges(grid_size(sweep_config.grid)))
+
+    aggregate = SweepAggregate(sweep_config.objective, sweep_config.maximize, sweep_config.top_k)
+    with SharedCompiled(compiled) as shared:
+        with ProcessPoolExecutor(
+            max_workers=min(workers or default_workers(), n_shards),
+            initializer=_init_worker,
+            initargs=(shared.descriptor,),
+        ) as pool:
+            futures = [
+                pool.submit(
+                    _sweep_task, sweep_config.grid, sweep_config.objective,
+                    sweep_config.maximize, sweep_config.top_k, shard_index,
+                )
+                for shard_index in range(n_shards)
+            ]
+            for future in futures:
+                aggregate.merge(future.result())
+
+    return build_sweep_result(sweep_config, aggregate, start_time)
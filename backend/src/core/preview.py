@@ -0,0 +1,254 @@
+"""
+周步长预览模拟
+
+交互式调参（拖动滑块）时只需要趋势方向，不需要逐日精确值。
+预览引擎把模拟区间按 step 天（默认 7 天）分块，每块只推进一次：
+
+1. 块内预算、地区分配及地区参数取块内均值，每日 DNU 在块内视为常数
+2. 新用户留存按块聚合为核 K[lag]：第 j 块每日 1 个新增用户在第 j + lag 块内的日均 DAU
+   K[lag] = Σ_{m=-(w-1)}^{w-1} (w - |m|) / w × R_new(lag × w + m)（R_new(0) = 1，负天数为 0）
+3. 块内日均 DAU = Σ_j 第 j 块每日 DNU × K[k - j] + 初始存量 × 块内平均活跃率
+4. 不做逐队列取整（精确引擎对每个队列的留存人数取整）
+
+每块的计算量与已推进的块数成正比，730 天仅需约 105 步，耗时与精确引擎的逐日循环无关。
+step = 1 时退化为不取整的逐日模型。estimate_error() 以批量引擎（与 run_simulation 逐位一致）为参照，
+误差同时包含步长近似与不取整两部分。
+"""
+
+import time
+from datetime import timedelta
+from typing import Dict, Optional
+
+import numpy as np
+
+from ..models.config import SimulationConfig
+from ..models.results import (
+    SimulationResult, Summary, FinalMetrics, CumulativeMetrics, Milestones,
+    Timeseries, RegionTimeseries, RetentionCurve,
+)
+from .batch import BatchResult, ORGANIC_CAP, _region_sum, simulate_batch
+from .compiled import CompiledConfig, compile_config
+from .retention import retention_table, get_fitted_key_retentions
+
+
+# 默认步长（天）
+PREVIEW_STEP = 7
+
+# estimate_error() 比较的汇总指标
+ERROR_METRICS = ("final_dau", "peak_dau", "total_revenue", "total_cost", "net_profit")
+
+
+def block_retention_kernel(
+    alpha: np.ndarray, beta: np.ndarray, gamma: np.ndarray, step: int, n_blocks: int
+) -> np.ndarray:
+    """
+    按块聚合的新用户留存核
+
+    Returns:
+        形状为 alpha.shape + (n_blocks,) 的数组，[..., lag] 为相隔 lag 块时每日单位新增的块内日均 DAU
+    """
+    table = retention_table(alpha, beta, gamma, (n_blocks + 1) * step)
+    offsets = np.arange(-(step - 1), step)
+    weights = (step - np.abs(offsets)) / step
+    index = np.arange(n_blocks)[:, None] * step + offsets[None, :]
+    values = np.where(index >= 0, table[..., np.maximum(index, 0)], 0.0)
+    return (values * weights).sum(axis=-1)
+
+
+def _block_mean(table: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """按天排列的表（第 0 维为天）在各块内的均值"""
+    return np.add.reduceat(table, edges[:-1], axis=0) / np.diff(edges).reshape((-1,) + (1,) * (table.ndim - 1))
+
+
+def simulate_preview(compiled: CompiledConfig, step: int = PREVIEW_STEP) -> BatchResult:
+    """
+    按 step 天分块运行近似模拟
+
+    Returns:
+        单样本的 BatchResult（含分地区时序）；每日时序为所在块的日均值
+    """
+    if step < 1:
+        raise ValueError("step 至少为 1")
+
+    days = compiled.simulation_days
+    n_regions = len(compiled.regions)
+    edges = np.append(np.arange(0, days, step), days)
+    lengths = np.diff(edges).astype(np.float64)
+    n_blocks = len(lengths)
+
+    params = {name: _block_mean(table, edges) for name, table in compiled.params.items()}
+    base_ratio = _block_mean(compiled.base_ratio, edges)
+    additional = _block_mean(compiled.additional_budget, edges)
+    distribution = _block_mean(compiled.distribution, edges)
+    _, retention_active = compiled.retention_tables()
+    active = _block_mean(retention_active.T, edges)
+    kernel = block_retention_kernel(compiled.alpha, compiled.beta, compiled.gamma, step, n_blocks)
+
+    initial_dau = compiled.initial_dau.astype(np.float64)
+    after_tax = compiled.params["arpu_iap"][0] * 0.7 + compiled.params["arpu_ad"][0] * 1.0
+    prev_revenue = float(initial_dau @ after_tax)
+    prev_dau = initial_dau
+    last_revenue = prev_revenue
+
+    block_dnu = np.zeros((n_regions, n_blocks))
+    series = {name: np.zeros((n_regions, n_blocks)) for name in ("dau", "dnu_organic", "dnu_paid", "revenue", "cost")}
+    cost_marketing = np.zeros((n_regions, n_blocks))
+    cost_operational = np.zeros((n_regions, n_blocks))
+    revenue_iap = np.zeros((n_regions, n_blocks))
+
+    for k in range(n_blocks):
+        total_budget = prev_revenue * base_ratio[k] + additional[k]
+        region_budget = total_budget * distribution[k]
+
+        dnu_paid = region_budget / params["cpi"][k]
+        dnu_organic = prev_dau * np.minimum(params["organic_growth_rate"][k], ORGANIC_CAP)
+        block_dnu[:, k] = dnu_organic + dnu_paid
+
+        dau = (block_dnu[:, :k + 1] * kernel[:, k::-1]).sum(axis=1) + initial_dau * active[k]
+
+        arpu_iap = params["arpu_iap"][k]
+        arpu_ad = params["arpu_ad"][k]
+        operational = dau * params["unit_cost_operational"][k]
+        series["dau"][:, k] = dau
+        series["dnu_organic"][:, k] = dnu_organic
+        series["dnu_paid"][:, k] = dnu_paid
+        series["revenue"][:, k] = dau * (arpu_iap + arpu_ad)
+        series["cost"][:, k] = region_budget + operational
+        revenue_iap[:, k] = dau * arpu_iap
+        cost_marketing[:, k] = region_budget
+        cost_operational[:, k] = operational
+
+        # 精确引擎按前一日取值计算预算与自然量；块均值比块中点的前一日滞后 step - 1 天，
+        # 按最近两块的增长率外推补偿（首块没有增长率，不外推）
+        revenue = float(dau @ (arpu_iap * 0.7 + arpu_ad * 1.0))
+        growth = (revenue / last_revenue) ** ((step - 1) / step) if k > 0 and last_revenue > 0 and revenue > 0 else 1.0
+        prev_revenue = revenue * growth
+        prev_dau = dau * growth
+        last_revenue = revenue
+
+    # 块内日均值展开为逐日时序
+    out = BatchResult(1, days, n_regions, include_regions=True)
+    for name, values in series.items():
+        out.by_region[name][0] = np.repeat(values, np.diff(edges), axis=1)
+    out.by_region["profit"][0] = out.by_region["revenue"][0] - out.by_region["cost"][0]
+    for name in ("dau", "dnu_organic", "dnu_paid", "revenue"):
+        getattr(out, name)[0] = _region_sum(out.by_region[name][0].T)
+    out.cost[0] = _region_sum(out.by_region["cost"][0].T) + compiled.global_fixed_cost
+    out.profit[0] = out.revenue[0] - out.cost[0]
+
+    out.revenue_iap[0] = (revenue_iap @ lengths).sum()
+    out.revenue_ad[0] = out.revenue[0].sum() - out.revenue_iap[0]
+    out.cost_marketing[0] = (cost_marketing @ lengths).sum()
+    out.cost_operational[0] = (cost_operational @ lengths).sum()
+    out.cost_fixed[0] = compiled.global_fixed_cost * days
+
+    profitable = np.flatnonzero(out.profit[0] > 0)
+    out.first_profitable_day[0] = profitable[0] + 1 if len(profitable) else 0
+    broken_even = np.flatnonzero(np.cumsum(out.profit[0]) >= 0)
+    out.break_even_day[0] = broken_even[0] + 1 if len(broken_even) else 0
+    peak = int(np.argmax(out.dau[0]))
+    out.peak_dau[0] = out.dau[0, peak]
+    out.peak_dau_day[0] = peak + 1
+    return out
+
+
+def _summary_metrics(batch: BatchResult) -> Dict[str, float]:
+    return {
+        "final_dau": float(batch.final_dau[0]),
+        "peak_dau": float(batch.peak_dau[0]),
+        "total_revenue": float(batch.total_revenue[0]),
+        "total_cost": float(batch.total_cost[0]),
+        "net_profit": float(batch.net_profit[0]),
+    }
+
+
+def estimate_error(compiled: CompiledConfig, step: int = PREVIEW_STEP) -> Dict[str, float]:
+    """
+    估计周步长预览的相对误差
+
+    以逐日精确引擎（批量引擎，与 run_simulation 逐位一致，730 天约 0.1 秒）为参照，
+    返回 ERROR_METRICS 中各指标的相对误差。净利润接近 0 时相对误差按总成本归一化，避免除以极小值。
+    """
+    coarse = _summary_metrics(simulate_preview(compiled, step))
+    daily = _summary_metrics(simulate_batch(compiled))
+    scale = {name: abs(value) for name, value in daily.items()}
+    scale["net_profit"] = max(scale["net_profit"], daily["total_cost"])
+    return {
+        name: abs(coarse[name] - daily[name]) / scale[name] if scale[name] > 0 else 0.0
+        for name in ERROR_METRICS
+    }
+
+
+def run_preview(config: SimulationConfig, step: int = PREVIEW_STEP) -> SimulationResult:
+    """
+    运行周步长预览，返回与 run_simulation 结构相同的结果（status 为 "preview"）
+
+    DAU 与新增取整到整数；每日时序为所在块的日均值
+    """
+    start_time = time.time()
+    compiled = compile_config(config)
+    batch = simulate_preview(compiled, step)
+    regions = compiled.regions
+
+    def region_timeseries(index: Optional[int]) -> RegionTimeseries:
+        if index is None:
+            values = {name: getattr(batch, name)[0] for name in ("dau", "dnu_organic", "dnu_paid", "revenue", "cost", "profit")}
+        else:
+            values = {name: table[0, index] for name, table in batch.by_region.items()}
+        return RegionTimeseries(**{
+            name: (np.rint(array).astype(np.int64) if name in ("dau", "dnu_organic", "dnu_paid") else array).tolist()
+            for name, array in values.items()
+        })
+
+    totals = region_timeseries(None)
+    by_region = {region: region_timeseries(r) for r, region in enumerate(regions)}
+    initial_total_dau = int(compiled.initial_dau.sum())
+    final_dau = totals.dau[-1]
+    total_cost = float(batch.total_cost[0])
+
+    return SimulationResult(
+        status="preview",
+        execution_time_ms=int((time.time() - start_time) * 1000),
+        summary=Summary(
+            simulation_days=config.simulation_days,
+            active_regions=regions,
+            final_metrics=FinalMetrics(
+                total_dau=final_dau,
+                dau_by_region={region: series.dau[-1] for region, series in by_region.items()},
+                dau_growth_rate=(final_dau - initial_total_dau) / initial_total_dau * 100 if initial_total_dau > 0 else 0,
+            ),
+            cumulative_metrics=CumulativeMetrics(
+                total_revenue=float(batch.total_revenue[0]),
+                revenue_iap=float(batch.revenue_iap[0]),
+                revenue_ad=float(batch.revenue_ad[0]),
+                total_cost=total_cost,
+                cost_marketing=float(batch.cost_marketing[0]),
+                cost_api=float(batch.cost_operational[0]),
+                cost_machine=0.0,
+                cost_fixed=float(batch.cost_fixed[0]),
+                net_profit=float(batch.net_profit[0]),
+                roi=float(batch.roi[0]),
+            ),
+            milestones=Milestones(
+                break_even_day=int(batch.break_even_day[0]) or None,
+                first_profitable_day=int(batch.first_profitable_day[0]) or None,
+                peak_dau_day=int(batch.peak_dau_day[0]),
+                peak_dau_value=int(round(float(batch.peak_dau[0]))),
+            ),
+        ),
+        timeseries=Timeseries(
+            dates=[(compiled.start_date + timedelta(days=day)).isoformat() for day in range(compiled.simulation_days)],
+            days=list(range(1, compiled.simulation_days + 1)),
+            totals=totals,
+            by_region=by_region if config.output_options.include_region_breakdown else None,
+        ),
+        retention_curves={
+            region: RetentionCurve(
+                alpha=float(compiled.alpha[r]),
+                beta=float(compiled.beta[r]),
+                gamma=float(compiled.gamma[r]),
+                fitted_values=get_fitted_key_retentions(compiled.alpha[r], compiled.beta[r], compiled.gamma[r]),
+            )
+            for r, region in enumerate(regions)
+        },
+    )
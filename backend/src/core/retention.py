@@ -5,11 +5,18 @@
 1. Day 1-30（早期留存）: 幂函数拟合 R(d) = α * d^β
 2. Day 31-60（长期留存）: 指数衰减 R(d) = R30 * γ^(d-30)
 3. Day 61+: 继续使用 γ 进行指数衰减
+
+scipy 导入耗时较长（约 0.3 秒），只在首次拟合时导入；
+拟合结果按 7 个留存节点缓存，相同输入不再重复拟合。
 """
 
+from functools import lru_cache
 from typing import Tuple, List, Dict
 import numpy as np
-from scipy.optimize import curve_fit
+
+
+# 缓存的拟合结果数
+FIT_CACHE_SIZE = 1024
 
 
 def _power_func(d: np.ndarray, alpha: float, beta: float) -> np.ndarray:
@@ -17,6 +24,7 @@ def _power_func(d: np.ndarray, alpha: float, beta: float) -> np.ndarray:
     return alpha * np.power(d, beta)
 
 
+@lru_cache(maxsize=FIT_CACHE_SIZE)
 def fit_retention_params(
     r1: float, r2: float, r3: float, r7: float, r14: float, r30: float, r60: float
 ) -> Tuple[float, float, float]:
@@ -36,7 +44,8 @@ def fit_retention_params(
     retentions_early = np.array([r1, r2, r3, r7, r14, r30])
     
     try:
-        # 使用最小二乘拟合
+        # 使用最小二乘拟合（延迟导入 scipy）
+        from scipy.optimize import curve_fit
         (alpha, beta), _ = curve_fit(
             _power_func, 
             days_early, 
@@ -109,6 +118,43 @@ def calc_retention_active(day: int, gamma: float) -> float:
     return float(np.clip(retention, 0.0, 1.0))
 
 
+def retention_table(
+    alpha: np.ndarray, beta: np.ndarray, gamma: np.ndarray, max_day: int
+) -> np.ndarray:
+    """
+    向量化计算新用户留存率表（calc_retention_new 的批量版本）
+    
+    Args:
+        alpha, beta, gamma: 拟合参数数组（形状相同）
+        max_day: 表长度
+        
+    Returns:
+        形状为 alpha.shape + (max_day,) 的数组，[..., d] 为注册后第 d 天的留存率
+    """
+    alpha = np.asarray(alpha, dtype=np.float64)[..., None]
+    beta = np.asarray(beta, dtype=np.float64)[..., None]
+    gamma = np.asarray(gamma, dtype=np.float64)[..., None]
+    day = np.arange(max_day, dtype=np.float64)
+    
+    # Day 1-30: 幂函数；Day 31+: 从 Day 30 的值开始指数衰减
+    early = alpha * np.power(np.maximum(day, 1.0), beta)
+    late = alpha * np.power(30.0, beta) * np.power(gamma, day - 30)
+    table = np.clip(np.where(day <= 30, early, late), 0.0, 1.0)
+    table[..., 0] = 1.0
+    return table
+
+
+def active_retention_table(gamma: np.ndarray, max_day: int) -> np.ndarray:
+    """
+    向量化计算存量用户活跃率表（calc_retention_active 的批量版本）
+    
+    Returns:
+        形状为 gamma.shape + (max_day,) 的数组
+    """
+    gamma = np.asarray(gamma, dtype=np.float64)[..., None]
+    return np.clip(np.power(gamma, np.arange(max_day, dtype=np.float64)), 0.0, 1.0)
+
+
 def generate_retention_curve(
     alpha: float, beta: float, gamma: float, max_day: int = 180
 ) -> Dict[int, float]:
@@ -0,0 +1,261 @@
+"""
+参数敏感度分析模块（前向模式自动微分）
+
+在按天循环中，为每个数值同时携带其对所选输入的导数（切向量），
+单次模拟即可得到汇总指标对所有输入的梯度，无需多次有限差分。
+
+微分约定：
+1. 数值路径与 run_simulation 完全一致（包括 int() 截断）
+2. int() 截断按恒等映射传播导数（光滑松弛），避免截断处导数恒为 0
+3. 自然量 2% 上限生效时，对应导数为 0（单侧导数）
+"""
+
+import time
+import hashlib
+from typing import Dict, List
+
+import numpy as np
+
+from ..models.config import SimulationConfig
+from ..models.results import SensitivityResult
+from .compiled import CompiledConfig, REGION_PARAMS, NO_SOURCE, compile_config
+
+
+# 支持求导的输入字段（路径前缀或末级字段名）
+_BUDGET_PREFIXES = (
+    "budget.base_ratio",
+    "budget.additional_by_month.",
+    "budget.region_distribution",
+)
+_FIELD_NAMES = REGION_PARAMS + ("initial_dau",)
+
+# 自然量增长上限
+ORGANIC_CAP = 0.02
+
+
+def _check_input(path: str) -> None:
+    """校验输入字段是否支持求导"""
+    if path == "global_fixed_cost" or path.startswith(_BUDGET_PREFIXES):
+        return
+    parts = path.split(".")
+    if parts[0] in ("defaults", "regions", "monthly_overrides") and parts[-1] in _FIELD_NAMES:
+        return
+    raise ValueError(f"不支持对该字段求导: {path}")
+
+
+def _seed(sources: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """按来源下标生成导数种子，形状为 sources.shape + (P,)"""
+    return (sources[..., None] == indices).astype(np.float64)
+
+
+def run_sensitivity(config: SimulationConfig, inputs: List[str]) -> SensitivityResult:
+    """
+    运行敏感度分析
+
+    Args:
+        config: 模拟配置
+        inputs: 求导的输入字段路径，如 ["defaults.cpi", "regions.JP.arpu_iap", "budget.base_ratio"]
+
+    Returns:
+        SensitivityResult 对象，gradients[metric][input] = ∂metric / ∂input
+    """
+    start_time = time.time()
+
+    for path in inputs:
+        _check_input(path)
+
+    compiled = compile_config(config)
+    metrics, tangents = _propagate(compiled, inputs)
+
+    gradients = {
+        name: {path: float(tangents[name][p]) for p, path in enumerate(inputs)}
+        for name in metrics
+    }
+
+    return SensitivityResult(
+        execution_time_ms=int((time.time() - start_time) * 1000),
+        config_hash=hashlib.md5(config.model_dump_json().encode()).hexdigest()[:8],
+        inputs=list(inputs),
+        metrics=metrics,
+        gradients=gradients,
+    )
+
+
+def _propagate(compiled: CompiledConfig, inputs: List[str]):
+    """
+    前向传播数值与切向量
+
+    Returns:
+        (metrics, tangents): 指标值字典，以及同名指标的 (P,) 导数数组
+    """
+    days = compiled.simulation_days
+    n_regions = len(compiled.regions)
+    n_inputs = len(inputs)
+    indices = np.array([compiled.source_index(path) for path in inputs], dtype=np.int64)
+    # 未被引用的字段不应匹配到 NO_SOURCE 单元格
+    indices[indices == NO_SOURCE] = -2
+
+    params = compiled.params
+    d_params = {name: _seed(compiled.param_sources[name], indices) for name in REGION_PARAMS}
+    d_base_ratio = _seed(compiled.base_ratio_sources, indices)
+    d_additional = _seed(compiled.additional_budget_sources, indices)
+    d_distribution = _seed(compiled.distribution_sources, indices)
+    d_fixed = _seed(np.array(compiled.global_fixed_cost_source), indices)
+
+    retention_new, retention_active = compiled.retention_tables()
+
+    # 初始状态
+    initial_dau = compiled.initial_dau
+    d_initial_dau = _seed(compiled.initial_dau_sources, indices) * compiled.initial_dau_scales[:, None]
+
+    prev_dau = initial_dau.copy()
+    d_prev_dau = d_initial_dau.copy()
+
+    # IAP 收入按 70% 计算，广告收入按 100% 计算
+    after_tax = params["arpu_iap"][0] * 0.7 + params["arpu_ad"][0] * 1.0
+    d_after_tax = d_params["arpu_iap"][0] * 0.7 + d_params["arpu_ad"][0]
+    prev_revenue = sum((initial_dau * after_tax).tolist())
+    d_prev_revenue = (d_initial_dau * after_tax[:, None] + initial_dau[:, None] * d_after_tax).sum(axis=0)
+
+    dnu_history = np.zeros((n_regions, days), dtype=np.float64)
+    d_dnu_history = np.zeros((n_regions, days, n_inputs), dtype=np.float64)
+
+    cumulative = {
+        "revenue_iap": 0.0,
+        "revenue_ad": 0.0,
+        "cost_marketing": 0.0,
+        "cost_operational": 0.0,
+        "cost_fixed": 0.0,
+    }
+    d_cumulative = {key: np.zeros(n_inputs) for key in cumulative}
+
+    peak_dau = 0
+    d_peak_dau = np.zeros(n_inputs)
+    day_total_dau = 0
+    d_day_total_dau = np.zeros(n_inputs)
+
+    for t in range(days):
+        # 1. 当日总预算
+        total_budget = prev_revenue * compiled.base_ratio[t] + compiled.additional_budget[t]
+        d_total_budget = (
+            d_prev_revenue * compiled.base_ratio[t]
+            + prev_revenue * d_base_ratio[t]
+            + d_additional[t]
+        )
+
+        # 2. 地区预算分配
+        distribution = compiled.distribution[t]
+        region_budget = total_budget * distribution
+        d_region_budget = d_total_budget[None, :] * distribution[:, None] + total_budget * d_distribution[t]
+
+        # 3. DNU
+        cpi = params["cpi"][t]
+        dnu_paid = np.trunc(region_budget / cpi)
+        d_dnu_paid = d_region_budget / cpi[:, None] - (region_budget / cpi ** 2)[:, None] * d_params["cpi"][t]
+
+        organic_rate = params["organic_growth_rate"][t]
+        capped = organic_rate >= ORGANIC_CAP
+        safe_rate = np.minimum(organic_rate, ORGANIC_CAP)
+        d_safe_rate = np.where(capped[:, None], 0.0, d_params["organic_growth_rate"][t])
+        dnu_organic = np.trunc(prev_dau * safe_rate)
+        d_dnu_organic = d_prev_dau * safe_rate[:, None] + prev_dau[:, None] * d_safe_rate
+        max_organic = np.trunc(prev_dau * ORGANIC_CAP)
+        d_max_organic = d_prev_dau * ORGANIC_CAP
+        use_organic = dnu_organic <= max_organic
+        dnu_organic = np.where(use_organic, dnu_organic, max_organic)
+        d_dnu_organic = np.where(use_organic[:, None], d_dnu_organic, d_max_organic)
+
+        dnu_total = dnu_organic + dnu_paid
+        d_dnu_total = d_dnu_organic + d_dnu_paid
+
+        # 4. DAU = 今日新增 + 历史新增留存 + 初始存量
+        kernel = retention_new[:, t:0:-1]
+        dau_from_history = np.trunc(dnu_history[:, :t] * kernel).sum(axis=1)
+        d_dau_from_history = np.einsum("rtp,rt->rp", d_dnu_history[:, :t], kernel)
+        dau_from_initial = np.trunc(initial_dau * retention_active[:, t])
+        d_dau_from_initial = d_initial_dau * retention_active[:, t][:, None]
+
+        dnu_history[:, t] = dnu_total
+        d_dnu_history[:, t] = d_dnu_total
+
+        dau = dnu_total + dau_from_history + dau_from_initial
+        d_dau = d_dnu_total + d_dau_from_history + d_dau_from_initial
+
+        # 5. 财务指标
+        arpu_iap = params["arpu_iap"][t]
+        arpu_ad = params["arpu_ad"][t]
+        unit_cost = params["unit_cost_operational"][t]
+        revenue_iap = dau * arpu_iap
+        revenue_ad = dau * arpu_ad
+        cost_operational = dau * unit_cost
+        d_revenue_iap = d_dau * arpu_iap[:, None] + dau[:, None] * d_params["arpu_iap"][t]
+        d_revenue_ad = d_dau * arpu_ad[:, None] + dau[:, None] * d_params["arpu_ad"][t]
+        d_cost_operational = d_dau * unit_cost[:, None] + dau[:, None] * d_params["unit_cost_operational"][t]
+
+        # 按地区顺序累加，保证数值与 run_simulation 一致
+        for r in range(n_regions):
+            cumulative["revenue_iap"] += revenue_iap[r]
+            cumulative["revenue_ad"] += revenue_ad[r]
+            cumulative["cost_marketing"] += region_budget[r]
+            cumulative["cost_operational"] += cost_operational[r]
+        d_cumulative["revenue_iap"] += d_revenue_iap.sum(axis=0)
+        d_cumulative["revenue_ad"] += d_revenue_ad.sum(axis=0)
+        d_cumulative["cost_marketing"] += d_region_budget.sum(axis=0)
+        d_cumulative["cost_operational"] += d_cost_operational.sum(axis=0)
+        cumulative["cost_fixed"] += compiled.global_fixed_cost
+        d_cumulative["cost_fixed"] += d_fixed
+
+        day_total_dau = int(dau.sum())
+        d_day_total_dau = d_dau.sum(axis=0)
+        if day_total_dau > peak_dau:
+            peak_dau = day_total_dau
+            d_peak_dau = d_day_total_dau
+
+        # 6. 前一日税后收入
+        after_tax = arpu_iap * 0.7 + arpu_ad * 1.0
+        d_after_tax = d_params["arpu_iap"][t] * 0.7 + d_params["arpu_ad"][t]
+        prev_revenue = sum((dau * after_tax).tolist())
+        d_prev_revenue = (d_dau * after_tax[:, None] + dau[:, None] * d_after_tax).sum(axis=0)
+
+        prev_dau = dau
+        d_prev_dau = d_dau
+
+    total_revenue = cumulative["revenue_iap"] + cumulative["revenue_ad"]
+    total_cost = cumulative["cost_marketing"] + cumulative["cost_operational"] + cumulative["cost_fixed"]
+    d_total_revenue = d_cumulative["revenue_iap"] + d_cumulative["revenue_ad"]
+    d_total_cost = d_cumulative["cost_marketing"] + d_cumulative["cost_operational"] + d_cumulative["cost_fixed"]
+
+    if total_cost > 0:
+        roi = total_revenue / total_cost
+        d_roi = (d_total_revenue * total_cost - total_revenue * d_total_cost) / total_cost ** 2
+    else:
+        roi = 0.0
+        d_roi = np.zeros(n_inputs)
+
+    metrics: Dict[str, float] = {
+        "final_dau": float(day_total_dau),
+        "peak_dau_value": float(peak_dau),
+        "total_revenue": total_revenue,
+        "revenue_iap": cumulative["revenue_iap"],
+        "revenue_ad": cumulative["revenue_ad"],
+        "total_cost": total_cost,
+        "cost_marketing": cumulative["cost_marketing"],
+        "cost_operational": cumulative["cost_operational"],
+        "cost_fixed": cumulative["cost_fixed"],
+        "net_profit": total_revenue - total_cost,
+        "roi": roi,
+    }
+    tangents: Dict[str, np.ndarray] = {
+        "final_dau": d_day_total_dau,
+        "peak_dau_value": d_peak_dau,
+        "total_revenue": d_total_revenue,
+        "revenue_iap": d_cumulative["revenue_iap"],
+        "revenue_ad": d_cumulative["revenue_ad"],
+        "total_cost": d_total_cost,
+        "cost_marketing": d_cumulative["cost_marketing"],
+        "cost_operational": d_cumulative["cost_operational"],
+        "cost_fixed": d_cumulative["cost_fixed"],
+        "net_profit": d_total_revenue - d_total_cost,
+        "roi": d_roi,
+    }
+    return {k: float(v) for k, v in metrics.items()}, tangents
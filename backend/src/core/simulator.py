@@ -2,14 +2,15 @@
 主模拟器模块
 
 按天循环执行：预算计算 -> DNU 计算 -> DAU 计算 -> 财务计算
+
+SimulationEngine 逐日推进，可在任意一天生成检查点并从检查点继续（见 checkpoint.py）
 """
 
 import time
 import hashlib
 import json
 from datetime import date, timedelta
-from typing import Dict, List, Optional, Tuple
-from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from ..models.config import SimulationConfig, RetentionConfig
 from ..models.results import (
@@ -25,6 +26,11 @@ from ..models.results import (
 )
 from .retention import fit_retention_params, get_fitted_key_retentions
 from .dau import DAUCalculator
+from .checkpoint import SimulationState, SERIES_FIELDS
+
+
+# 引擎版本：模拟逻辑变化（相同配置的结果会改变）时递增，参与 HTTP ETag 与结果存储 ID 的计算
+ENGINE_VERSION = "1"
 
 
 class RegionSimulator:
@@ -34,17 +40,27 @@ class RegionSimulator:
         self,
         region: str,
         initial_dau: int,
-        retention_config: RetentionConfig,
+        retention_config: Optional[RetentionConfig] = None,
+        retention_params: Optional[Tuple[float, float, float]] = None,
     ):
+        """
+        Args:
+            region: 地区代码
+            initial_dau: 初始 DAU
+            retention_config: 留存率配置（用于拟合）
+            retention_params: 已拟合的 (alpha, beta, gamma)，给定时跳过拟合（用于从检查点恢复）
+        """
         self.region = region
         self.initial_dau = initial_dau
         
         # 拟合留存率参数
-        retention = retention_config.to_dict()
-        self.alpha, self.beta, self.gamma = fit_retention_params(
-            retention[1], retention[2], retention[3],
-            retention[7], retention[14], retention[30], retention[60]
-        )
+        if retention_params is None:
+            retention = retention_config.to_dict()
+            retention_params = fit_retention_params(
+                retention[1], retention[2], retention[3],
+                retention[7], retention[14], retention[30], retention[60]
+            )
+        self.alpha, self.beta, self.gamma = retention_params
         
         # 初始化 DAU 计算器
         self.dau_calculator = DAUCalculator(
@@ -121,6 +137,13 @@ class RegionSimulator:
             gross_profit=gross_profit,
         )
     
+    def restore_state(self, dnu_history: List[int], prev_dau: int) -> None:
+        """恢复检查点状态（历史 DNU 与前一日 DAU）"""
+        self.dnu_history = list(dnu_history)
+        self.prev_dau = prev_dau
+        self.dau_calculator.dnu_history = list(dnu_history)
+        self.dau_calculator.current_day = len(dnu_history)
+    
     def get_retention_curve(self) -> RetentionCurve:
         """获取留存率曲线"""
         return RetentionCurve(
@@ -131,95 +154,89 @@ class RegionSimulator:
         )
 
 
-def run_simulation(config: SimulationConfig) -> SimulationResult:
+class SimulationEngine:
     """
-    运行模拟
+    可逐日推进的模拟引擎
     
-    Args:
-        config: 模拟配置
-        
-    Returns:
-        SimulationResult 对象
+    run_simulation 的全部状态都保存在引擎中，可在任意一天结束时
+    生成检查点（snapshot），并从检查点恢复（restore）后继续模拟。
     """
-    start_time = time.time()
-    
-    # 获取活跃地区
-    active_regions = config.get_active_regions()
-    
-    # 确定开始日期
-    start_date = config.start_date or date.today()
-    
-    # 初始化各地区模拟器
-    region_simulators: Dict[str, RegionSimulator] = {}
-    for region in active_regions:
-        initial_dau = config.get_initial_dau(region)
-        retention_config = config.get_retention(start_date.month, region)
-        region_simulators[region] = RegionSimulator(
-            region=region,
-            initial_dau=initial_dau,
-            retention_config=retention_config,
-        )
     
-    # 存储每日指标
-    all_daily_metrics: List[DailyMetrics] = []
-    
-    # 初始化累计指标
-    cumulative = {
-        "revenue_iap": 0.0,
-        "revenue_ad": 0.0,
-        "cost_marketing": 0.0,
-        "cost_operational": 0.0,
-        "cost_fixed": 0.0,
-    }
-    
-    # 初始化时序数据
-    dates_list: List[str] = []
-    days_list: List[int] = []
-    
-    totals_dau: List[int] = []
-    totals_dnu_organic: List[int] = []
-    totals_dnu_paid: List[int] = []
-    totals_revenue: List[float] = []
-    totals_cost: List[float] = []
-    totals_profit: List[float] = []
-    
-    region_timeseries: Dict[str, Dict[str, List]] = {
-        region: {
-            "dau": [], "dnu_organic": [], "dnu_paid": [],
-            "revenue": [], "cost": [], "profit": []
+    def __init__(self, config: SimulationConfig, state: Optional[SimulationState] = None):
+        """
+        Args:
+            config: 模拟配置
+            state: 检查点；给定时从该状态继续，后续天数使用 config 的参数
+        """
+        self.config = config
+        
+        # 获取活跃地区
+        self.active_regions = config.get_active_regions()
+        
+        if state is not None:
+            self._restore(state)
+            return
+        
+        # 确定开始日期
+        self.start_date = config.start_date or date.today()
+        
+        # 初始化各地区模拟器
+        self.region_simulators: Dict[str, RegionSimulator] = {}
+        for region in self.active_regions:
+            initial_dau = config.get_initial_dau(region)
+            retention_config = config.get_retention(self.start_date.month, region)
+            self.region_simulators[region] = RegionSimulator(
+                region=region,
+                initial_dau=initial_dau,
+                retention_config=retention_config,
+            )
+        
+        # 已模拟天数
+        self.day = 0
+        
+        # 初始化累计指标
+        self.cumulative = {
+            "revenue_iap": 0.0,
+            "revenue_ad": 0.0,
+            "cost_marketing": 0.0,
+            "cost_operational": 0.0,
+            "cost_fixed": 0.0,
         }
-        for region in active_regions
-    }
-    
-    # 里程碑跟踪
-    cumulative_profit = 0.0
-    break_even_day: Optional[int] = None
-    first_profitable_day: Optional[int] = None
-    peak_dau = 0
-    peak_dau_day = 0
-    
-    # 前一日税后收入（用于预算计算）
-    prev_revenue_after_tax = sum(
-        config.get_initial_dau(r) * (
-            config.get_param("arpu_iap", start_date.month, r) * 0.7 +
-            config.get_param("arpu_ad", start_date.month, r) * 1.0
+        
+        # 初始化时序数据
+        self.totals: Dict[str, List] = {name: [] for name, _ in SERIES_FIELDS}
+        self.region_timeseries: Dict[str, Dict[str, List]] = {
+            region: {name: [] for name, _ in SERIES_FIELDS}
+            for region in self.active_regions
+        }
+        
+        # 里程碑跟踪
+        self.cumulative_profit = 0.0
+        self.break_even_day: Optional[int] = None
+        self.first_profitable_day: Optional[int] = None
+        self.peak_dau = 0
+        self.peak_dau_day = 0
+        
+        # 前一日税后收入（用于预算计算）
+        self.prev_revenue_after_tax = sum(
+            config.get_initial_dau(r) * (
+                config.get_param("arpu_iap", self.start_date.month, r) * 0.7 +
+                config.get_param("arpu_ad", self.start_date.month, r) * 1.0
+            )
+            for r in self.active_regions
         )
-        for r in active_regions
-    )
     
-    # 按天模拟
-    for day in range(config.simulation_days):
-        current_date = start_date + timedelta(days=day)
+    def step(self) -> None:
+        """模拟一天"""
+        config = self.config
+        day = self.day
+        current_date = self.start_date + timedelta(days=day)
         month = current_date.month
-        date_str = current_date.isoformat()
-        
-        dates_list.append(date_str)
-        days_list.append(day + 1)
         
         # 1. 计算当日总预算
         additional_budget = config.budget.additional_by_month.get(str(month), 0)
         base_ratio = config.budget.get_base_ratio(month)  # 支持按月配置
-        total_budget = (prev_revenue_after_tax * base_ratio) + additional_budget
+        total_budget = (self.prev_revenue_after_tax * base_ratio) + additional_budget
         
         # 2. 各地区模拟
         day_total_dau = 0
@@ -232,7 +249,7 @@ def run_simulation(config: SimulationConfig) -> SimulationResult:
         # 获取当月的地区预算分配
         region_distribution = config.budget.get_region_distribution(month)
         
-        for region in active_regions:
+        for region in self.active_regions:
             # 预算分配
             region_budget = total_budget * region_distribution.get(region, 0)
             
@@ -244,7 +261,7 @@ def run_simulation(config: SimulationConfig) -> SimulationResult:
             unit_cost_operational = config.get_param("unit_cost_operational", month, region)
             
             # 执行模拟
-            metrics = region_simulators[region].simulate_day(
+            metrics = self.region_simulators[region].simulate_day(
                 day=day + 1,
                 budget=region_budget,
                 cpi=cpi,
@@ -253,8 +270,6 @@ def run_simulation(config: SimulationConfig) -> SimulationResult:
                 arpu_ad=arpu_ad,
                 unit_cost_operational=unit_cost_operational,
             )
-            metrics.date = date_str
-            all_daily_metrics.append(metrics)
             
             # 汇总当日指标
             day_total_dau += metrics.dau
@@ -264,138 +279,337 @@ def run_simulation(config: SimulationConfig) -> SimulationResult:
             day_total_cost += metrics.cost_marketing + metrics.cost_operational
             
             # 更新地区时序
-            region_timeseries[region]["dau"].append(metrics.dau)
-            region_timeseries[region]["dnu_organic"].append(metrics.dnu_organic)
-            region_timeseries[region]["dnu_paid"].append(metrics.dnu_paid)
-            region_timeseries[region]["revenue"].append(metrics.revenue_total)
-            region_timeseries[region]["cost"].append(
-                metrics.cost_marketing + metrics.cost_operational
-            )
-            region_timeseries[region]["profit"].append(metrics.gross_profit)
+            series = self.region_timeseries[region]
+            series["dau"].append(metrics.dau)
+            series["dnu_organic"].append(metrics.dnu_organic)
+            series["dnu_paid"].append(metrics.dnu_paid)
+            series["revenue"].append(metrics.revenue_total)
+            series["cost"].append(metrics.cost_marketing + metrics.cost_operational)
+            series["profit"].append(metrics.gross_profit)
             
             # 更新累计指标
-            cumulative["revenue_iap"] += metrics.revenue_iap
-            cumulative["revenue_ad"] += metrics.revenue_ad
-            cumulative["cost_marketing"] += metrics.cost_marketing
-            cumulative["cost_operational"] += metrics.cost_operational
+            self.cumulative["revenue_iap"] += metrics.revenue_iap
+            self.cumulative["revenue_ad"] += metrics.revenue_ad
+            self.cumulative["cost_marketing"] += metrics.cost_marketing
+            self.cumulative["cost_operational"] += metrics.cost_operational
         
         # 3. 固定成本
         day_total_cost += config.global_fixed_cost
-        cumulative["cost_fixed"] += config.global_fixed_cost
+        self.cumulative["cost_fixed"] += config.global_fixed_cost
         
         # 4. 计算当日利润
         day_total_profit = day_total_revenue - day_total_cost
-        cumulative_profit += day_total_profit
+        self.cumulative_profit += day_total_profit
         
         # 5. 更新时序数据
-        totals_dau.append(day_total_dau)
-        totals_dnu_organic.append(day_total_dnu_organic)
-        totals_dnu_paid.append(day_total_dnu_paid)
-        totals_revenue.append(day_total_revenue)
-        totals_cost.append(day_total_cost)
-        totals_profit.append(day_total_profit)
+        self.totals["dau"].append(day_total_dau)
+        self.totals["dnu_organic"].append(day_total_dnu_organic)
+        self.totals["dnu_paid"].append(day_total_dnu_paid)
+        self.totals["revenue"].append(day_total_revenue)
+        self.totals["cost"].append(day_total_cost)
+        self.totals["profit"].append(day_total_profit)
         
         # 6. 检查里程碑
-        if day_total_profit > 0 and first_profitable_day is None:
-            first_profitable_day = day + 1
+        if day_total_profit > 0 and self.first_profitable_day is None:
+            self.first_profitable_day = day + 1
         
-        if cumulative_profit >= 0 and break_even_day is None:
-            break_even_day = day + 1
+        if self.cumulative_profit >= 0 and self.break_even_day is None:
+            self.break_even_day = day + 1
         
-        if day_total_dau > peak_dau:
-            peak_dau = day_total_dau
-            peak_dau_day = day + 1
+        if day_total_dau > self.peak_dau:
+            self.peak_dau = day_total_dau
+            self.peak_dau_day = day + 1
         
         # 7. 更新前一日税后收入（用于下一天的预算计算）
-        prev_revenue_after_tax = sum(
-            region_simulators[r].prev_dau * (
+        self.prev_revenue_after_tax = sum(
+            self.region_simulators[r].prev_dau * (
                 config.get_param("arpu_iap", month, r) * 0.7 +
                 config.get_param("arpu_ad", month, r) * 1.0
             )
-            for r in active_regions
+            for r in self.active_regions
         )
+        
+        self.day += 1
+    
+    def run(self, until: Optional[int] = None) -> "SimulationEngine":
+        """
+        推进到第 until 天结束（默认为模拟结束）
+        
+        Returns:
+            引擎自身
+        """
+        until = self.config.simulation_days if until is None else min(until, self.config.simulation_days)
+        while self.day < until:
+            self.step()
+        return self
+    
+    def iter_batches(self, batch: str = "week") -> Iterator[Dict[str, Any]]:
+        """
+        逐批推进到模拟结束，每批结束时生成该批的指标（生成器接口，用于流式输出）
+        
+        停止迭代即停止模拟；迭代结束后可调用 result() 得到完整结果
+        
+        Args:
+            batch: week（每 7 天）或 month（每个自然月）
+        """
+        if batch not in ("week", "month"):
+            raise ValueError(f"不支持的批次: {batch}")
+        while self.day < self.config.simulation_days:
+            start = self.day
+            if batch == "week":
+                until = start + 7
+            else:
+                current = self.start_date + timedelta(days=start)
+                next_month = date(current.year + current.month // 12, current.month % 12 + 1, 1)
+                until = start + (next_month - current).days
+            self.run(until)
+            yield self.batch_metrics(start, self.day)
     
-    # 计算执行时间
-    execution_time_ms = int((time.time() - start_time) * 1000)
+    def batch_metrics(self, start: int, stop: int) -> Dict[str, Any]:
+        """
+        第 [start, stop) 天的指标，附当前累计值与里程碑
+        
+        Returns:
+            {start_day, end_day, dates, days, totals, by_region, cumulative, milestones}
+        """
+        return {
+            "start_day": start + 1,
+            "end_day": stop,
+            "dates": [(self.start_date + timedelta(days=day)).isoformat() for day in range(start, stop)],
+            "days": list(range(start + 1, stop + 1)),
+            "totals": {name: values[start:stop] for name, values in self.totals.items()},
+            "by_region": {
+                region: {name: values[start:stop] for name, values in series.items()}
+                for region, series in self.region_timeseries.items()
+            },
+            "cumulative": {
+                "total_revenue": self.cumulative["revenue_iap"] + self.cumulative["revenue_ad"],
+                "total_cost": (
+                    self.cumulative["cost_marketing"]
+                    + self.cumulative["cost_operational"]
+                    + self.cumulative["cost_fixed"]
+                ),
+                "cumulative_profit": self.cumulative_profit,
+            },
+            "milestones": {
+                "break_even_day": self.break_even_day,
+                "first_profitable_day": self.first_profitable_day,
+                "peak_dau_day": self.peak_dau_day,
+                "peak_dau_value": self.peak_dau,
+            },
+        }
     
-    # 计算最终指标
-    total_revenue = cumulative["revenue_iap"] + cumulative["revenue_ad"]
-    total_cost = (
-        cumulative["cost_marketing"] +
-        cumulative["cost_operational"] +
-        cumulative["cost_fixed"]
-    )
-    net_profit = total_revenue - total_cost
-    # ROI = 收入/成本（不是净利润/成本），这样 ROI >= 1 表示盈利，ROI < 1 表示亏损
-    roi = total_revenue / total_cost if total_cost > 0 else 0
+    def snapshot(self, include_series: bool = True) -> SimulationState:
+        """
+        生成当前状态的检查点（与引擎不共享可变数据）
+
+        Args:
+            include_series: 是否包含已生成的时序；为 False 时生成轻量检查点，恢复前须补上前缀时序
+        """
+        return SimulationState(
+            config_json=self.config.model_dump_json(),
+            start_date=self.start_date.isoformat(),
+            day=self.day,
+            regions=list(self.active_regions),
+            region_states={
+                region: {
+                    "initial_dau": simulator.initial_dau,
+                    "alpha": simulator.alpha,
+                    "beta": simulator.beta,
+                    "gamma": simulator.gamma,
+                    "prev_dau": simulator.prev_dau,
+                }
+                for region, simulator in self.region_simulators.items()
+            },
+            dnu_history={
+                region: list(simulator.dnu_history)
+                for region, simulator in self.region_simulators.items()
+            },
+            cumulative=dict(self.cumulative),
+            trackers={
+                "cumulative_profit": self.cumulative_profit,
+                "break_even_day": self.break_even_day,
+                "first_profitable_day": self.first_profitable_day,
+                "peak_dau": self.peak_dau,
+                "peak_dau_day": self.peak_dau_day,
+                "prev_revenue_after_tax": self.prev_revenue_after_tax,
+            },
+            totals={name: list(values) for name, values in self.totals.items()} if include_series else None,
+            by_region={
+                region: {name: list(values) for name, values in series.items()}
+                for region, series in self.region_timeseries.items()
+            } if include_series else None,
+        )
     
-    initial_total_dau = sum(config.get_initial_dau(r) for r in active_regions)
-    final_dau = totals_dau[-1] if totals_dau else 0
-    dau_growth_rate = (final_dau - initial_total_dau) / initial_total_dau * 100 if initial_total_dau > 0 else 0
+    def _restore(self, state: SimulationState) -> None:
+        """从检查点恢复状态"""
+        if state.regions != self.active_regions:
+            raise ValueError(f"活跃地区与检查点不一致: {self.active_regions} != {state.regions}")
+        start_date = date.fromisoformat(state.start_date)
+        if self.config.start_date is not None and self.config.start_date != start_date:
+            raise ValueError(f"开始日期与检查点不一致: {self.config.start_date} != {start_date}")
+        if state.day > self.config.simulation_days:
+            raise ValueError(f"检查点（第 {state.day} 天）超出模拟天数 {self.config.simulation_days}")
+        if state.totals is None or state.by_region is None:
+            raise ValueError("检查点不含时序，恢复前须补上前缀时序")
+        
+        self.start_date = start_date
+        self.day = state.day
+        
+        # 留存率参数与初始 DAU 在模拟开始时确定，沿用检查点中的值
+        self.region_simulators = {}
+        for region in state.regions:
+            region_state = state.region_states[region]
+            simulator = RegionSimulator(
+                region=region,
+                initial_dau=region_state["initial_dau"],
+                retention_params=(region_state["alpha"], region_state["beta"], region_state["gamma"]),
+            )
+            simulator.restore_state(state.dnu_history[region], region_state["prev_dau"])
+            self.region_simulators[region] = simulator
+        
+        self.cumulative = dict(state.cumulative)
+        self.totals = {name: list(values) for name, values in state.totals.items()}
+        self.region_timeseries = {
+            region: {name: list(values) for name, values in series.items()}
+            for region, series in state.by_region.items()
+        }
+        
+        trackers = state.trackers
+        self.cumulative_profit = trackers["cumulative_profit"]
+        self.break_even_day = trackers["break_even_day"]
+        self.first_profitable_day = trackers["first_profitable_day"]
+        self.peak_dau = trackers["peak_dau"]
+        self.peak_dau_day = trackers["peak_dau_day"]
+        self.prev_revenue_after_tax = trackers["prev_revenue_after_tax"]
     
-    # 构建结果（为了向后兼容，保留 cost_api 和 cost_machine，但都设置为 cost_operational）
-    cost_operational_value = cumulative["cost_operational"]
-    result = SimulationResult(
-        status="success",
-        execution_time_ms=execution_time_ms,
-        config_hash=hashlib.md5(config.model_dump_json().encode()).hexdigest()[:8],
-        summary=Summary(
-            simulation_days=config.simulation_days,
-            active_regions=active_regions,
-            final_metrics=FinalMetrics(
-                total_dau=final_dau,
-                dau_by_region={
-                    r: region_timeseries[r]["dau"][-1] if region_timeseries[r]["dau"] else 0
-                    for r in active_regions
-                },
-                dau_growth_rate=dau_growth_rate,
-            ),
-            cumulative_metrics=CumulativeMetrics(
-                total_revenue=total_revenue,
-                revenue_iap=cumulative["revenue_iap"],
-                revenue_ad=cumulative["revenue_ad"],
-                total_cost=total_cost,
-                cost_marketing=cumulative["cost_marketing"],
-                cost_api=cost_operational_value,  # 向后兼容
-                cost_machine=0.0,  # 向后兼容，设为0
-                cost_fixed=cumulative["cost_fixed"],
-                net_profit=net_profit,
-                roi=roi,
-            ),
-            milestones=Milestones(
-                break_even_day=break_even_day,
-                first_profitable_day=first_profitable_day,
-                peak_dau_day=peak_dau_day,
-                peak_dau_value=peak_dau,
+    def result(self, start_time: Optional[float] = None) -> SimulationResult:
+        """
+        构建模拟结果
+        
+        Args:
+            start_time: 计时起点（time.time()），默认不计时
+        """
+        config = self.config
+        active_regions = self.active_regions
+        cumulative = self.cumulative
+        region_timeseries = self.region_timeseries
+        
+        # 计算执行时间
+        execution_time_ms = int((time.time() - start_time) * 1000) if start_time is not None else 0
+        
+        # 计算最终指标
+        total_revenue = cumulative["revenue_iap"] + cumulative["revenue_ad"]
+        total_cost = (
+            cumulative["cost_marketing"] +
+            cumulative["cost_operational"] +
+            cumulative["cost_fixed"]
+        )
+        net_profit = total_revenue - total_cost
+        # ROI = 收入/成本（不是净利润/成本），这样 ROI >= 1 表示盈利，ROI < 1 表示亏损
+        roi = total_revenue / total_cost if total_cost > 0 else 0
+        
+        initial_total_dau = sum(
+            self.region_simulators[r].initial_dau for r in active_regions
+        )
+        final_dau = self.totals["dau"][-1] if self.totals["dau"] else 0
+        dau_growth_rate = (final_dau - initial_total_dau) / initial_total_dau * 100 if initial_total_dau > 0 else 0
+        
+        dates_list = [(self.start_date + timedelta(days=day)).isoformat() for day in range(self.day)]
+        days_list = list(range(1, self.day + 1))
+        
+        # 构建结果（为了向后兼容，保留 cost_api 和 cost_machine，但都设置为 cost_operational）
+        cost_operational_value = cumulative["cost_operational"]
+        return SimulationResult(
+            status="success",
+            execution_time_ms=execution_time_ms,
+            config_hash=hashlib.md5(config.model_dump_json().encode()).hexdigest()[:8],
+            summary=Summary(
+                simulation_days=config.simulation_days,
+                active_regions=active_regions,
+                final_metrics=FinalMetrics(
+                    total_dau=final_dau,
+                    dau_by_region={
+                        r: region_timeseries[r]["dau"][-1] if region_timeseries[r]["dau"] else 0
+                        for r in active_regions
+                    },
+                    dau_growth_rate=dau_growth_rate,
+                ),
+                cumulative_metrics=CumulativeMetrics(
+                    total_revenue=total_revenue,
+                    revenue_iap=cumulative["revenue_iap"],
+                    revenue_ad=cumulative["revenue_ad"],
+                    total_cost=total_cost,
+                    cost_marketing=cumulative["cost_marketing"],
+                    cost_api=cost_operational_value,  # 向后兼容
+                    cost_machine=0.0,  # 向后兼容，设为0
+                    cost_fixed=cumulative["cost_fixed"],
+                    net_profit=net_profit,
+                    roi=roi,
+                ),
+                milestones=Milestones(
+                    break_even_day=self.break_even_day,
+                    first_profitable_day=self.first_profitable_day,
+                    peak_dau_day=self.peak_dau_day,
+                    peak_dau_value=self.peak_dau,
+                ),
             ),
-        ),
-        timeseries=Timeseries(
-            dates=dates_list,
-            days=days_list,
-            totals=RegionTimeseries(
-                dau=totals_dau,
-                dnu_organic=totals_dnu_organic,
-                dnu_paid=totals_dnu_paid,
-                revenue=totals_revenue,
-                cost=totals_cost,
-                profit=totals_profit,
+            timeseries=Timeseries(
+                dates=dates_list,
+                days=days_list,
+                totals=RegionTimeseries(**self.totals),
+                by_region={
+                    region: RegionTimeseries(**region_timeseries[region])
+                    for region in active_regions
+                } if config.output_options.include_region_breakdown else None,
             ),
-            by_region={
-                region: RegionTimeseries(
-                    dau=region_timeseries[region]["dau"],
-                    dnu_organic=region_timeseries[region]["dnu_organic"],
-                    dnu_paid=region_timeseries[region]["dnu_paid"],
-                    revenue=region_timeseries[region]["revenue"],
-                    cost=region_timeseries[region]["cost"],
-                    profit=region_timeseries[region]["profit"],
-                )
+            retention_curves={
+                region: self.region_simulators[region].get_retention_curve()
                 for region in active_regions
-            } if config.output_options.include_region_breakdown else None,
-        ),
-        retention_curves={
-            region: region_simulators[region].get_retention_curve()
-            for region in active_regions
-        },
-    )
+            },
+        )
+
+
+def run_simulation(config: SimulationConfig) -> SimulationResult:
+    """
+    运行模拟
     
-    return result
+    Args:
+        config: 模拟配置
+        
+    Returns:
+        SimulationResult 对象
+    """
+    start_time = time.time()
+    return SimulationEngine(config).run().result(start_time)
+
+
+def branch(state: SimulationState, config_delta: Dict[str, Any]) -> SimulationResult:
+    """
+    从检查点出发，在修改后的配置下继续模拟（what-if 分支）
+    
+    检查点之前的天数沿用原结果，之后的天数使用修改后的参数；
+    留存率拟合与初始 DAU 在模拟开始时确定，不受 config_delta 影响。
+    
+    Args:
+        state: 检查点
+        config_delta: 对检查点配置的修改（嵌套字典，按键递归合并）
+        
+    Returns:
+        完整时段的 SimulationResult
+    """
+    start_time = time.time()
+    config_data = merge_config_delta(json.loads(state.config_json), config_delta)
+    config = SimulationConfig.model_validate(config_data)
+    return SimulationEngine(config, state).run().result(start_time)
+
+
+def merge_config_delta(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """把 delta 递归合并到 base（字典按键合并，其他值直接替换），返回新字典"""
+    merged = dict(base)
+    for key, value in delta.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config_delta(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
@@ -0,0 +1,189 @@
+"""
+参数网格扫描模块
+
+网格按字段路径的字典序展开为笛卡尔积（最后一个字段变化最快），
+每个网格点的取值可由其序号直接计算，因此分片之间只需传递序号区间。
+
+每个分片维护可合并的部分聚合结果（汇总指标的矩与分位数草图、目标最优的前 k 个点），
+分片按序号顺序合并，结果与执行位置无关。
+"""
+
+import time
+import hashlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..models.config import SweepConfig
+from ..models.results import SweepResult, SweepPoint
+from .compiled import CompiledConfig, compile_config
+from .batch import simulate_batch
+from .aggregate import QuantileSketch, RunningMoments
+from .montecarlo import SUMMARY_METRICS, SKETCH_SIZE, summary_matrix, metric_distributions
+
+
+# 每次批量模拟的网格点数
+SWEEP_CHUNK_SIZE = 256
+
+# 每个分片包含的网格点数
+POINTS_PER_SHARD = 4096
+
+
+def grid_axes(grid: Dict[str, List[float]]) -> List[Tuple[str, np.ndarray]]:
+    """网格坐标轴（按字段路径排序）"""
+    return [(path, np.asarray(grid[path], dtype=np.float64)) for path in sorted(grid)]
+
+
+def grid_size(grid: Dict[str, List[float]]) -> int:
+    """网格点总数"""
+    size = 1
+    for values in grid.values():
+        size *= len(values)
+    return size
+
+
+def grid_values(axes: List[Tuple[str, np.ndarray]], start: int, stop: int) -> Dict[str, np.ndarray]:
+    """
+    计算序号区间 [start, stop) 内各网格点的字段取值
+
+    Returns:
+        {字段路径: (stop - start,) 取值}
+    """
+    index = np.arange(start, stop, dtype=np.int64)
+    values = {}
+    for path, axis in reversed(axes):
+        values[path] = axis[index % len(axis)]
+        index //= len(axis)
+    return {path: values[path] for path, _ in axes}
+
+
+def shard_ranges(size: int) -> List[Tuple[int, int]]:
+    """分片 -> 网格点序号区间"""
+    return [(start, min(start + POINTS_PER_SHARD, size)) for start in range(0, size, POINTS_PER_SHARD)]
+
+
+class SweepAggregate:
+    """网格扫描部分聚合结果"""
+
+    def __init__(self, objective: str, maximize: bool, top_k: int):
+        self.objective = objective
+        self.maximize = maximize
+        self.top_k = top_k
+        self.count = 0
+        self.summary_sketch = QuantileSketch(len(SUMMARY_METRICS), SKETCH_SIZE)
+        self.summary_moments = RunningMoments(len(SUMMARY_METRICS))
+        # 目标最优的前 k 个点: [(目标值, 序号, 汇总指标行)]
+        self.best: List[Tuple[float, int, np.ndarray]] = []
+
+    def update(self, summary: np.ndarray, start: int) -> "SweepAggregate":
+        """
+        并入一批网格点的汇总指标
+
+        Args:
+            summary: (n, len(SUMMARY_METRICS)) 汇总指标矩阵
+            start: 该批第一个网格点的序号
+        """
+        self.count += summary.shape[0]
+        self.summary_sketch.update(summary)
+        self.summary_moments.update(summary)
+
+        objective = summary[:, SUMMARY_METRICS.index(self.objective)]
+        # 只保留本批的前 k 个候选，再与已有结果合并
+        order = np.lexsort((np.arange(len(objective)), -objective if self.maximize else objective))
+        candidates = [
+            (float(objective[i]), start + int(i), summary[i].copy()) for i in order[:self.top_k]
+        ]
+        self._keep_best(candidates)
+        return self
+
+    def merge(self, other: "SweepAggregate") -> "SweepAggregate":
+        """合并另一部分聚合结果（原地更新并返回自身）"""
+        self.count += other.count
+        self.summary_sketch.merge(other.summary_sketch)
+        self.summary_moments.merge(other.summary_moments)
+        self._keep_best(other.best)
+        return self
+
+    def _keep_best(self, candidates: List[Tuple[float, int, np.ndarray]]) -> None:
+        """按 (目标值, 序号) 排序保留前 k 个，排序与合并顺序无关"""
+        sign = -1.0 if self.maximize else 1.0
+        self.best = sorted(self.best + candidates, key=lambda item: (sign * item[0], item[1]))[:self.top_k]
+
+
+def run_sweep_shard(
+    compiled: CompiledConfig,
+    grid: Dict[str, List[float]],
+    objective: str,
+    maximize: bool,
+    top_k: int,
+    shard_index: int,
+    progress: Optional[Callable[[int], None]] = None,
+) -> SweepAggregate:
+    """
+    运行一个分片的网格点
+
+    Args:
+        compiled: 编译后的基准配置
+        grid / objective / maximize / top_k: 同 SweepConfig
+        shard_index: 分片下标
+        progress: 每批完成后以该批网格点数调用；抛出异常可在批次之间中止分片
+    """
+    axes = grid_axes(grid)
+    start, stop = shard_ranges(grid_size(grid))[shard_index]
+    aggregate = SweepAggregate(objective, maximize, top_k)
+    for chunk_start in range(start, stop, SWEEP_CHUNK_SIZE):
+        chunk_stop = min(chunk_start + SWEEP_CHUNK_SIZE, stop)
+        batch = simulate_batch(
+            compiled,
+            samples=chunk_stop - chunk_start,
+            overrides=grid_values(axes, chunk_start, chunk_stop),
+        )
+        aggregate.update(summary_matrix(batch), chunk_start)
+        if progress is not None:
+            progress(chunk_stop - chunk_start)
+    return aggregate
+
+
+def run_sweep(sweep_config: SweepConfig) -> SweepResult:
+    """
+    运行参数网格扫描
+
+    Args:
+        sweep_config: 网格扫描配置
+
+    Returns:
+        SweepResult 对象
+    """
+    start_time = time.time()
+    compiled = compile_config(sweep_config.config)
+
+    aggregate = SweepAggregate(sweep_config.objective, sweep_config.maximize, sweep_config.top_k)
+    for shard_index in range(len(shard_ranges(grid_size(sweep_config.grid)))):
+        aggregate.merge(run_sweep_shard(
+            compiled, sweep_config.grid, sweep_config.objective,
+            sweep_config.maximize, sweep_config.top_k, shard_index,
+        ))
+
+    return build_sweep_result(sweep_config, aggregate, start_time)
+
+
+def build_sweep_result(sweep_config: SweepConfig, aggregate: SweepAggregate, start_time: float) -> SweepResult:
+    """由聚合结果构建 SweepResult"""
+    axes = grid_axes(sweep_config.grid)
+    best = []
+    for _, index, row in aggregate.best:
+        params = {path: float(values[0]) for path, values in grid_values(axes, index, index + 1).items()}
+        best.append(SweepPoint(
+            index=index,
+            params=params,
+            metrics={name: float(row[i]) for i, name in enumerate(SUMMARY_METRICS)},
+        ))
+
+    return SweepResult(
+        execution_time_ms=int((time.time() - start_time) * 1000),
+        config_hash=hashlib.md5(sweep_config.model_dump_json().encode()).hexdigest()[:8],
+        points=aggregate.count,
+        objective=sweep_config.objective,
+        best=best,
+        summary=metric_distributions(aggregate.summary_sketch, aggregate.summary_moments),
+    )
@@ -0,0 +1,136 @@
+"""
+启动预热
+
+部署后的第一个请求需要付出导入 scipy、构建 pydantic 序列化器、NumPy 首次调用与留存拟合等一次性开销。
+服务启动时在每个工作进程内预先执行这些步骤，预热完成前就绪检查（/ready）返回 503。
+
+预热深度（环境变量 PL_WARMUP_DEPTH）：
+- none: 不预热，启动后立即就绪
+- basic: 导入依赖、构建默认配置（含 JSON 往返校验）、拟合各地区留存曲线、编译参数表
+- full（默认）: 在 basic 基础上运行 PL_WARMUP_DAYS 天（默认 30）的逐日模拟并序列化结果，
+  以及批量引擎与周步长预览各一次
+
+留存拟合结果由 fit_retention_params 的缓存保留，使用默认留存率的请求不再重新拟合。
+预热只调用无状态的函数，不写入增量模拟器、结果存储等请求级缓存。
+"""
+
+import importlib
+import os
+import threading
+import time
+from datetime import date
+from typing import Any, Callable, Dict, Optional
+
+from ..models.config import SimulationConfig
+from .batch import simulate_batch
+from .compiled import compile_config
+from .preview import run_preview
+from .retention import fit_retention_params
+from .simulator import run_simulation
+
+
+WARMUP_DEPTHS = ("none", "basic", "full")
+
+# 预热深度与模拟天数（可通过环境变量覆盖）
+DEFAULT_DEPTH = os.environ.get("PL_WARMUP_DEPTH", "full")
+WARMUP_DAYS = int(os.environ.get("PL_WARMUP_DAYS", "30"))
+
+# 首次使用时才导入的重型依赖
+DEFERRED_MODULES = ("scipy.optimize",)
+
+
+def _fit_retention(config: SimulationConfig) -> None:
+    """拟合各活跃地区在开始月份的留存曲线（结果进入 fit_retention_params 的缓存）"""
+    month = (config.start_date or date.today()).month
+    for region in config.get_active_regions():
+        retention = config.get_retention(month, region).to_dict()
+        fit_retention_params(*(retention[day] for day in (1, 2, 3, 7, 14, 30, 60)))
+
+
+def warm_up(depth: str = DEFAULT_DEPTH, days: int = WARMUP_DAYS) -> Dict[str, Any]:
+    """
+    执行预热
+
+    Returns:
+        {"depth", "days", "phases_ms": {阶段: 耗时}, "duration_ms"}
+
+    Raises:
+        ValueError: 未知的预热深度
+    """
+    if depth not in WARMUP_DEPTHS:
+        raise ValueError(f"未知的预热深度: {depth}（可选 {', '.join(WARMUP_DEPTHS)}）")
+
+    phases: Dict[str, float] = {}
+    start = time.perf_counter()
+
+    def timed(name: str, func: Callable[[], Any]) -> Any:
+        phase_start = time.perf_counter()
+        value = func()
+        phases[name] = round((time.perf_counter() - phase_start) * 1000, 1)
+        return value
+
+    if depth != "none":
+        timed("imports", lambda: [importlib.import_module(name) for name in DEFERRED_MODULES])
+        config = timed("config", lambda: SimulationConfig.model_validate_json(SimulationConfig().model_dump_json()))
+        timed("retention_fit", lambda: _fit_retention(config))
+        timed("compile", lambda: compile_config(config))
+
+    if depth == "full":
+        short = config.model_copy(update={"simulation_days": min(days, config.simulation_days)})
+        timed("simulate", lambda: run_simulation(short).model_dump_json())
+        timed("batch", lambda: simulate_batch(compile_config(short), samples=2, include_regions=True))
+        timed("preview", lambda: run_preview(short).model_dump_json())
+
+    return {
+        "depth": depth,
+        "days": days,
+        "phases_ms": phases,
+        "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+class WarmupState:
+    """
+    预热状态（供就绪检查读取）
+
+    status: pending（未开始）/ running / ready / failed；
+    预热失败不影响服务可用性，只是首个请求较慢，failed 时同样视为就绪
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self.status = "pending"
+        self.report: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    def run(self, depth: str = DEFAULT_DEPTH, days: int = WARMUP_DAYS) -> None:
+        """执行预热并记录结果（阻塞）"""
+        with self._lock:
+            self.status = "running"
+        try:
+            report = warm_up(depth, days)
+        except Exception as e:
+            with self._lock:
+                self.status, self.error = "failed", str(e)
+        else:
+            with self._lock:
+                self.status, self.report = "ready", report
+        self._done.set()
+
+    def start(self, depth: str = DEFAULT_DEPTH, days: int = WARMUP_DAYS) -> threading.Thread:
+        """在后台线程中预热（服务可立即响应存活检查）"""
+        thread = threading.Thread(target=self.run, args=(depth, days), name="pl-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"status": self.status, "ready": self.ready, "report": self.report, "error": self.error}
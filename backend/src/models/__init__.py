@@ -6,6 +6,13 @@ from .config import (
     RegionOverride,
     OutputOptions,
     SimulationConfig,
+    SensitivityRequest,
+    Distribution,
+    MonteCarloConfig,
+    SweepConfig,
+    PatchOperation,
+    ScenarioCreate,
+    JobRequest,
 )
 from .results import (
     FinalMetrics,
@@ -16,6 +23,15 @@ from .results import (
     RegionTimeseries,
     RetentionCurve,
     SimulationResult,
+    SensitivityResult,
+    QuantileBands,
+    MetricDistribution,
+    MonteCarloResult,
+    SweepPoint,
+    SweepResult,
+    ScenarioSummary,
+    ScenarioList,
+    JobStatus,
 )
 
 __all__ = [
@@ -26,6 +42,13 @@ __all__ = [
     "RegionOverride",
     "OutputOptions",
     "SimulationConfig",
+    "SensitivityRequest",
+    "Distribution",
+    "MonteCarloConfig",
+    "SweepConfig",
+    "PatchOperation",
+    "ScenarioCreate",
+    "JobRequest",
     "FinalMetrics",
     "CumulativeMetrics",
     "Milestones",
@@ -34,4 +57,13 @@ __all__ = [
     "RegionTimeseries",
     "RetentionCurve",
     "SimulationResult",
+    "SensitivityResult",
+    "QuantileBands",
+    "MetricDistribution",
+    "MonteCarloResult",
+    "SweepPoint",
+    "SweepResult",
+    "ScenarioSummary",
+    "ScenarioList",
+    "JobStatus",
 ]
@@ -4,9 +4,10 @@ API 输入配置模型
 采用"全局默认值 + 地区覆盖 + 月份覆盖"的三层结构
 """
 
-from typing import Dict, List, Optional
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import date
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 
 class RetentionConfig(BaseModel):
@@ -128,37 +129,60 @@ class SimulationConfig(BaseModel):
         """获取活跃地区列表（预算分配比例大于 0 的地区）"""
         return [r for r, ratio in self.budget.region_distribution.items() if ratio > 0]
     
+    def fingerprint(self) -> str:
+        """
+        配置指纹（用于缓存键）
+        
+        start_date 为空时按当天日期解析，因此同一配置在不同日期的指纹不同
+        """
+        resolved = self.model_copy(update={"start_date": self.start_date or date.today()})
+        return hashlib.md5(resolved.model_dump_json().encode()).hexdigest()
+    
     def get_param(self, param_name: str, month: int, region: str) -> float:
         """
         获取指定参数值，支持三层覆盖
         
         优先级: 月份+地区 > 地区 > 全局默认值
         """
+        return self.resolve_param(param_name, month, region)[0]
+    
+    def resolve_param(self, param_name: str, month: int, region: str) -> Tuple[float, str]:
+        """
+        获取指定参数值及其来源字段路径
+        
+        路径使用点号分隔，如 "monthly_overrides.02.JP.cpi"、"regions.JP.cpi"、"defaults.cpi"
+        """
         # 检查月份+地区覆盖
         month_key = f"{month:02d}" if isinstance(month, int) else str(month)
         if month_key in self.monthly_overrides and region in self.monthly_overrides[month_key]:
             region_override = self.monthly_overrides[month_key][region]
             value = getattr(region_override, param_name, None)
             if value is not None:
-                return value
+                return value, f"monthly_overrides.{month_key}.{region}.{param_name}"
         
         # 检查地区覆盖
         if region in self.regions:
             value = getattr(self.regions[region], param_name, None)
             if value is not None:
-                return value
+                return value, f"regions.{region}.{param_name}"
         
         # 返回全局默认值
-        return getattr(self.defaults, param_name)
+        return getattr(self.defaults, param_name), f"defaults.{param_name}"
     
     def get_retention(self, month: int, region: str) -> RetentionConfig:
         """获取指定月份和地区的留存率配置"""
+        return self.resolve_retention(month, region)[0]
+    
+    def resolve_retention(self, month: int, region: str) -> Tuple[RetentionConfig, Dict[str, str]]:
+        """获取指定月份和地区的留存率配置，以及每个留存节点的来源字段路径"""
         base_retention = self.defaults.retention.model_copy()
+        sources = {key: f"defaults.retention.{key}" for key in RetentionConfig.model_fields}
         
         # 应用地区覆盖
         if region in self.regions and self.regions[region].retention:
             for key, value in self.regions[region].retention.items():
                 setattr(base_retention, key, value)
+                sources[key] = f"regions.{region}.retention.{key}"
         
         # 应用月份+地区覆盖
         month_key = f"{month:02d}" if isinstance(month, int) else str(month)
@@ -167,8 +191,9 @@ class SimulationConfig(BaseModel):
             if region_override.retention:
                 for key, value in region_override.retention.items():
                     setattr(base_retention, key, value)
+                    sources[key] = f"monthly_overrides.{month_key}.{region}.retention.{key}"
         
-        return base_retention
+        return base_retention, sources
     
     def get_initial_dau(self, region: str) -> int:
         """
@@ -179,8 +204,17 @@ class SimulationConfig(BaseModel):
         - US: 20%
         - EMEA, LATAM, CN, OTHER: 各 15%
         """
+        return self.resolve_initial_dau(region)[0]
+    
+    def resolve_initial_dau(self, region: str) -> Tuple[int, str, float]:
+        """
+        获取指定地区的初始 DAU、来源字段路径及折算比例
+        
+        Returns:
+            (initial_dau, source, scale)，其中 initial_dau = int(来源字段值 × scale)
+        """
         if region in self.regions and self.regions[region].initial_dau is not None:
-            return self.regions[region].initial_dau
+            return self.regions[region].initial_dau, f"regions.{region}.initial_dau", 1.0
         
         # 按比例分配全局默认值
         distribution = {
@@ -192,4 +226,115 @@ class SimulationConfig(BaseModel):
             "OTHER": 0.15,
         }
         ratio = distribution.get(region, 0.15)
-        return int(self.defaults.initial_dau * ratio)
+        return int(self.defaults.initial_dau * ratio), "defaults.initial_dau", ratio
+
+
+class SensitivityRequest(BaseModel):
+    """敏感度分析请求"""
+    config: SimulationConfig = Field(description="模拟配置")
+    inputs: List[str] = Field(
+        min_length=1,
+        description="求导的输入字段路径，如 ['defaults.cpi', 'regions.JP.arpu_iap', 'budget.base_ratio']",
+    )
+
+
+class Distribution(BaseModel):
+    """参数分布（蒙特卡洛模拟使用）"""
+    type: str = Field(
+        default="normal",
+        pattern="^(normal|lognormal|uniform|triangular)$",
+        description="分布类型：normal（正态）、lognormal（对数正态）、uniform（均匀）、triangular（三角）",
+    )
+    mean: Optional[float] = Field(default=None, description="均值（normal / lognormal）")
+    std: Optional[float] = Field(default=None, ge=0, description="标准差（normal / lognormal）")
+    low: Optional[float] = Field(default=None, description="下界（uniform / triangular；normal 时用于截断）")
+    high: Optional[float] = Field(default=None, description="上界（uniform / triangular；normal 时用于截断）")
+    mode: Optional[float] = Field(default=None, description="众数（triangular）")
+    
+    @model_validator(mode="after")
+    def validate_params(self) -> "Distribution":
+        """校验分布参数完整"""
+        required = {
+            "normal": ("mean", "std"),
+            "lognormal": ("mean", "std"),
+            "uniform": ("low", "high"),
+            "triangular": ("low", "mode", "high"),
+        }[self.type]
+        missing = [name for name in required if getattr(self, name) is None]
+        if missing:
+            raise ValueError(f"{self.type} 分布缺少参数: {', '.join(missing)}")
+        if self.type == "lognormal" and self.mean <= 0:
+            raise ValueError("lognormal 分布的均值必须大于 0")
+        if self.low is not None and self.high is not None and self.low > self.high:
+            raise ValueError("分布下界不能大于上界")
+        return self
+
+
+class MonteCarloConfig(BaseModel):
+    """蒙特卡洛模拟配置"""
+    config: SimulationConfig = Field(default_factory=SimulationConfig, description="基准模拟配置")
+    distributions: Dict[str, Distribution] = Field(
+        default_factory=dict,
+        description="字段分布，键为字段路径，如 {'defaults.cpi': {'type': 'normal', 'mean': 2.0, 'std': 0.2}}",
+    )
+    samples: int = Field(ge=1, le=100000, default=1000, description="样本数")
+    seed: int = Field(ge=0, default=0, description="随机种子")
+    chunk_size: int = Field(ge=1, le=10000, default=256, description="每批样本数（决定内存占用与随机数分片）")
+
+
+class SweepConfig(BaseModel):
+    """参数网格扫描配置"""
+    config: SimulationConfig = Field(default_factory=SimulationConfig, description="基准模拟配置")
+    grid: Dict[str, List[float]] = Field(
+        description="字段取值网格，键为字段路径，如 {'defaults.cpi': [1.0, 1.5, 2.0], 'budget.base_ratio': [0.5, 1.0]}",
+    )
+    objective: str = Field(
+        default="net_profit",
+        pattern="^(final_dau|peak_dau|total_revenue|total_cost|net_profit|roi)$",
+        description="排序目标指标",
+    )
+    maximize: bool = Field(default=True, description="目标越大越好")
+    top_k: int = Field(ge=1, le=1000, default=10, description="返回最优的前 k 个网格点")
+    
+    @field_validator("grid")
+    @classmethod
+    def validate_grid(cls, v: Dict[str, List[float]]) -> Dict[str, List[float]]:
+        """校验网格非空"""
+        if not v:
+            raise ValueError("网格至少需要一个字段")
+        for path, values in v.items():
+            if not values:
+                raise ValueError(f"字段 {path} 的取值列表为空")
+        return v
+
+
+class PatchOperation(BaseModel):
+    """JSON Patch 操作（RFC 6902）"""
+    model_config = ConfigDict(populate_by_name=True)
+    
+    op: str = Field(pattern="^(add|remove|replace|move|copy|test)$", description="操作类型")
+    path: str = Field(description="目标路径（JSON Pointer），如 /budget/additional_by_month/9")
+    value: Any = Field(default=None, description="add / replace / test 的取值")
+    from_: Optional[str] = Field(default=None, alias="from", description="move / copy 的来源路径")
+    
+    @model_validator(mode="after")
+    def validate_from(self) -> "PatchOperation":
+        """move / copy 需要来源路径"""
+        if self.op in ("move", "copy") and self.from_ is None:
+            raise ValueError(f"{self.op} 操作需要 from 字段")
+        return self
+
+
+class ScenarioCreate(BaseModel):
+    """保存到场景库的场景"""
+    config: SimulationConfig = Field(default_factory=SimulationConfig, description="模拟配置")
+    name: Optional[str] = Field(default=None, max_length=200, description="场景名称")
+
+
+class JobRequest(BaseModel):
+    """后台任务请求"""
+    kind: str = Field(pattern="^(simulate|monte_carlo|sweep)$", description="任务类型")
+    request: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="任务请求体：simulate 为 SimulationConfig，monte_carlo 为 MonteCarloConfig，sweep 为 SweepConfig",
+    )
@@ -79,12 +79,119 @@ class SimulationResult(BaseModel):
     status: str = Field(default="success", description="状态")
     execution_time_ms: int = Field(description="执行时间（毫秒）")
     config_hash: Optional[str] = Field(default=None, description="配置哈希值")
+    result_id: Optional[str] = Field(default=None, description="结果 ID（用于 /api/results/{id} 读取与导出）")
     
     summary: Summary = Field(description="汇总信息")
     timeseries: Timeseries = Field(description="时序数据")
     retention_curves: Dict[str, RetentionCurve] = Field(description="各地区留存率曲线")
 
 
+class SensitivityResult(BaseModel):
+    """敏感度分析结果"""
+    status: str = Field(default="success", description="状态")
+    execution_time_ms: int = Field(description="执行时间（毫秒）")
+    config_hash: Optional[str] = Field(default=None, description="配置哈希值")
+    
+    inputs: List[str] = Field(description="求导的输入字段路径")
+    metrics: Dict[str, float] = Field(description="汇总指标值")
+    gradients: Dict[str, Dict[str, float]] = Field(description="梯度 {指标: {输入: ∂指标/∂输入}}")
+
+
+class QuantileBands(BaseModel):
+    """分位数区间（扇形图）"""
+    p5: List[float] = Field(description="P5")
+    p50: List[float] = Field(description="P50（中位数）")
+    p95: List[float] = Field(description="P95")
+    mean: List[float] = Field(description="均值")
+
+
+class MetricDistribution(BaseModel):
+    """单个汇总指标的分布"""
+    mean: float = Field(description="均值")
+    std: float = Field(description="标准差")
+    min: float = Field(description="最小值")
+    max: float = Field(description="最大值")
+    p5: float = Field(description="P5")
+    p50: float = Field(description="P50（中位数）")
+    p95: float = Field(description="P95")
+
+
+class MonteCarloResult(BaseModel):
+    """蒙特卡洛模拟结果"""
+    status: str = Field(default="success", description="状态")
+    execution_time_ms: int = Field(description="执行时间（毫秒）")
+    config_hash: Optional[str] = Field(default=None, description="配置哈希值")
+    
+    samples: int = Field(description="样本数")
+    seed: int = Field(description="随机种子")
+    dates: List[str] = Field(description="日期列表")
+    days: List[int] = Field(description="天数列表")
+    bands: Dict[str, QuantileBands] = Field(description="每日分位数区间（dau / revenue / profit）")
+    summary: Dict[str, MetricDistribution] = Field(description="汇总指标分布")
+    break_even_probability: float = Field(description="模拟期内达到盈亏平衡的概率")
+
+
+class SweepPoint(BaseModel):
+    """网格扫描中的单个网格点"""
+    index: int = Field(description="网格点序号")
+    params: Dict[str, float] = Field(description="字段取值")
+    metrics: Dict[str, float] = Field(description="汇总指标")
+
+
+class SweepResult(BaseModel):
+    """参数网格扫描结果"""
+    status: str = Field(default="success", description="状态")
+    execution_time_ms: int = Field(description="执行时间（毫秒）")
+    config_hash: Optional[str] = Field(default=None, description="配置哈希值")
+    
+    points: int = Field(description="已评估的网格点数")
+    objective: str = Field(description="排序目标指标")
+    best: List[SweepPoint] = Field(description="最优网格点（按目标排序）")
+    summary: Dict[str, MetricDistribution] = Field(description="全部网格点的汇总指标分布")
+
+
+class ScenarioSummary(BaseModel):
+    """场景库中的单个场景（只含索引的汇总指标）"""
+    id: str = Field(description="场景 ID（配置指纹）")
+    name: Optional[str] = Field(default=None, description="场景名称")
+    created_at: str = Field(description="保存时间")
+    config_hash: Optional[str] = Field(default=None, description="配置哈希值")
+    simulation_days: int = Field(description="模拟天数")
+    roi: float = Field(description="投资回报率")
+    net_profit: float = Field(description="净利润")
+    total_revenue: float = Field(description="总收入")
+    total_cost: float = Field(description="总成本")
+    break_even_day: Optional[int] = Field(default=None, description="盈亏平衡日")
+    first_profitable_day: Optional[int] = Field(default=None, description="首次盈利日")
+    peak_dau_value: int = Field(description="DAU 峰值")
+    final_dau: int = Field(description="最终 DAU")
+
+
+class ScenarioList(BaseModel):
+    """场景库查询结果"""
+    total: int = Field(description="符合条件的场景数")
+    offset: int = Field(description="偏移量")
+    limit: int = Field(description="每页数量")
+    items: List[ScenarioSummary] = Field(description="当前页的场景")
+
+
+class JobStatus(BaseModel):
+    """后台任务状态"""
+    job_id: str = Field(description="任务 ID")
+    kind: str = Field(description="任务类型")
+    status: str = Field(description="状态：queued / running / succeeded / failed / cancelled")
+    unit: str = Field(description="进度单位：days / samples / points")
+    done: int = Field(description="已完成数")
+    total: int = Field(description="总数（任务开始运行后确定）")
+    percent: float = Field(description="完成百分比")
+    partial: Optional[Dict[str, Any]] = Field(default=None, description="已完成部分的聚合结果")
+    result: Optional[Dict[str, Any]] = Field(default=None, description="任务结果（成功后返回）")
+    error: Optional[str] = Field(default=None, description="错误信息")
+    created_at: str = Field(description="提交时间")
+    started_at: Optional[str] = Field(default=None, description="开始时间")
+    finished_at: Optional[str] = Field(default=None, description="结束时间")
+
+
 class ValidationResult(BaseModel):
     """参数校验结果"""
     valid: bool = Field(description="是否有效")
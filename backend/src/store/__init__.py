@@ -0,0 +1,4 @@
+from .results import ResultStore, StoredResult, result_id_for
+from .scenarios import ScenarioLibrary
+
+__all__ = ["ResultStore", "StoredResult", "result_id_for", "ScenarioLibrary"]
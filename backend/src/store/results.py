@@ -0,0 +1,368 @@
+"""
+模拟结果存储模块
+
+/api/simulate 的结果按结果 ID 写入本地目录，每个结果一个 .npz 文件：
+- 时序数据以 NumPy 数组保存（汇总及各地区的 dau / dnu_organic / dnu_paid / revenue / cost / profit）
+- 汇总信息、留存率曲线等以 JSON 元数据保存
+
+读取时只加载元数据和所需的数组，支持字段投影、日期区间切片与分页，
+导出时直接由存储的数组逐行生成，不需要重新模拟。
+
+结果 ID 由配置指纹（SimulationConfig.fingerprint()）与 ENGINE_VERSION 生成，相同配置只保存一次；
+存储目录跨重启保留，引擎版本变化后旧结果不再被命中（按写入顺序淘汰）。
+"""
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..models.config import SimulationConfig
+from ..models.results import SimulationResult, Summary, Timeseries, RegionTimeseries, RetentionCurve
+from ..core.checkpoint import SERIES_FIELDS
+from ..core.simulator import ENGINE_VERSION
+from ..utils.downsample import lttb_indices
+
+
+# 存储目录（可通过环境变量覆盖）
+DEFAULT_ROOT = os.environ.get("PL_RESULT_STORE_DIR", os.path.join(tempfile.gettempdir(), "pl_results"))
+
+# 最多保留的结果数（超出时删除最早写入的结果）
+MAX_RESULTS = 1000
+
+# 导出时每次生成的行数
+EXPORT_CHUNK_DAYS = 256
+
+SERIES_NAMES = tuple(name for name, _ in SERIES_FIELDS)
+
+_META_KEY = "__meta__"
+
+
+def result_id_for(config: SimulationConfig) -> str:
+    """配置对应的结果 ID（配置指纹与引擎版本的哈希）"""
+    return hashlib.md5(f"{config.fingerprint()}:{ENGINE_VERSION}".encode()).hexdigest()
+
+
+class StoredResult:
+    """从存储中读取的单个结果（时序数组按需加载）"""
+
+    def __init__(self, result_id: str, meta: Dict[str, Any], source: Union[str, bytes], keys: Sequence[str]):
+        self.result_id = result_id
+        self.meta = meta
+        self._source = source
+        self._keys = set(keys)
+        self._arrays: Dict[str, np.ndarray] = {}
+        self.start_date = date.fromisoformat(meta["start_date"])
+        self.days = meta["days"]
+        self.regions: List[str] = meta["regions"]
+
+    def series(self, name: str, region: Optional[str] = None) -> np.ndarray:
+        """时序数组（region 为空时为汇总）"""
+        key = f"totals.{name}" if region is None else f"by_region.{region}.{name}"
+        if key not in self._keys:
+            raise KeyError(f"字段不存在: {key}")
+        if key not in self._arrays:
+            with _open(self._source) as data:
+                self._arrays[key] = data[key]
+        return self._arrays[key]
+
+    @classmethod
+    def load(cls, result_id: str, source: Union[str, bytes]) -> "StoredResult":
+        """
+        由文件路径或 pack_result() 的字节读取（只读取元数据）
+
+        Raises:
+            FileNotFoundError: 文件不存在
+        """
+        with _open(source) as data:
+            meta = json.loads(data[_META_KEY].tobytes().decode())
+            keys = [key for key in data.files if key != _META_KEY]
+        return cls(result_id, meta, source, keys)
+
+    @classmethod
+    def from_result(cls, result_id: Optional[str], result: SimulationResult) -> "StoredResult":
+        """由内存中的 SimulationResult 构建（不读写文件，数组已全部就绪）"""
+        arrays = result_arrays(result)
+        meta = json.loads(arrays.pop(_META_KEY).tobytes().decode())
+        stored = cls(result_id, meta, b"", arrays)
+        stored._arrays = arrays
+        return stored
+
+    def day_range(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Tuple[int, int]:
+        """
+        日期区间 [start, end]（含两端）再按 offset / limit 分页后的天下标区间 [i0, i1)
+        """
+        i0 = 0 if start is None else max((start - self.start_date).days, 0)
+        i1 = self.days if end is None else min((end - self.start_date).days + 1, self.days)
+        i0 = min(i0 + offset, self.days)
+        if limit is not None:
+            i1 = min(i1, i0 + limit)
+        return i0, max(i0, i1)
+
+    def dates(self, i0: int, i1: int) -> List[str]:
+        return [(self.start_date + timedelta(days=day)).isoformat() for day in range(i0, i1)]
+
+    def project(
+        self,
+        fields: Optional[Sequence[str]],
+        i0: int,
+        i1: int,
+        arrays: bool = False,
+        max_points: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        按字段路径投影
+
+        Args:
+            fields: 字段路径，如 ["summary.milestones", "timeseries.totals.dau", "timeseries.by_region.JP"]；
+                    为空时返回全部字段
+            i0, i1: 天下标区间
+            arrays: 时序以 NumPy 数组（存储数组的切片）而非列表返回，用于二进制编码
+            max_points: 每条时序最多返回的点数（LTTB 降采样）；给定时每条时序为
+                        {"days": 天数, "values": 取值}，不再返回完整的 dates / days
+
+        Returns:
+            与 SimulationResult 结构相同的嵌套字典（只含所选字段）
+        """
+        fields = list(fields) if fields else ["summary", "timeseries", "retention_curves"]
+        output: Dict[str, Any] = {
+            "result_id": self.result_id,
+            "config_hash": self.meta["config_hash"],
+            "total_days": self.days,
+            "range": {"offset": i0, "count": i1 - i0},
+        }
+        for path in fields:
+            parts = path.split(".")
+            if parts[0] == "timeseries":
+                self._project_timeseries(output, parts[1:], i0, i1, arrays, max_points)
+            elif parts[0] in ("summary", "retention_curves"):
+                value = self.meta[parts[0]]
+                for part in parts[1:]:
+                    if not isinstance(value, dict) or part not in value:
+                        raise KeyError(f"字段不存在: {path}")
+                    value = value[part]
+                _set_path(output, parts, value)
+            else:
+                raise KeyError(f"字段不存在: {path}")
+        return output
+
+    def _project_timeseries(
+        self,
+        output: Dict[str, Any],
+        parts: List[str],
+        i0: int,
+        i1: int,
+        arrays: bool = False,
+        max_points: Optional[int] = None,
+    ) -> None:
+        timeseries = output.setdefault("timeseries", {})
+        if max_points is None:
+            timeseries["dates"] = self.dates(i0, i1)
+            timeseries["days"] = list(range(i0 + 1, i1 + 1))
+        else:
+            # 降采样后各时序的取点不同，由 start_date 与各点的天数还原日期
+            timeseries["start_date"] = self.start_date.isoformat()
+            timeseries["max_points"] = max_points
+
+        if not parts:
+            targets = [("totals", None)] + [("by_region", region) for region in self.regions]
+            names: Sequence[str] = SERIES_NAMES
+        elif parts[0] == "totals":
+            targets = [("totals", None)]
+            names = parts[1:2] or SERIES_NAMES
+        elif parts[0] == "by_region":
+            regions = parts[1:2] or self.regions
+            targets = [("by_region", region) for region in regions]
+            names = parts[2:3] or SERIES_NAMES
+        elif parts[0] in ("dates", "days"):
+            return
+        else:
+            raise KeyError(f"字段不存在: timeseries.{'.'.join(parts)}")
+
+        for group, region in targets:
+            if region is not None and region not in self.regions:
+                raise KeyError(f"地区不存在: {region}")
+            for name in names:
+                values = self.series(name, region)[i0:i1]
+                if max_points is not None:
+                    indices = lttb_indices(values, max_points)
+                    days, values = indices + (i0 + 1), values[indices]
+                    if not arrays:
+                        days = days.tolist()
+                if not arrays:
+                    values = values.tolist()
+                if max_points is not None:
+                    values = {"days": days, "values": values}
+                path = ["timeseries", group, name] if region is None else ["timeseries", group, region, name]
+                _set_path(output, path, values)
+
+    def to_result(self) -> SimulationResult:
+        """重建完整的 SimulationResult"""
+        def region_timeseries(region: Optional[str]) -> RegionTimeseries:
+            return RegionTimeseries(**{name: self.series(name, region).tolist() for name in SERIES_NAMES})
+
+        return SimulationResult(
+            execution_time_ms=self.meta["execution_time_ms"],
+            config_hash=self.meta["config_hash"],
+            result_id=self.result_id,
+            summary=Summary.model_validate(self.meta["summary"]),
+            timeseries=Timeseries(
+                dates=self.dates(0, self.days),
+                days=list(range(1, self.days + 1)),
+                totals=region_timeseries(None),
+                by_region={region: region_timeseries(region) for region in self.regions} or None,
+            ),
+            retention_curves={
+                region: RetentionCurve.model_validate(curve)
+                for region, curve in self.meta["retention_curves"].items()
+            },
+        )
+
+    def iter_csv(self, i0: int, i1: int) -> Iterator[str]:
+        """逐块生成 CSV（与 /api/export 的列相同）"""
+        yield "Day,Date,DAU,DNU_Organic,DNU_Paid,Revenue,Cost,Profit,Cumulative_Profit\r\n"
+        dau, organic, paid = (self.series(name) for name in ("dau", "dnu_organic", "dnu_paid"))
+        revenue, cost, profit = (self.series(name) for name in ("revenue", "cost", "profit"))
+
+        # 累计利润从第 0 天开始累加，分页导出时取值与完整导出一致
+        cumulative_profit = 0.0
+        for day in range(i0):
+            cumulative_profit += float(profit[day])
+
+        for chunk_start in range(i0, i1, EXPORT_CHUNK_DAYS):
+            chunk_stop = min(chunk_start + EXPORT_CHUNK_DAYS, i1)
+            buffer = io.StringIO()
+            dates = self.dates(chunk_start, chunk_stop)
+            for k, day in enumerate(range(chunk_start, chunk_stop)):
+                day_profit = float(profit[day])
+                cumulative_profit += day_profit
+                buffer.write(
+                    f"{day + 1},{dates[k]},{int(dau[day])},{int(organic[day])},{int(paid[day])},"
+                    f"{round(float(revenue[day]), 2)},{round(float(cost[day]), 2)},"
+                    f"{round(day_profit, 2)},{round(cumulative_profit, 2)}\r\n"
+                )
+            yield buffer.getvalue()
+
+    def iter_json(self, fields: Optional[Sequence[str]], i0: int, i1: int) -> Iterator[str]:
+        """生成投影后的 JSON"""
+        yield json.dumps(self.project(fields, i0, i1), ensure_ascii=False)
+
+
+def _open(source: Union[str, bytes]):
+    return np.load(io.BytesIO(source) if isinstance(source, bytes) else source)
+
+
+def result_arrays(result: SimulationResult) -> Dict[str, np.ndarray]:
+    """把 SimulationResult 转为 {名称: 数组}（元数据以 JSON 字节保存在 __meta__ 中）"""
+    timeseries = result.timeseries
+    regions = list(timeseries.by_region or {})
+    meta = {
+        "execution_time_ms": result.execution_time_ms,
+        "config_hash": result.config_hash,
+        "start_date": timeseries.dates[0] if timeseries.dates else date.today().isoformat(),
+        "days": len(timeseries.days),
+        "regions": regions,
+        "summary": result.summary.model_dump(mode="json"),
+        "retention_curves": {
+            region: curve.model_dump(mode="json") for region, curve in result.retention_curves.items()
+        },
+    }
+    arrays = {_META_KEY: np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8)}
+    for name, dtype in SERIES_FIELDS:
+        arrays[f"totals.{name}"] = np.asarray(getattr(timeseries.totals, name), dtype=dtype)
+        for region in regions:
+            arrays[f"by_region.{region}.{name}"] = np.asarray(
+                getattr(timeseries.by_region[region], name), dtype=dtype
+            )
+    return arrays
+
+
+def pack_result(result: SimulationResult) -> bytes:
+    """把 SimulationResult 压缩为字节（可用 StoredResult.load 读取）"""
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **result_arrays(result))
+    return buffer.getvalue()
+
+
+def _set_path(output: Dict[str, Any], parts: Sequence[str], value: Any) -> None:
+    target = output
+    for part in parts[:-1]:
+        target = target.setdefault(part, {})
+    target[parts[-1]] = value
+
+
+class ResultStore:
+    """
+    本地结果存储
+
+    Args:
+        root: 存储目录
+        max_results: 最多保留的结果数
+    """
+
+    def __init__(self, root: str = DEFAULT_ROOT, max_results: int = MAX_RESULTS):
+        self.root = root
+        self.max_results = max_results
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, result_id: str) -> str:
+        if not result_id.isalnum():
+            raise KeyError(f"无效的结果 ID: {result_id}")
+        return os.path.join(self.root, f"{result_id}.npz")
+
+    def exists(self, result_id: str) -> bool:
+        try:
+            return os.path.exists(self._path(result_id))
+        except KeyError:
+            return False
+
+    def put(self, result_id: str, result: SimulationResult) -> str:
+        """保存结果（已存在时跳过），返回结果 ID"""
+        path = self._path(result_id)
+        if os.path.exists(path):
+            return result_id
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **result_arrays(result))
+        os.replace(tmp_path, path)
+        self._evict()
+        return result_id
+
+    def get(self, result_id: str) -> StoredResult:
+        """
+        读取结果
+
+        Raises:
+            KeyError: 结果不存在
+        """
+        try:
+            return StoredResult.load(result_id, self._path(result_id))
+        except FileNotFoundError:
+            raise KeyError(f"结果不存在: {result_id}")
+
+    def _evict(self) -> None:
+        """超出数量上限时删除最早写入的结果"""
+        with self._lock:
+            names = [name for name in os.listdir(self.root) if name.endswith(".npz")]
+            if len(names) <= self.max_results:
+                return
+            paths = sorted((os.path.join(self.root, name) for name in names), key=os.path.getmtime)
+            for path in paths[:len(paths) - self.max_results]:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,206 @@
+"""
+场景库模块（SQLite）
+
+每个场景保存一行：
+- 规范化配置（JSON，start_date 已解析）
+- 汇总指标列（roi / net_profit / break_even_day / peak_dau_value / final_dau 等，均建有索引）
+- 压缩的时序数组（pack_result() 的字节）
+
+筛选、排序与分页只读取汇总列，不加载也不反序列化时序数据。
+场景 ID 为配置指纹，相同配置重复保存时只更新名称。
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..models.config import SimulationConfig
+from ..models.results import SimulationResult
+from .results import StoredResult, pack_result
+
+
+# 数据目录（backend/data）
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data")
+
+# 数据库路径（可通过环境变量覆盖）
+DEFAULT_PATH = os.environ.get("PL_SCENARIO_DB", os.path.join(DATA_DIR, "pl_scenarios.sqlite3"))
+
+# 可筛选、排序的汇总列: {列名: SQL 类型}
+SUMMARY_COLUMNS = {
+    "roi": "REAL",
+    "net_profit": "REAL",
+    "total_revenue": "REAL",
+    "total_cost": "REAL",
+    "break_even_day": "INTEGER",
+    "first_profitable_day": "INTEGER",
+    "peak_dau_value": "INTEGER",
+    "final_dau": "INTEGER",
+}
+
+# 建索引的列
+INDEXED_COLUMNS = ("roi", "net_profit", "break_even_day", "peak_dau_value", "final_dau")
+
+# 列表接口返回的列
+LIST_COLUMNS = ("id", "name", "created_at", "config_hash", "simulation_days") + tuple(SUMMARY_COLUMNS)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS scenarios (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    created_at TEXT NOT NULL,
+    config_hash TEXT,
+    simulation_days INTEGER NOT NULL,
+    {", ".join(f"{column} {sql_type}" for column, sql_type in SUMMARY_COLUMNS.items())},
+    config_json TEXT NOT NULL,
+    timeseries BLOB NOT NULL
+);
+{"".join(f"CREATE INDEX IF NOT EXISTS idx_scenarios_{column} ON scenarios ({column});" for column in INDEXED_COLUMNS)}
+"""
+
+
+def summary_values(result: SimulationResult) -> Dict[str, Any]:
+    """从模拟结果提取汇总列"""
+    cumulative = result.summary.cumulative_metrics
+    milestones = result.summary.milestones
+    return {
+        "roi": cumulative.roi,
+        "net_profit": cumulative.net_profit,
+        "total_revenue": cumulative.total_revenue,
+        "total_cost": cumulative.total_cost,
+        "break_even_day": milestones.break_even_day,
+        "first_profitable_day": milestones.first_profitable_day,
+        "peak_dau_value": milestones.peak_dau_value,
+        "final_dau": result.summary.final_metrics.total_dau,
+    }
+
+
+class ScenarioLibrary:
+    """
+    SQLite 场景库
+
+    Args:
+        path: 数据库文件路径（所在目录不存在时创建）
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """每个线程一个连接"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def save(self, config: SimulationConfig, result: SimulationResult, name: Optional[str] = None) -> str:
+        """
+        保存场景（相同配置已存在时只更新名称）
+
+        Returns:
+            场景 ID
+        """
+        scenario_id = config.fingerprint()
+        # 保存时解析 start_date，使库中的配置与指纹一一对应
+        start_date = config.start_date or date.fromisoformat(result.timeseries.dates[0])
+        canonical = config.model_copy(update={"start_date": start_date})
+        row = {
+            "id": scenario_id,
+            "name": name,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "config_hash": result.config_hash,
+            "simulation_days": config.simulation_days,
+            **summary_values(result),
+            "config_json": canonical.model_dump_json(),
+            "timeseries": pack_result(result),
+        }
+        columns = ", ".join(row)
+        placeholders = ", ".join(f":{column}" for column in row)
+        connection = self._connect()
+        with connection:
+            connection.execute(
+                f"INSERT INTO scenarios ({columns}) VALUES ({placeholders}) "
+                f"ON CONFLICT(id) DO UPDATE SET name = COALESCE(excluded.name, scenarios.name)",
+                row,
+            )
+        return scenario_id
+
+    def query(
+        self,
+        filters: Optional[Sequence[Tuple[str, str, Any]]] = None,
+        sort_by: str = "created_at",
+        descending: bool = True,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        筛选、排序、分页（只读取汇总列）
+
+        Args:
+            filters: [(列名, 运算符, 值)]，运算符为 >= / <= / > / < / =，条件之间为 AND；
+                     值为 NULL 的场景（如未达到盈亏平衡）不满足任何条件
+            sort_by: 排序列（汇总列、created_at 或 name）
+            descending: 是否降序
+            limit / offset: 分页
+
+        Returns:
+            (符合条件的总数, 当前页的行)
+        """
+        clauses, params = [], []
+        for column, operator, value in filters or ():
+            if column not in SUMMARY_COLUMNS:
+                raise ValueError(f"不支持筛选的字段: {column}")
+            if operator not in (">=", "<=", ">", "<", "="):
+                raise ValueError(f"不支持的运算符: {operator}")
+            clauses.append(f"{column} IS NOT NULL AND {column} {operator} ?")
+            params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        if sort_by not in SUMMARY_COLUMNS and sort_by not in ("created_at", "name"):
+            raise ValueError(f"不支持排序的字段: {sort_by}")
+        # NULL（如未达到盈亏平衡）总是排在最后
+        order = f"ORDER BY {sort_by} IS NULL, {sort_by} {'DESC' if descending else 'ASC'}, id"
+
+        connection = self._connect()
+        total = connection.execute(f"SELECT COUNT(*) FROM scenarios {where}", params).fetchone()[0]
+        rows = connection.execute(
+            f"SELECT {', '.join(LIST_COLUMNS)} FROM scenarios {where} {order} LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        ).fetchall()
+        return total, [dict(row) for row in rows]
+
+    def get(self, scenario_id: str) -> Tuple[Dict[str, Any], SimulationConfig, StoredResult]:
+        """
+        读取场景
+
+        Returns:
+            (汇总行, 配置, 时序结果)
+
+        Raises:
+            KeyError: 场景不存在
+        """
+        row = self._connect().execute(
+            f"SELECT {', '.join(LIST_COLUMNS)}, config_json, timeseries FROM scenarios WHERE id = ?",
+            (scenario_id,),
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"场景不存在: {scenario_id}")
+        row = dict(row)
+        config = SimulationConfig.model_validate_json(row.pop("config_json"))
+        stored = StoredResult.load(scenario_id, row.pop("timeseries"))
+        return row, config, stored
+
+    def delete(self, scenario_id: str) -> bool:
+        """删除场景，返回是否存在"""
+        connection = self._connect()
+        with connection:
+            cursor = connection.execute("DELETE FROM scenarios WHERE id = ?", (scenario_id,))
+        return cursor.rowcount > 0
+
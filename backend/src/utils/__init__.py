@@ -1,3 +1,4 @@
 from .validation import validate_config
+from .memo import MemoCache
 
-__all__ = ["validate_config"]
+__all__ = ["validate_config", "MemoCache"]
@@ -0,0 +1,155 @@
+"""
+准入控制
+
+计算型接口在执行前先申请准入：
+- 同时运行的请求数不超过 max_concurrency
+- 同时运行的请求总成本不超过 cost_budget（成本 = 模拟天数 × 地区数 × 场景数）
+- 无法立即运行的请求进入等待队列；队列已满或等待超时的请求立即以 429 拒绝，
+  并按近期平均耗时给出 Retry-After
+
+超过 cost_budget 的单个请求按 cost_budget 计，即只能在没有其他请求运行时执行。
+"""
+
+import asyncio
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from ..models.config import SimulationConfig
+
+
+# 同时运行的最大请求数
+MAX_CONCURRENCY = int(os.environ.get("PL_MAX_CONCURRENCY", os.cpu_count() or 4))
+
+# 等待队列长度
+MAX_QUEUE = int(os.environ.get("PL_MAX_QUEUE", 16))
+
+# 同时运行的总成本上限（天 × 地区 × 场景）
+COST_BUDGET = int(os.environ.get("PL_COST_BUDGET", 20_000_000))
+
+# 最长等待时间（秒）
+QUEUE_TIMEOUT = float(os.environ.get("PL_QUEUE_TIMEOUT", 30.0))
+
+# 平均耗时的指数滑动平均系数
+_EWMA_ALPHA = 0.2
+
+
+def request_cost(config: SimulationConfig, scenarios: int = 1) -> int:
+    """请求成本：模拟天数 × 活跃地区数 × 场景数"""
+    return config.simulation_days * max(len(config.get_active_regions()), 1) * max(scenarios, 1)
+
+
+class AdmissionRejected(Exception):
+    """请求被拒绝（队列已满或等待超时）"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    有界并发 + 有界等待队列的准入控制器
+
+    Args:
+        max_concurrency: 同时运行的最大请求数
+        max_queue: 等待队列长度（0 表示不排队，无法立即运行即拒绝）
+        cost_budget: 同时运行的总成本上限
+        queue_timeout: 最长等待时间（秒）
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = MAX_CONCURRENCY,
+        max_queue: int = MAX_QUEUE,
+        cost_budget: int = COST_BUDGET,
+        queue_timeout: float = QUEUE_TIMEOUT,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.cost_budget = cost_budget
+        self.queue_timeout = queue_timeout
+        self.running = 0
+        self.queued = 0
+        self.in_flight_cost = 0
+        self.stats = {"admitted": 0, "queued": 0, "rejected_queue_full": 0, "rejected_timeout": 0}
+        self._avg_seconds: Optional[float] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        # asyncio 原语绑定首次使用的事件循环，事件循环变化时（如测试中多次启动应用）重新创建
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _fits(self, cost: int) -> bool:
+        return self.running < self.max_concurrency and self.in_flight_cost + cost <= self.cost_budget
+
+    def retry_after(self) -> int:
+        """建议的重试间隔（秒）：排在前面的请求按平均耗时、以最大并发数排空所需的时间"""
+        average = self._avg_seconds or 1.0
+        return max(1, math.ceil(average * (self.queued + 1) / self.max_concurrency))
+
+    @asynccontextmanager
+    async def admit(self, cost: int) -> AsyncIterator[None]:
+        """
+        申请准入，退出上下文时释放
+
+        Raises:
+            AdmissionRejected: 队列已满或等待超时
+        """
+        cost = min(max(cost, 1), self.cost_budget)
+        condition = self._get_condition()
+        async with condition:
+            # 已有请求排队时新请求也排队，避免小请求持续插队
+            if self.queued or not self._fits(cost):
+                if self.queued >= self.max_queue:
+                    self.stats["rejected_queue_full"] += 1
+                    raise AdmissionRejected("请求队列已满", self.retry_after())
+                self.queued += 1
+                self.stats["queued"] += 1
+                try:
+                    await asyncio.wait_for(condition.wait_for(lambda: self._fits(cost)), self.queue_timeout)
+                except asyncio.TimeoutError:
+                    self.stats["rejected_timeout"] += 1
+                    raise AdmissionRejected("等待超时", self.retry_after())
+                finally:
+                    self.queued -= 1
+            self.running += 1
+            self.in_flight_cost += cost
+            self.stats["admitted"] += 1
+            if self.queued:
+                # 剩余容量可能还够下一个排队的请求
+                condition.notify_all()
+
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            async with condition:
+                self.running -= 1
+                self.in_flight_cost -= cost
+                self._avg_seconds = elapsed if self._avg_seconds is None else (
+                    _EWMA_ALPHA * elapsed + (1 - _EWMA_ALPHA) * self._avg_seconds
+                )
+                condition.notify_all()
+
+    def metrics(self) -> Dict[str, Any]:
+        """当前状态与累计计数"""
+        return {
+            "running": self.running,
+            "queue_depth": self.queued,
+            "in_flight_cost": self.in_flight_cost,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "cost_budget": self.cost_budget,
+            "avg_seconds": self._avg_seconds,
+            **self.stats,
+        }
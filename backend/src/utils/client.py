@@ -0,0 +1,142 @@
+"""
+后端 HTTP 客户端
+
+Streamlit 前端的客户端模式通过该客户端调用 FastAPI 服务的 /api/simulate，
+多个会话（浏览器标签页）共用同一个已预热、带结果缓存的后端：
+- 底层为 httpx.Client 连接池（keep-alive），可在多个线程间共享
+- 安装 msgpack 时请求 application/msgpack（时序为二进制数组），否则请求 JSON；均接受 gzip / br 压缩
+- 服务繁忙（429）与连接失败分别抛出 BackendBusy / BackendUnavailable，调用方据此退回进程内模拟
+
+httpx 为可选依赖，未安装时 has_httpx() 返回 False。
+"""
+
+import importlib
+import importlib.util
+import threading
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from ..models.config import SimulationConfig
+from ..models.results import SimulationResult
+from .encoding import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, has_msgpack, unpack_msgpack
+
+
+# 请求超时（秒）
+DEFAULT_TIMEOUT = 120.0
+
+# 连接池大小
+MAX_CONNECTIONS = 8
+
+
+def has_httpx() -> bool:
+    return importlib.util.find_spec("httpx") is not None
+
+
+class BackendUnavailable(Exception):
+    """后端无法连接或请求超时"""
+
+
+class BackendBusy(Exception):
+    """后端准入控制拒绝请求（429）"""
+
+    def __init__(self, message: str, retry_after: Optional[int] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _to_lists(value: Any) -> Any:
+    """把 msgpack 解出的 NumPy 数组转换为列表（用于构建 pydantic 模型）"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {key: _to_lists(item) for key, item in value.items()}
+    return value
+
+
+class BackendClient:
+    """
+    /api/simulate 的连接池客户端
+
+    用法：
+        client = BackendClient("http://localhost:8000")
+        result = client.simulate(config)
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_connections: int = MAX_CONNECTIONS,
+        http: Optional[Any] = None,
+    ):
+        """
+        Args:
+            base_url: 后端地址，如 http://localhost:8000
+            timeout: 请求超时（秒）
+            max_connections: 连接池大小
+            http: 已创建的 httpx.Client（测试时传入 TestClient）；为空时创建连接池
+        """
+        self.base_url = base_url.rstrip("/")
+        if http is None:
+            httpx = importlib.import_module("httpx")
+            http = httpx.Client(
+                base_url=self.base_url,
+                timeout=timeout,
+                limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            )
+        self._http = http
+        self.media_type = MSGPACK_MEDIA_TYPE if has_msgpack() else JSON_MEDIA_TYPE
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "errors": 0, "busy": 0, "bytes": 0}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += amount
+
+    def simulate(self, config: SimulationConfig) -> SimulationResult:
+        """
+        调用 /api/simulate
+
+        Raises:
+            BackendUnavailable: 连接失败或超时
+            BackendBusy: 服务繁忙（429）
+            RuntimeError: 其他错误响应（如配置校验失败）
+        """
+        httpx = importlib.import_module("httpx")
+        self._count("requests")
+        try:
+            response = self._http.post(
+                "/api/simulate",
+                content=config.model_dump_json(),
+                headers={"Content-Type": JSON_MEDIA_TYPE, "Accept": self.media_type},
+            )
+        except httpx.TransportError as e:
+            self._count("errors")
+            raise BackendUnavailable(f"无法连接后端 {self.base_url}: {e}") from e
+
+        self._count("bytes", response.num_bytes_downloaded)
+        if response.status_code == 429:
+            self._count("busy")
+            retry_after = response.headers.get("Retry-After")
+            raise BackendBusy("后端繁忙", int(retry_after) if retry_after else None)
+        if response.status_code != 200:
+            self._count("errors")
+            detail = response.json().get("detail", {}) if response.headers.get("content-type", "").startswith(JSON_MEDIA_TYPE) else {}
+            message = detail.get("message") if isinstance(detail, dict) else None
+            raise RuntimeError(message or f"后端返回 {response.status_code}")
+
+        if response.headers.get("content-type", "").startswith(MSGPACK_MEDIA_TYPE):
+            payload = _to_lists(unpack_msgpack(response.content))
+        else:
+            payload = response.json()
+        return SimulationResult.model_validate(payload)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """请求数、错误数、繁忙拒绝数与下载字节数（压缩后）"""
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self) -> None:
+        self._http.close()
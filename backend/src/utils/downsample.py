@@ -0,0 +1,57 @@
+"""
+时序降采样（Largest-Triangle-Three-Buckets）
+
+LTTB 保留首尾两点，把其余点均分为 max_points - 2 个桶，
+每个桶选取与「上一个已选点」和「下一个桶的均值点」构成三角形面积最大的点，
+从而保留峰值、谷值与拐点等形状特征。
+
+桶之间的选择有先后依赖，按桶循环（循环次数为 max_points），
+每个桶内的面积计算与所有桶的均值均为 NumPy 向量运算。
+"""
+
+import numpy as np
+
+
+def lttb_indices(values: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    LTTB 选点
+
+    Args:
+        values: 按天排列的一维序列（x 为天下标）
+        max_points: 最多保留的点数（至少 3）
+
+    Returns:
+        升序的下标数组；序列长度不超过 max_points 时返回全部下标
+    """
+    n = len(values)
+    if max_points < 3:
+        raise ValueError("max_points 至少为 3")
+    if n <= max_points:
+        return np.arange(n)
+
+    y = np.asarray(values, dtype=np.float64)
+    # 中间 n - 2 个点均分为 max_points - 2 个桶，edges[k]:edges[k+1] 为第 k 个桶
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    counts = np.diff(edges)
+
+    # 各桶的均值点（x 为天下标均值），末尾追加最后一个点作为最后一个桶的「下一个桶」
+    cumulative = np.concatenate(([0.0], np.cumsum(y[1:n - 1])))
+    mean_y = (cumulative[edges[1:] - 1] - cumulative[edges[:-1] - 1]) / counts
+    mean_x = (edges[:-1] + edges[1:] - 1) / 2.0
+    next_x = np.append(mean_x[1:], n - 1)
+    next_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for k in range(max_points - 2):
+        start, stop = edges[k], edges[k + 1]
+        x = np.arange(start, stop)
+        # 三角形面积的两倍（省略常数因子不影响 argmax）
+        area = np.abs(
+            (previous - next_x[k]) * (y[start:stop] - y[previous])
+            - (previous - x) * (next_y[k] - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[k + 1] = previous
+    return selected
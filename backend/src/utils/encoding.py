@@ -0,0 +1,167 @@
+"""
+响应编码协商
+
+- 内容类型（Accept）：application/json（默认）或 application/msgpack
+  MessagePack 中的时序数组直接由引擎 / 结果存储的 NumPy 缓冲区打包为
+  {"dtype": "float64", "shape": [n], "data": <小端字节>}，客户端可用 np.frombuffer 零解析读取
+- 压缩（Accept-Encoding）：br（需安装 brotli）优先，其次 gzip
+
+msgpack 与 brotli 为可选依赖，未安装时分别退回 JSON 与 gzip。
+fastapi 只在生成响应时导入，Streamlit 前端的后端客户端（client.py）可在未安装 fastapi 时复用解码函数。
+"""
+
+import gzip
+import importlib
+import importlib.util
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from fastapi import Response
+
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+_MSGPACK_ALIASES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+# 小于该字节数的响应不压缩
+MIN_COMPRESS_SIZE = 1024
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def has_msgpack() -> bool:
+    return importlib.util.find_spec("msgpack") is not None
+
+
+def has_brotli() -> bool:
+    return importlib.util.find_spec("brotli") is not None
+
+
+def _parse_header(header: Optional[str]) -> Dict[str, float]:
+    """解析 Accept / Accept-Encoding 为 {取值: q}"""
+    values: Dict[str, float] = {}
+    for item in (header or "").split(","):
+        parts = [part.strip() for part in item.split(";")]
+        if not parts[0]:
+            continue
+        q = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        values[parts[0].lower()] = q
+    return values
+
+
+def negotiate_media_type(accept: Optional[str]) -> Optional[str]:
+    """
+    选择响应的内容类型
+
+    只有显式请求 msgpack（且 q 不低于 JSON）时返回 msgpack；
+    客户端只接受 msgpack 而服务端未安装 msgpack 时返回 None（406）
+    """
+    values = _parse_header(accept)
+    if not values:
+        return JSON_MEDIA_TYPE
+    json_q = max(values.get(JSON_MEDIA_TYPE, 0.0), values.get("application/*", 0.0), values.get("*/*", 0.0))
+    msgpack_q = max(values.get(alias, 0.0) for alias in _MSGPACK_ALIASES)
+    if msgpack_q > 0 and msgpack_q >= json_q and has_msgpack():
+        return MSGPACK_MEDIA_TYPE
+    if json_q > 0:
+        return JSON_MEDIA_TYPE
+    return None
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """选择压缩方式（br / gzip / None）"""
+    values = _parse_header(accept_encoding)
+    if values.get("br", 0.0) > 0 and has_brotli():
+        return "br"
+    if values.get("gzip", values.get("*", 0.0)) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """按协商结果压缩；过小的响应不压缩"""
+    if encoding is None or len(body) < MIN_COMPRESS_SIZE:
+        return body, None
+    if encoding == "br":
+        brotli = importlib.import_module("brotli")
+        return brotli.compress(body, quality=BROTLI_QUALITY), "br"
+    return gzip.compress(body, compresslevel=GZIP_LEVEL), "gzip"
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value, dtype=value.dtype.newbyteorder("<"))
+        return {"dtype": array.dtype.name, "shape": list(array.shape), "data": array.tobytes()}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"无法序列化的类型: {type(value).__name__}")
+
+
+def pack_msgpack(payload: Dict[str, Any]) -> bytes:
+    """打包为 MessagePack（NumPy 数组打包为原始字节）"""
+    msgpack = importlib.import_module("msgpack")
+    return msgpack.packb(payload, default=_msgpack_default, use_bin_type=True)
+
+
+def unpack_msgpack(data: bytes) -> Dict[str, Any]:
+    """解包 pack_msgpack 的结果（数组还原为 NumPy 数组），供 Python 客户端使用"""
+    msgpack = importlib.import_module("msgpack")
+
+    def hook(obj: Dict[str, Any]) -> Any:
+        if obj.keys() == {"dtype", "shape", "data"}:
+            return np.frombuffer(obj["data"], dtype=np.dtype(obj["dtype"]).newbyteorder("<")).reshape(obj["shape"])
+        return obj
+
+    return msgpack.unpackb(data, object_hook=hook, raw=False)
+
+
+def negotiate(request_headers: Any) -> Tuple[Optional[str], Optional[str]]:
+    """
+    协商 (内容类型, 压缩方式)
+
+    内容类型为 None 表示客户端不接受任何可用类型（应返回 406）
+    """
+    return (
+        negotiate_media_type(request_headers.get("accept")),
+        negotiate_encoding(request_headers.get("accept-encoding")),
+    )
+
+
+def encoded_response(
+    media_type: str,
+    encoding: Optional[str],
+    json_body: Callable[[], bytes],
+    msgpack_payload: Optional[Callable[[], Dict[str, Any]]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> "Response":
+    """
+    按协商结果生成响应
+
+    Args:
+        media_type / encoding: negotiate() 的结果
+        json_body: 返回 JSON 字节的函数
+        msgpack_payload: 返回 msgpack 负载的函数；为空时只输出 JSON
+        headers: 附加响应头
+    """
+    from fastapi import Response
+
+    if media_type == MSGPACK_MEDIA_TYPE and msgpack_payload is not None:
+        body = pack_msgpack(msgpack_payload())
+    else:
+        media_type = JSON_MEDIA_TYPE
+        body = json_body()
+
+    body, applied = compress(body, encoding)
+    response_headers = {"Vary": "Accept, Accept-Encoding", **(headers or {})}
+    if applied is not None:
+        response_headers["Content-Encoding"] = applied
+    return Response(content=body, media_type=media_type, headers=response_headers)
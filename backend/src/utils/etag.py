@@ -0,0 +1,24 @@
+"""
+HTTP 条件请求工具（ETag / If-None-Match）
+"""
+
+import hashlib
+from typing import Optional
+
+
+def make_etag(*parts: str) -> str:
+    """由若干字符串（如配置指纹、引擎版本）生成强 ETag"""
+    digest = hashlib.md5("\x1f".join(parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match 是否命中（RFC 9110：弱比较，支持多个 ETag 与 *）
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
@@ -0,0 +1,172 @@
+"""
+JSON Patch（RFC 6902）工具
+
+支持 add / remove / replace / move / copy / test 六种操作，
+用于在已缓存的基准配置上应用增量修改。
+"""
+
+import copy
+from typing import Annotated, Any, Dict, List, Set, Tuple
+
+from pydantic import TypeAdapter
+
+from ..models.config import SimulationConfig, PatchOperation
+
+
+class PatchError(ValueError):
+    """补丁无法应用"""
+
+
+def _parse_pointer(pointer: str) -> List[str]:
+    """解析 JSON Pointer（RFC 6901）"""
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise PatchError(f"无效的路径: {pointer}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _resolve_parent(document: Any, tokens: List[str], pointer: str) -> Tuple[Any, str]:
+    """定位路径的父容器与末级键"""
+    if not tokens:
+        raise PatchError("不支持替换整个文档")
+    target = document
+    for token in tokens[:-1]:
+        target = _child(target, token, pointer)
+    return target, tokens[-1]
+
+
+def _child(container: Any, token: str, pointer: str) -> Any:
+    if isinstance(container, dict):
+        if token not in container:
+            raise PatchError(f"路径不存在: {pointer}")
+        return container[token]
+    if isinstance(container, list):
+        index = _list_index(container, token, pointer)
+        if index >= len(container):
+            raise PatchError(f"路径不存在: {pointer}")
+        return container[index]
+    raise PatchError(f"路径不存在: {pointer}")
+
+
+def _list_index(container: list, token: str, pointer: str, allow_end: bool = False) -> int:
+    if allow_end and token == "-":
+        return len(container)
+    if not token.isdigit():
+        raise PatchError(f"无效的数组下标: {pointer}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise PatchError(f"数组下标越界: {pointer}")
+    return index
+
+
+def _get(document: Any, pointer: str) -> Any:
+    target = document
+    for token in _parse_pointer(pointer):
+        target = _child(target, token, pointer)
+    return target
+
+
+def _add(document: Any, pointer: str, value: Any) -> None:
+    parent, key = _resolve_parent(document, _parse_pointer(pointer), pointer)
+    if isinstance(parent, dict):
+        parent[key] = value
+    elif isinstance(parent, list):
+        parent.insert(_list_index(parent, key, pointer, allow_end=True), value)
+    else:
+        raise PatchError(f"路径不存在: {pointer}")
+
+
+def _remove(document: Any, pointer: str) -> Any:
+    parent, key = _resolve_parent(document, _parse_pointer(pointer), pointer)
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise PatchError(f"路径不存在: {pointer}")
+        return parent.pop(key)
+    if isinstance(parent, list):
+        return parent.pop(_list_index(parent, key, pointer))
+    raise PatchError(f"路径不存在: {pointer}")
+
+
+def apply_patch(document: Dict[str, Any], operations: List[PatchOperation]) -> Dict[str, Any]:
+    """
+    应用 JSON Patch，返回新文档（不修改原文档）
+
+    Raises:
+        PatchError: 路径不存在、test 不通过等
+    """
+    document = copy.deepcopy(document)
+    for operation in operations:
+        if operation.op == "add":
+            _add(document, operation.path, copy.deepcopy(operation.value))
+        elif operation.op == "remove":
+            _remove(document, operation.path)
+        elif operation.op == "replace":
+            _remove(document, operation.path)
+            _add(document, operation.path, copy.deepcopy(operation.value))
+        elif operation.op == "move":
+            _add(document, operation.path, _remove(document, operation.from_))
+        elif operation.op == "copy":
+            _add(document, operation.path, copy.deepcopy(_get(document, operation.from_)))
+        elif operation.op == "test":
+            if _get(document, operation.path) != operation.value:
+                raise PatchError(f"test 未通过: {operation.path}")
+    return document
+
+
+def touched_fields(operations: List[PatchOperation]) -> Set[str]:
+    """补丁修改的顶层字段（不含 test 操作，test 只读取）"""
+    fields = set()
+    for operation in operations:
+        if operation.op == "test":
+            continue
+        for pointer in (operation.path, operation.from_):
+            if pointer:
+                fields.add(_parse_pointer(pointer)[0])
+    return fields
+
+
+def tested_fields(operations: List[PatchOperation]) -> Set[str]:
+    """test 操作读取的顶层字段"""
+    return {
+        _parse_pointer(operation.path)[0]
+        for operation in operations
+        if operation.op == "test" and operation.path
+    }
+
+
+def patch_config(base: SimulationConfig, operations: List[PatchOperation]) -> SimulationConfig:
+    """
+    在基准配置上应用补丁
+
+    只校验补丁修改的顶层字段，其余字段直接沿用基准配置中已校验的对象；
+    test 操作读取的字段同样放入待打补丁的文档，但不重新校验
+
+    Raises:
+        PatchError: 补丁无法应用或涉及未知字段
+        pydantic.ValidationError: 修改后的字段校验失败
+    """
+    fields = touched_fields(operations)
+    loaded = fields | tested_fields(operations)
+    unknown = loaded - set(SimulationConfig.model_fields)
+    if unknown:
+        raise PatchError(f"未知字段: {', '.join(sorted(unknown))}")
+
+    document = apply_patch({name: _dump_field(getattr(base, name)) for name in loaded}, operations)
+
+    update = {}
+    for name in fields:
+        field = SimulationConfig.model_fields[name]
+        if name not in document:
+            # 顶层字段被移除时恢复缺省值
+            update[name] = field.get_default(call_default_factory=True)
+            continue
+        # 字段约束（如 simulation_days 的 ge/le）保存在 metadata 中
+        annotation = Annotated[(field.annotation, *field.metadata)] if field.metadata else field.annotation
+        update[name] = TypeAdapter(annotation).validate_python(document[name])
+    return base.model_copy(update=update)
+
+
+def _dump_field(value: Any) -> Any:
+    """把字段值转为 JSON 兼容的 Python 对象"""
+    return TypeAdapter(Any).dump_python(value, mode="json")
@@ -0,0 +1,87 @@
+"""
+有界 LRU 记忆化缓存
+
+供 Streamlit 前端在脚本重跑之间复用计算结果：
+- 模拟结果以 SimulationConfig.fingerprint()（规范化配置内容的哈希）为键
+- 留存拟合以 7 个留存节点的取值元组为键
+
+超出容量时淘汰最久未使用的条目，并记录命中 / 未命中 / 淘汰次数用于调试面板展示。
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+# 默认容量（条目数）
+MAX_ENTRIES = 32
+
+
+class MemoCache:
+    """
+    线程安全的 LRU 缓存
+
+    用法：
+        cache = MemoCache(maxsize=16)
+        result = cache.get_or_compute(config.fingerprint(), lambda: run_simulation(config))
+    """
+
+    def __init__(self, maxsize: int = MAX_ENTRIES):
+        if maxsize < 1:
+            raise ValueError("maxsize 至少为 1")
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        命中时返回缓存值，否则调用 compute() 计算并缓存
+
+        compute 在锁外执行；并发的相同未命中可能各算一次，结果相同，后写入者覆盖。
+        compute 抛出的异常不缓存。
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]
+            self._misses += 1
+
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return value
+
+    def clear(self) -> None:
+        """清空缓存与统计"""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """命中统计（hit_rate 为命中次数 / 总调用次数）"""
+        with self._lock:
+            calls = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self._hits / calls if calls else 0.0,
+            }
@@ -0,0 +1,249 @@
+"""
+目录型工作队列
+
+不依赖任何消息中间件，多台机器只需共享同一个文件系统目录：
+
+    root/
+    ├── pending/   待领取的任务（<task_id>.json）
+    ├── claimed/   已被领取的任务，文件修改时间即租约心跳
+    ├── done/      已完成的任务
+    └── failed/    超过最大重试次数的任务
+
+领取任务通过 os.rename 把文件从 pending/ 移到 claimed/ 完成，
+同一文件系统内的 rename 是原子的，因此同一任务只会被一个工作进程领取。
+领取者崩溃后租约过期，任务会被放回 pending/ 重试。
+"""
+
+import json
+import os
+import socket
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+
+QUEUE_STATES = ("pending", "claimed", "done", "failed")
+
+
+class QueueTask:
+    """队列中的一个任务"""
+
+    def __init__(self, task_id: str, payload: Dict[str, Any], attempts: int = 0,
+                 worker: Optional[str] = None, error: Optional[str] = None):
+        self.task_id = task_id
+        self.payload = payload
+        self.attempts = attempts
+        self.worker = worker
+        self.error = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "task_id": self.task_id,
+            "payload": self.payload,
+            "attempts": self.attempts,
+            "worker": self.worker,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QueueTask":
+        return cls(**data)
+
+
+def default_worker_id() -> str:
+    """工作进程标识：主机名 + 进程号"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def temp_path(path: str) -> str:
+    """
+    与 path 同目录的临时文件名
+
+    多台机器共享目录时进程号可能重复，使用随机 UUID 避免不同写入者互相覆盖临时文件
+    """
+    return f"{path}.{uuid.uuid4().hex}.tmp"
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    """先写临时文件再 rename，读者不会看到写了一半的文件"""
+    tmp_path = temp_path(path)
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class FileWorkQueue:
+    """
+    目录型工作队列
+
+    Args:
+        root: 队列目录
+        lease_seconds: 租约时长，领取后超过该时长未心跳的任务视为领取者已失效
+        max_attempts: 最大尝试次数，超过后任务进入 failed/
+    """
+
+    def __init__(self, root: str, lease_seconds: float = 600.0, max_attempts: int = 3):
+        self.root = root
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        for state in QUEUE_STATES:
+            os.makedirs(os.path.join(root, state), exist_ok=True)
+
+    def _path(self, state: str, task_id: str) -> str:
+        return os.path.join(self.root, state, f"{task_id}.json")
+
+    def _task_ids(self, state: str) -> List[str]:
+        names = os.listdir(os.path.join(self.root, state))
+        return sorted(name[:-5] for name in names if name.endswith(".json"))
+
+    def put(self, task_id: str, payload: Dict[str, Any]) -> None:
+        """加入任务（已完成或正在运行的任务不会重复加入，失败的任务重新入队）"""
+        if os.path.exists(self._path("done", task_id)) or os.path.exists(self._path("claimed", task_id)):
+            return
+        _write_json(self._path("pending", task_id), QueueTask(task_id, payload).to_dict())
+        try:
+            os.remove(self._path("failed", task_id))
+        except FileNotFoundError:
+            pass
+
+    def claim(self, worker: Optional[str] = None) -> Optional[QueueTask]:
+        """
+        领取一个任务
+
+        Returns:
+            QueueTask，队列中没有待领取任务时返回 None
+        """
+        worker = worker or default_worker_id()
+        for task_id in self._task_ids("pending"):
+            claimed_path = self._path("claimed", task_id)
+            try:
+                os.rename(self._path("pending", task_id), claimed_path)
+            except FileNotFoundError:
+                # 已被其他工作进程领取
+                continue
+
+            with open(claimed_path, encoding="utf-8") as f:
+                task = QueueTask.from_dict(json.load(f))
+            task.attempts += 1
+            task.worker = worker
+            _write_json(claimed_path, task.to_dict())
+            return task
+        return None
+
+    def heartbeat(self, task: QueueTask) -> None:
+        """续租（更新领取文件的修改时间）"""
+        try:
+            os.utime(self._path("claimed", task.task_id))
+        except FileNotFoundError:
+            pass
+
+    def complete(self, task: QueueTask, result: Optional[Dict[str, Any]] = None) -> None:
+        """标记任务完成"""
+        task.error = None
+        data = task.to_dict()
+        data["result"] = result
+        _write_json(self._path("done", task.task_id), data)
+        for state in ("claimed", "pending"):
+            # 租约过期后任务可能已被放回 pending/，此时以先完成的结果为准
+            try:
+                os.remove(self._path(state, task.task_id))
+            except FileNotFoundError:
+                pass
+
+    def fail(self, task: QueueTask, error: str) -> None:
+        """标记任务失败：未超过最大尝试次数时放回 pending/，否则移入 failed/"""
+        task.error = error
+        state = "pending" if task.attempts < self.max_attempts else "failed"
+        _write_json(self._path(state, task.task_id), task.to_dict())
+        try:
+            os.remove(self._path("claimed", task.task_id))
+        except FileNotFoundError:
+            pass
+
+    def requeue_expired(self) -> int:
+        """
+        回收租约过期的任务
+
+        Returns:
+            回收的任务数
+        """
+        now = time.time()
+        count = 0
+        for task_id in self._task_ids("claimed"):
+            path = self._path("claimed", task_id)
+            try:
+                if now - os.path.getmtime(path) < self.lease_seconds:
+                    continue
+                with open(path, encoding="utf-8") as f:
+                    task = QueueTask.from_dict(json.load(f))
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            self.fail(task, f"租约过期（{task.worker}）")
+            count += 1
+        return count
+
+    def progress(self) -> Dict[str, int]:
+        """各状态的任务数"""
+        return {state: len(self._task_ids(state)) for state in QUEUE_STATES}
+
+    def is_finished(self) -> bool:
+        """所有任务均已完成或失败"""
+        progress = self.progress()
+        return progress["pending"] == 0 and progress["claimed"] == 0
+
+    def _records(self, state: str) -> List[Dict[str, Any]]:
+        records = []
+        for task_id in self._task_ids(state):
+            try:
+                with open(self._path(state, task_id), encoding="utf-8") as f:
+                    records.append(json.load(f))
+            except FileNotFoundError:
+                # 读取期间已被领取或移动
+                continue
+        return records
+
+    def recent_task_ids(self, state: str, limit: int) -> List[str]:
+        """某一状态下按文件修改时间最近的 limit 个任务 ID（从旧到新）"""
+        stamped = []
+        for task_id in self._task_ids(state):
+            try:
+                stamped.append((os.path.getmtime(self._path(state, task_id)), task_id))
+            except FileNotFoundError:
+                continue
+        stamped.sort()
+        return [task_id for _, task_id in stamped[-limit:]] if limit > 0 else []
+
+    def done_task(self, task_id: str) -> Optional[Tuple[QueueTask, Optional[Dict[str, Any]]]]:
+        """
+        读取单个已完成的任务及其结果
+
+        Returns:
+            (QueueTask, 结果)，任务不在 done/ 中时返回 None
+        """
+        try:
+            with open(self._path("done", task_id), encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        result = data.pop("result", None)
+        return QueueTask.from_dict(data), result
+
+    def tasks(self, state: str) -> List[QueueTask]:
+        """某一状态下的任务"""
+        tasks = []
+        for data in self._records(state):
+            data.pop("result", None)
+            tasks.append(QueueTask.from_dict(data))
+        return tasks
+
+    def failed_tasks(self) -> List[QueueTask]:
+        """失败的任务"""
+        return self.tasks("failed")
+
+    def done_tasks(self) -> List[Tuple[QueueTask, Optional[Dict[str, Any]]]]:
+        """已完成的任务及其结果"""
+        done = []
+        for data in self._records("done"):
+            result = data.pop("result", None)
+            done.append((QueueTask.from_dict(data), result))
+        return done
@@ -0,0 +1,154 @@
+"""
+多机网格扫描命令行工具
+
+作业目录需位于所有主机可访问的共享文件系统上。
+
+用法：
+    # 协调者：创建作业
+    python sweep_cli.py init /shared/sweep-001 sweep.json
+
+    # 任意主机：启动工作进程（每台机器可启动多个进程）
+    python sweep_cli.py worker /shared/sweep-001 --processes 8
+
+    # 查看进度 / 合并结果
+    python sweep_cli.py status /shared/sweep-001
+    python sweep_cli.py merge /shared/sweep-001
+
+    # 协调者一站式运行：创建作业、本机启动工作进程、回收失效任务、完成后合并
+    python sweep_cli.py run /shared/sweep-001 sweep.json --processes 8
+
+sweep.json 为 SweepConfig 的 JSON（config / grid / objective / maximize / top_k）。
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.models.config import SweepConfig
+from src.core.distributed import (
+    create_sweep_job, run_sweep_worker, merge_sweep_job, job_progress, open_queue,
+)
+
+
+def _format_progress(progress: dict) -> str:
+    total = sum(progress.values())
+    return (
+        f"完成 {progress['done']}/{total}  进行中 {progress['claimed']}  "
+        f"待领取 {progress['pending']}  失败 {progress['failed']}"
+    )
+
+
+def _start_workers(pool: ProcessPoolExecutor, args) -> list:
+    return [
+        pool.submit(run_sweep_worker, args.job_dir, None, args.max_tasks, args.lease, args.max_attempts)
+        for _ in range(args.processes)
+    ]
+
+
+def cmd_init(args) -> int:
+    with open(args.config, encoding="utf-8") as f:
+        sweep_config = SweepConfig.model_validate_json(f.read())
+    n_shards = create_sweep_job(sweep_config, args.job_dir)
+    print(f"已创建作业 {args.job_dir}：{n_shards} 个分片")
+    return 0
+
+
+def cmd_worker(args) -> int:
+    if args.processes <= 1:
+        completed = run_sweep_worker(args.job_dir, None, args.max_tasks, args.lease, args.max_attempts)
+    else:
+        with ProcessPoolExecutor(max_workers=args.processes) as pool:
+            completed = sum(future.result() for future in _start_workers(pool, args))
+    print(f"本机完成 {completed} 个分片")
+    return 0
+
+
+def cmd_status(args) -> int:
+    print(_format_progress(job_progress(args.job_dir)))
+    for task in open_queue(args.job_dir).failed_tasks():
+        print(f"  失败分片 {task.task_id}（尝试 {task.attempts} 次）: {task.error}")
+    return 0
+
+
+def _print_result(result) -> None:
+    print(f"共 {result.points} 个网格点，目标 {result.objective}")
+    for rank, point in enumerate(result.best, 1):
+        print(f"  #{rank} {point.metrics[result.objective]:.4f}  {point.params}")
+
+
+def cmd_merge(args) -> int:
+    _print_result(merge_sweep_job(args.job_dir))
+    return 0
+
+
+def cmd_run(args) -> int:
+    if args.config:
+        cmd_init(args)
+    queue = open_queue(args.job_dir, args.lease, args.max_attempts)
+
+    with ProcessPoolExecutor(max_workers=max(args.processes, 1)) as pool:
+        futures = _start_workers(pool, args)
+        while True:
+            queue.requeue_expired()
+            progress = queue.progress()
+            print(_format_progress(progress), flush=True)
+            if queue.is_finished():
+                break
+            # 本机工作进程均已退出（如其余分片由其他主机处理）时继续等待
+            if all(future.done() for future in futures) and progress["pending"]:
+                futures = _start_workers(pool, args)
+            time.sleep(args.poll)
+
+    if queue.progress()["failed"]:
+        print("存在失败分片，请检查 status 输出后重新运行 init 入队", file=sys.stderr)
+        return 1
+    _print_result(merge_sweep_job(args.job_dir))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="多机网格扫描")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_worker_options(p):
+        p.add_argument("--processes", type=int, default=1, help="本机工作进程数")
+        p.add_argument("--max-tasks", type=int, default=None, help="每个进程最多处理的分片数")
+        p.add_argument("--lease", type=float, default=600.0, help="租约秒数，超时未心跳的分片会被回收")
+        p.add_argument("--max-attempts", type=int, default=3, help="每个分片的最大尝试次数")
+
+    p = sub.add_parser("init", help="创建作业并入队全部分片")
+    p.add_argument("job_dir")
+    p.add_argument("config", help="SweepConfig JSON 文件")
+    p.set_defaults(func=cmd_init)
+
+    p = sub.add_parser("worker", help="领取并运行分片")
+    p.add_argument("job_dir")
+    add_worker_options(p)
+    p.set_defaults(func=cmd_worker)
+
+    p = sub.add_parser("status", help="查看作业进度")
+    p.add_argument("job_dir")
+    p.set_defaults(func=cmd_status)
+
+    p = sub.add_parser("merge", help="合并分片结果")
+    p.add_argument("job_dir")
+    p.set_defaults(func=cmd_merge)
+
+    p = sub.add_parser("run", help="协调者：创建作业、运行并合并")
+    p.add_argument("job_dir")
+    p.add_argument("config", nargs="?", help="SweepConfig JSON 文件（作业已存在时可省略）")
+    p.add_argument("--poll", type=float, default=5.0, help="进度轮询间隔（秒）")
+    add_worker_options(p)
+    p.set_defaults(func=cmd_run)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+准入控制测试
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from src.api import routes
+from src.models.config import SimulationConfig
+from src.store.results import ResultStore
+from src.utils.admission import AdmissionController, AdmissionRejected, request_cost
+
+
+class TestAdmissionController:
+    """准入控制器测试"""
+
+    def test_request_cost(self):
+        """测试成本 = 天数 × 地区数 × 场景数"""
+        config = SimulationConfig(simulation_days=100)
+        regions = len(config.get_active_regions())
+        assert request_cost(config) == 100 * regions
+        assert request_cost(config, scenarios=50) == 100 * regions * 50
+
+    def test_queue_and_reject(self):
+        """测试并发已满时排队、队列已满时立即拒绝"""
+        controller = AdmissionController(max_concurrency=1, max_queue=1, cost_budget=100, queue_timeout=5)
+
+        async def scenario():
+            release = asyncio.Event()
+            order = []
+
+            async def hold(name):
+                async with controller.admit(10):
+                    order.append(name)
+                    await release.wait()
+
+            first = asyncio.create_task(hold("first"))
+            await asyncio.sleep(0)
+            second = asyncio.create_task(hold("second"))
+            await asyncio.sleep(0)
+            assert controller.metrics()["queue_depth"] == 1
+
+            with pytest.raises(AdmissionRejected) as rejected:
+                async with controller.admit(10):
+                    pass
+            assert rejected.value.retry_after >= 1
+
+            release.set()
+            await asyncio.gather(first, second)
+            return order
+
+        assert asyncio.run(scenario()) == ["first", "second"]
+        metrics = controller.metrics()
+        assert metrics["admitted"] == 2
+        assert metrics["rejected_queue_full"] == 1
+        assert metrics["running"] == 0 and metrics["in_flight_cost"] == 0
+
+    def test_cost_budget_and_timeout(self):
+        """测试总成本超出预算时等待，超时后拒绝"""
+        controller = AdmissionController(max_concurrency=4, max_queue=4, cost_budget=100, queue_timeout=0.05)
+
+        async def scenario():
+            async with controller.admit(80):
+                with pytest.raises(AdmissionRejected):
+                    async with controller.admit(30):
+                        pass
+                # 超出预算的单个请求按预算计
+                assert controller.in_flight_cost == 80
+            async with controller.admit(1000):
+                assert controller.in_flight_cost == 100
+
+        asyncio.run(scenario())
+        assert controller.metrics()["rejected_timeout"] == 1
+
+
+def test_rejected_with_retry_after(monkeypatch):
+    """测试接口以 429 与 Retry-After 拒绝"""
+    controller = AdmissionController(max_concurrency=1, max_queue=0, cost_budget=100)
+    controller.running = 1
+    monkeypatch.setattr(routes, "admission", controller)
+
+    client = TestClient(app)
+    config = SimulationConfig(simulation_days=30, start_date="2025-01-01").model_dump(mode="json")
+    response = client.post("/api/simulate", json=config)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert client.get("/api/metrics").json()["admission"]["rejected_queue_full"] == 1
+
+
+def test_export_and_stream_admitted(monkeypatch, tmp_path):
+    """测试导出（需要模拟时）与流式接口同样经过准入控制"""
+    controller = AdmissionController(max_concurrency=1, max_queue=0, cost_budget=100)
+    controller.running = 1
+    monkeypatch.setattr(routes, "admission", controller)
+    monkeypatch.setattr(routes, "result_store", ResultStore(str(tmp_path)))
+
+    client = TestClient(app)
+    config = SimulationConfig(
+        simulation_days=30, start_date="2025-01-01", global_fixed_cost=4321.5,
+    ).model_dump(mode="json")
+    response = client.post("/api/export", json=config)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+    response = client.post("/api/simulate/stream", json=config)
+    assert response.status_code == 200
+    assert response.text.startswith("event: error")
+    assert '"retry_after"' in response.text
+    assert controller.metrics()["rejected_queue_full"] == 2
+
+    controller.running = 0
+    assert client.post("/api/export", json=config).status_code == 200
+    assert controller.metrics()["running"] == 0 and controller.metrics()["admitted"] == 1
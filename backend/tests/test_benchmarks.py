@@ -0,0 +1,95 @@
+"""
+性能基准工具测试
+"""
+
+import pytest
+
+from benchmarks.suite import (
+    PROFILES, build_cases, compare, load_baseline, measure, run_suite, save_baseline, scaling_exponents,
+)
+from src.core.simulator import ENGINE_VERSION
+
+
+def _report(results, scaling=None):
+    return {"profile": "quick", "results": results, "scaling": scaling or {}}
+
+
+class TestMeasure:
+    """计时测试"""
+
+    def test_stats(self):
+        """测试统计字段、轮数与 setup 的使用"""
+        calls = []
+        stats = measure(calls.append, setup=lambda: 1, min_rounds=5, max_rounds=5, min_time=0)
+        assert stats["rounds"] == 5
+        assert len(calls) == 7  # 预热 1 轮 + 计时 5 轮 + 内存 1 轮
+        assert stats["min_ms"] <= stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+        assert stats["ops_per_sec"] > 0
+
+    def test_peak_memory(self):
+        """测试峰值内存统计"""
+        stats = measure(lambda _: bytearray(1024 * 1024), min_rounds=1, max_rounds=1, min_time=0)
+        assert stats["peak_memory_kb"] >= 1024
+
+
+class TestCases:
+    """用例与复杂度指数测试"""
+
+    def test_profiles(self):
+        """测试各档位的用例"""
+        quick = {case["name"] for case in build_cases("quick")}
+        full = {case["name"] for case in build_cases("full")}
+        assert quick < full
+        assert "simulate[730d-50r]" in full and "fit_retention" in quick
+        assert len(full) == len(PROFILES["full"]["days"]) * len(PROFILES["full"]["regions"]) + 1 + 4 + 1 + 3
+        with pytest.raises(ValueError):
+            build_cases("huge")
+
+    def test_scaling_exponents(self):
+        """测试按组拟合复杂度指数"""
+        cases = [{"name": f"c{n}", "group": "g", "size": n} for n in (10, 20, 40)]
+        cases.append({"name": "x", "group": "x", "size": None})
+        results = {f"c{n}": {"min_ms": 0.01 * n ** 2} for n in (10, 20, 40)}
+        results["x"] = {"min_ms": 1.0}
+        assert scaling_exponents(cases, results) == {"g": pytest.approx(2.0)}
+
+    def test_run_suite_filter(self):
+        """测试按名称筛选运行"""
+        report = run_suite("quick", "calculate_dau", min_rounds=1, max_rounds=2, min_time=0)
+        assert list(report["results"]) == [f"calculate_dau[{n}]" for n in PROFILES["quick"]["history"]]
+        assert set(report["scaling"]) == {"calculate_dau"}
+        assert report["machine"]["python"]
+        assert report["engine"]["version"] == ENGINE_VERSION
+
+
+class TestCompare:
+    """回退检查测试"""
+
+    def test_slowdown(self):
+        """测试最短耗时变慢超过容忍倍数（p50 的波动不视为回退）"""
+        baseline = _report({"a": {"min_ms": 10.0, "p50_ms": 10.0}, "b": {"min_ms": 10.0, "p50_ms": 10.0}})
+        report = _report({
+            "a": {"min_ms": 14.0, "p50_ms": 30.0}, "b": {"min_ms": 16.0, "p50_ms": 16.0}, "c": {"min_ms": 99.0},
+        })
+        regressions = compare(report, baseline, tolerance=1.5)
+        assert len(regressions) == 1 and regressions[0].startswith("b:")
+
+    def test_noise_floor(self):
+        """测试亚毫秒用例的绝对变慢不超过 REGRESSION_FLOOR_MS 时不视为回退"""
+        baseline = _report({"a": {"min_ms": 0.05}, "b": {"min_ms": 0.5}})
+        report = _report({"a": {"min_ms": 0.2}, "b": {"min_ms": 2.0}})
+        regressions = compare(report, baseline, tolerance=2.0)
+        assert len(regressions) == 1 and regressions[0].startswith("b:")
+
+    def test_scaling_limit(self):
+        """测试复杂度指数超限（不依赖基线）"""
+        report = _report({}, {"simulate/6r": 2.6, "calculate_dau": 1.1, "other": 5.0})
+        regressions = compare(report)
+        assert len(regressions) == 1 and regressions[0].startswith("simulate/6r")
+
+    def test_baseline_round_trip(self, tmp_path):
+        """测试基线保存与读取"""
+        report = _report({"a": {"min_ms": 1.0}}, {"calculate_dau": 0.6})
+        path = save_baseline(report, str(tmp_path / "baselines" / "quick.json"))
+        assert load_baseline(path) == report
+        assert compare(report, load_baseline(path)) == []
@@ -0,0 +1,85 @@
+"""
+模拟检查点与分支测试
+"""
+
+import pytest
+from src.models.config import SimulationConfig, BudgetConfig, DefaultParams
+from src.core.simulator import run_simulation, SimulationEngine, branch
+from src.core.checkpoint import SimulationState
+
+
+def _dump(result):
+    return result.model_dump(exclude={"execution_time_ms"})
+
+
+@pytest.fixture
+def basic_config():
+    """基础配置（2025-01-01 起 120 天）"""
+    return SimulationConfig(
+        simulation_days=120,
+        budget=BudgetConfig(
+            base_ratio=1.0,
+            additional_by_month={"1": 1000},
+            region_distribution={"JP": 0.6, "US": 0.4}
+        ),
+        defaults=DefaultParams(initial_dau=2000, cpi=2.0, arpu_iap=0.02, arpu_ad=0.01),
+        global_fixed_cost=100.0,
+        start_date="2025-01-01",
+    )
+
+
+class TestCheckpoint:
+    """检查点测试"""
+
+    def test_resume_matches_full_run(self, basic_config):
+        """测试序列化后恢复继续模拟与不中断的模拟一致"""
+        data = SimulationEngine(basic_config).run(45).snapshot().to_bytes()
+        state = SimulationState.from_bytes(data)
+        assert state.day == 45
+
+        resumed = SimulationEngine(basic_config, state).run().result()
+        assert _dump(resumed) == _dump(run_simulation(basic_config))
+
+    def test_snapshot_is_detached(self, basic_config):
+        """测试检查点不随引擎继续推进而改变"""
+        engine = SimulationEngine(basic_config).run(10)
+        state = engine.snapshot()
+        engine.run()
+        assert len(state.totals["dau"]) == 10
+        assert len(state.dnu_history["JP"]) == 10
+
+    def test_state_without_series(self, basic_config):
+        """测试轻量检查点不含时序，补上前缀时序后恢复结果一致"""
+        engine = SimulationEngine(basic_config).run(45)
+        light = engine.snapshot(include_series=False).to_bytes()
+        assert len(light) < len(engine.snapshot().to_bytes())
+
+        state = SimulationState.from_bytes(light)
+        assert state.totals is None and state.by_region is None
+        with pytest.raises(ValueError):
+            SimulationEngine(basic_config, state)
+
+        full = engine.snapshot()
+        state.totals, state.by_region = full.totals, full.by_region
+        resumed = SimulationEngine(basic_config, state).run().result()
+        assert _dump(resumed) == _dump(run_simulation(basic_config))
+
+
+class TestBranch:
+    """分支测试"""
+
+    def test_branch_matches_modified_config(self, basic_config):
+        """测试只修改检查点之后月份时，分支结果与完整重算一致"""
+        # 第 90 天结束时为 4 月 1 日之前
+        state = SimulationEngine(basic_config).run(90).snapshot()
+        delta = {"budget": {"additional_by_month": {"4": 5000}}}
+
+        modified = basic_config.model_copy(deep=True)
+        modified.budget.additional_by_month["4"] = 5000
+        assert _dump(branch(state, delta)) == _dump(run_simulation(modified))
+
+    def test_branch_region_mismatch(self, basic_config):
+        """测试分支配置的活跃地区与检查点不一致"""
+        state = SimulationEngine(basic_config).run(30).snapshot()
+        with pytest.raises(ValueError):
+            branch(state, {"budget": {"region_distribution": {"JP": 1.0, "US": 0.0, "KR": 0.0}}})
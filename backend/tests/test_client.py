@@ -0,0 +1,53 @@
+"""
+后端 HTTP 客户端测试
+"""
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from main import app
+from src.api import routes
+from src.core.simulator import run_simulation
+from src.models.config import SimulationConfig
+from src.store.results import result_id_for
+from src.utils.client import BackendBusy, BackendClient, BackendUnavailable
+
+
+@pytest.fixture
+def config():
+    return SimulationConfig(simulation_days=60, start_date="2025-01-01")
+
+
+def test_simulate(config):
+    """测试客户端结果与进程内模拟一致"""
+    client = BackendClient("http://testserver", http=TestClient(app))
+    result = client.simulate(config)
+    expected = run_simulation(config)
+    assert result.result_id == result_id_for(config)
+    assert result.summary == expected.summary
+    assert result.timeseries.totals == expected.timeseries.totals
+    assert client.stats["requests"] == 1 and client.stats["bytes"] > 0
+
+
+def test_errors(config, monkeypatch):
+    """测试繁忙、校验失败与连接失败"""
+    client = BackendClient("http://testserver", http=TestClient(app))
+
+    async def busy(*args):
+        raise HTTPException(status_code=429, detail={"message": "busy"}, headers={"Retry-After": "3"})
+
+    monkeypatch.setattr(routes, "_run_admitted", busy)
+    with pytest.raises(BackendBusy) as excinfo:
+        client.simulate(config)
+    assert excinfo.value.retry_after == 3
+    monkeypatch.undo()
+
+    invalid = config.model_copy(update={"budget": config.budget.model_copy(update={"region_distribution": {"JP": 0.5}})})
+    with pytest.raises(RuntimeError):
+        client.simulate(invalid)
+
+    unreachable = BackendClient("http://127.0.0.1:9", timeout=1.0)
+    with pytest.raises(BackendUnavailable):
+        unreachable.simulate(config)
+    assert unreachable.stats["errors"] == 1
@@ -0,0 +1,121 @@
+"""
+JSON Patch 与增量模拟接口测试
+"""
+
+import pytest
+from pydantic import ValidationError
+from fastapi.testclient import TestClient
+
+from main import app
+from src.models.config import SimulationConfig, PatchOperation
+from src.utils.jsonpatch import PatchError, apply_patch, patch_config
+
+
+def _ops(*operations):
+    return [PatchOperation.model_validate(op) for op in operations]
+
+
+class TestJsonPatch:
+    """JSON Patch 测试"""
+
+    def test_operations(self):
+        """测试各类操作"""
+        document = {"a": {"b": 1}, "c": [1, 2]}
+        patched = apply_patch(document, _ops(
+            {"op": "add", "path": "/a/d", "value": 2},
+            {"op": "replace", "path": "/a/b", "value": 3},
+            {"op": "add", "path": "/c/-", "value": 4},
+            {"op": "move", "from": "/c/0", "path": "/e"},
+            {"op": "copy", "from": "/a/d", "path": "/f"},
+            {"op": "test", "path": "/f", "value": 2},
+        ))
+        assert patched == {"a": {"b": 3, "d": 2}, "c": [2, 4], "e": 1, "f": 2}
+        assert document == {"a": {"b": 1}, "c": [1, 2]}
+
+    def test_missing_path(self):
+        """测试路径不存在"""
+        with pytest.raises(PatchError):
+            apply_patch({"a": {}}, _ops({"op": "remove", "path": "/a/b"}))
+
+    def test_patch_config_validates_changed_field(self):
+        """测试只重新校验被修改的字段"""
+        base = SimulationConfig(start_date="2025-01-01")
+        config = patch_config(base, _ops({"op": "replace", "path": "/defaults/cpi", "value": 2.5}))
+        assert config.defaults.cpi == 2.5
+        assert config.budget is base.budget
+
+        with pytest.raises(ValidationError):
+            patch_config(base, _ops({"op": "replace", "path": "/simulation_days", "value": 0}))
+
+    def test_patch_config_test_on_unchanged_field(self):
+        """测试 test 操作读取补丁未修改的字段"""
+        base = SimulationConfig(start_date="2025-01-01")
+        config = patch_config(base, _ops(
+            {"op": "test", "path": "/simulation_days", "value": 180},
+            {"op": "replace", "path": "/global_fixed_cost", "value": 0},
+        ))
+        assert config.global_fixed_cost == 0 and config.simulation_days == 180
+
+        with pytest.raises(PatchError):
+            patch_config(base, _ops(
+                {"op": "test", "path": "/simulation_days", "value": 90},
+                {"op": "replace", "path": "/global_fixed_cost", "value": 0},
+            ))
+
+
+class TestDeltaApi:
+    """增量模拟接口测试"""
+
+    def test_delta_matches_full_request(self):
+        """测试增量请求与提交完整配置的结果一致"""
+        client = TestClient(app)
+        config = {"simulation_days": 90, "start_date": "2025-01-01"}
+        base = client.post("/api/simulate", json=config).json()
+
+        response = client.post(
+            f"/api/simulate/{base['config_hash']}/delta",
+            json=[{"op": "add", "path": "/budget/additional_by_month/3", "value": 2000}],
+        )
+        assert response.status_code == 200
+
+        full = client.post(
+            "/api/simulate", json={**config, "budget": {"additional_by_month": {"3": 2000}}}
+        ).json()
+        assert response.json()["summary"] == full["summary"]
+        assert response.json()["config_hash"] == full["config_hash"]
+
+    def test_delta_with_test_operation(self):
+        """测试补丁中对未修改字段的 test 操作"""
+        client = TestClient(app)
+        base = client.post("/api/simulate", json={"simulation_days": 60, "start_date": "2025-01-01"}).json()
+        response = client.post(
+            f"/api/simulate/{base['config_hash']}/delta",
+            json=[
+                {"op": "test", "path": "/simulation_days", "value": 60},
+                {"op": "replace", "path": "/global_fixed_cost", "value": 0},
+            ],
+        )
+        assert response.status_code == 200
+
+    def test_delta_etag_and_compression(self):
+        """测试增量请求与 /api/simulate 相同的 ETag 与压缩协商"""
+        client = TestClient(app)
+        config = {"simulation_days": 60, "start_date": "2025-01-01"}
+        base = client.post("/api/simulate", json=config).json()
+        url = f"/api/simulate/{base['config_hash']}/delta"
+        patch = [{"op": "replace", "path": "/global_fixed_cost", "value": 0}]
+
+        response = client.post(url, json=patch, headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        full = client.post("/api/simulate", json={**config, "global_fixed_cost": 0}, headers={"Accept-Encoding": "gzip"})
+        assert response.headers["etag"] == full.headers["etag"]
+
+        cached = client.post(url, json=patch, headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]})
+        assert cached.status_code == 304 and cached.content == b""
+
+    def test_unknown_base(self):
+        """测试基准配置不在缓存中"""
+        client = TestClient(app)
+        response = client.post("/api/simulate/unknown/delta", json=[])
+        assert response.status_code == 404
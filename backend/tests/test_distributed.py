@@ -0,0 +1,81 @@
+"""
+目录型工作队列与多机网格扫描测试
+"""
+
+import os
+from src.models.config import SimulationConfig, SweepConfig
+from src.core import sweep
+from src.core.sweep import run_sweep
+from src.core.distributed import create_sweep_job, run_sweep_worker, merge_sweep_job, job_progress
+from src.utils.workqueue import FileWorkQueue, temp_path
+
+
+class TestFileWorkQueue:
+    """工作队列测试"""
+
+    def test_claim_once(self, tmp_path):
+        """测试同一任务只能被领取一次"""
+        queue = FileWorkQueue(str(tmp_path))
+        queue.put("a", {"n": 1})
+
+        task = queue.claim("w1")
+        assert task.task_id == "a" and task.attempts == 1
+        assert queue.claim("w2") is None
+
+        queue.complete(task)
+        queue.put("a", {"n": 1})
+        assert queue.progress() == {"pending": 0, "claimed": 0, "done": 1, "failed": 0}
+
+    def test_retry_then_failed(self, tmp_path):
+        """测试失败重试与最大尝试次数"""
+        queue = FileWorkQueue(str(tmp_path), max_attempts=2)
+        queue.put("a", {})
+
+        queue.fail(queue.claim(), "boom")
+        assert queue.progress()["pending"] == 1
+        queue.fail(queue.claim(), "boom")
+        assert queue.progress()["failed"] == 1
+        assert queue.failed_tasks()[0].error == "boom"
+
+    def test_requeue_expired(self, tmp_path):
+        """测试租约过期的任务被回收"""
+        queue = FileWorkQueue(str(tmp_path), lease_seconds=60)
+        queue.put("a", {})
+        task = queue.claim()
+        claimed = os.path.join(str(tmp_path), "claimed", "a.json")
+        os.utime(claimed, (0, 0))
+
+        assert queue.requeue_expired() == 1
+        assert queue.claim().attempts == task.attempts + 1
+
+    def test_temp_path_unique(self, tmp_path):
+        """测试临时文件名在同一目录且互不重复（多机共享目录时进程号可能重复）"""
+        path = os.path.join(str(tmp_path), "done", "a.json")
+        names = {temp_path(path) for _ in range(100)}
+        assert len(names) == 100
+        assert all(name.startswith(path + ".") and name.endswith(".tmp") for name in names)
+
+
+class TestDistributedSweep:
+    """多机网格扫描测试"""
+
+    def test_matches_run_sweep(self, tmp_path, monkeypatch):
+        """测试多个工作进程分批处理后合并结果与单机一致"""
+        monkeypatch.setattr(sweep, "POINTS_PER_SHARD", 7)
+        sweep_config = SweepConfig(
+            config=SimulationConfig(simulation_days=45, start_date="2025-01-01"),
+            grid={"defaults.cpi": [1.0, 1.5, 2.0, 2.5, 3.0], "budget.base_ratio": [0.5, 0.8, 1.0, 1.2]},
+            top_k=4,
+        )
+        root = str(tmp_path / "job")
+        assert create_sweep_job(sweep_config, root) == 3
+
+        assert run_sweep_worker(root, "host-a", max_tasks=1) == 1
+        assert job_progress(root)["done"] == 1
+        assert run_sweep_worker(root, "host-b") == 2
+
+        expected = run_sweep(sweep_config)
+        result = merge_sweep_job(root)
+        assert result.points == 20
+        assert result.best == expected.best
+        assert result.summary == expected.summary
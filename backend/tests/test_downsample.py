@@ -0,0 +1,96 @@
+"""
+时序降采样测试
+"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from src.models.config import SimulationConfig
+from src.core.simulator import run_simulation
+from src.store.results import ResultStore
+from src.utils.downsample import lttb_indices
+
+
+def _reference_lttb(y, threshold):
+    """逐点实现的 LTTB（用于对照）"""
+    n = len(y)
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start = int(np.floor(i * every)) + 1
+        stop = int(np.floor((i + 1) * every)) + 1
+        next_start, next_stop = stop, min(int(np.floor((i + 2) * every)) + 1, n - 1)
+        if i == threshold - 3:
+            avg_x, avg_y = n - 1, y[n - 1]
+        else:
+            avg_x = np.mean(np.arange(next_start, next_stop))
+            avg_y = np.mean(y[next_start:next_stop])
+        best, best_area = start, -1.0
+        for j in range(start, stop):
+            area = abs((a - avg_x) * (y[j] - y[a]) - (a - j) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+class TestLttb:
+    """LTTB 测试"""
+
+    def test_matches_reference(self):
+        """测试与逐点实现一致"""
+        rng = np.random.default_rng(0)
+        y = np.cumsum(rng.normal(size=1000))
+        for threshold in (3, 10, 97, 500):
+            assert lttb_indices(y, threshold).tolist() == _reference_lttb(y, threshold)
+
+    def test_preserves_shape(self):
+        """测试保留首尾与尖峰，短序列不降采样"""
+        y = np.zeros(730)
+        y[400] = 100.0
+        indices = lttb_indices(y, 50)
+        assert len(indices) == 50
+        assert indices[0] == 0 and indices[-1] == 729
+        assert 400 in indices
+        assert np.all(np.diff(indices) > 0)
+
+        assert lttb_indices(np.arange(20), 50).tolist() == list(range(20))
+        with pytest.raises(ValueError):
+            lttb_indices(y, 2)
+
+
+def test_projection_max_points(tmp_path):
+    """测试结果投影的降采样"""
+    config = SimulationConfig(simulation_days=365, start_date="2025-01-01")
+    result = run_simulation(config)
+    store = ResultStore(str(tmp_path))
+    stored = store.get(store.put(config.fingerprint(), result))
+
+    output = stored.project(["timeseries.totals"], 0, 365, max_points=100)
+    timeseries = output["timeseries"]
+    assert "dates" not in timeseries and timeseries["start_date"] == "2025-01-01"
+    dau = timeseries["totals"]["dau"]
+    assert len(dau["days"]) == len(dau["values"]) == 100
+    exact = result.timeseries.totals.dau
+    assert all(exact[day - 1] == value for day, value in zip(dau["days"], dau["values"]))
+    assert max(dau["values"]) == max(exact)
+
+
+def test_results_api_max_points():
+    """测试结果接口的 max_points 参数"""
+    client = TestClient(app)
+    config = SimulationConfig(simulation_days=365, start_date="2025-01-01").model_dump(mode="json")
+    result_id = client.post("/api/simulate", json=config).json()["result_id"]
+
+    url = f"/api/results/{result_id}"
+    exact = client.get(url, params={"fields": "timeseries.totals"}).json()["timeseries"]
+    sampled = client.get(url, params={"fields": "timeseries.totals", "max_points": 60}).json()["timeseries"]
+    assert len(exact["totals"]["dau"]) == 365
+    assert len(sampled["totals"]["revenue"]["values"]) == 60
+    assert sampled["max_points"] == 60
+    assert client.get(url, params={"max_points": 2}).status_code == 422
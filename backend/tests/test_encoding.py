@@ -0,0 +1,86 @@
+"""
+响应编码协商测试
+"""
+
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from src.models.config import SimulationConfig
+from src.utils import encoding
+from src.utils.encoding import negotiate_encoding, negotiate_media_type
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def config():
+    return SimulationConfig(simulation_days=60, start_date="2025-01-01").model_dump(mode="json")
+
+
+class TestNegotiation:
+    """协商规则测试"""
+
+    def test_media_type(self, monkeypatch):
+        """测试只有显式请求 msgpack 时才返回 msgpack"""
+        monkeypatch.setattr(encoding, "has_msgpack", lambda: True)
+        assert negotiate_media_type(None) == "application/json"
+        assert negotiate_media_type("*/*") == "application/json"
+        assert negotiate_media_type("application/msgpack, application/json;q=0.5") == "application/msgpack"
+        assert negotiate_media_type("application/msgpack;q=0.5, application/json") == "application/json"
+        assert negotiate_media_type("text/html") is None
+
+        monkeypatch.setattr(encoding, "has_msgpack", lambda: False)
+        assert negotiate_media_type("application/msgpack, */*;q=0.1") == "application/json"
+        assert negotiate_media_type("application/msgpack") is None
+
+    def test_encoding(self, monkeypatch):
+        """测试 br 优先、未安装 brotli 时退回 gzip"""
+        monkeypatch.setattr(encoding, "has_brotli", lambda: True)
+        assert negotiate_encoding("gzip, br") == "br"
+        assert negotiate_encoding("gzip, br;q=0") == "gzip"
+        monkeypatch.setattr(encoding, "has_brotli", lambda: False)
+        assert negotiate_encoding("gzip, br") == "gzip"
+        assert negotiate_encoding("identity") is None
+        assert negotiate_encoding(None) is None
+
+
+def test_gzip_json(client, config):
+    """测试 gzip 压缩的 JSON 与未压缩的结果一致"""
+    plain = client.post("/api/simulate", json=config, headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers
+
+    compressed = client.post("/api/simulate", json=config, headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.headers["ETag"] != plain.headers["ETag"]
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    # TestClient 会自动解压；第二次请求命中缓存，执行时间不同
+    assert {**compressed.json(), "execution_time_ms": 0} == {**plain.json(), "execution_time_ms": 0}
+    assert compressed.num_bytes_downloaded < plain.num_bytes_downloaded / 2
+
+
+def test_msgpack_not_acceptable(client, config, monkeypatch):
+    """测试只接受 msgpack 而服务端不支持时返回 406"""
+    monkeypatch.setattr(encoding, "has_msgpack", lambda: False)
+    response = client.post("/api/simulate", json=config, headers={"Accept": "application/msgpack"})
+    assert response.status_code == 406
+
+
+def test_msgpack_arrays(client, config):
+    """测试 msgpack 响应中的时序为打包数组"""
+    pytest.importorskip("msgpack")
+    plain = client.post("/api/simulate", json=config).json()
+    response = client.post("/api/simulate", json=config, headers={"Accept": "application/msgpack"})
+    assert response.headers["content-type"] == "application/msgpack"
+
+    payload = encoding.unpack_msgpack(response.content)
+    dau = payload["timeseries"]["totals"]["dau"]
+    assert dau.dtype == np.int64
+    assert dau.tolist() == plain["timeseries"]["totals"]["dau"]
+    assert payload["summary"] == json.loads(json.dumps(plain["summary"]))
@@ -0,0 +1,52 @@
+"""
+HTTP 条件请求（ETag）测试
+"""
+
+from fastapi.testclient import TestClient
+
+from main import app
+from src.api import routes
+from src.models.config import SimulationConfig
+from src.utils.etag import make_etag, etag_matches
+
+
+def test_etag_matches():
+    """测试 If-None-Match 解析"""
+    etag = make_etag("abc", "1")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+    assert make_etag("abc", "2") != etag
+
+
+def test_simulate_not_modified(monkeypatch):
+    """测试相同配置命中 ETag 时返回 304 且不运行模拟"""
+    client = TestClient(app)
+    config = SimulationConfig(simulation_days=30, start_date="2025-01-01").model_dump(mode="json")
+    response = client.post("/api/simulate", json=config)
+    etag = response.headers["ETag"]
+
+    def fail(*args):
+        raise AssertionError("不应重新模拟")
+
+    monkeypatch.setattr(routes, "_simulate_and_store", fail)
+    cached = client.post("/api/simulate", json=config, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    # 配置不同时仍会运行模拟（此处被替换为抛出异常）
+    changed = dict(config, simulation_days=31)
+    assert client.post("/api/simulate", json=changed, headers={"If-None-Match": etag}).status_code == 500
+
+    default = client.get("/api/default-config")
+    assert client.get("/api/default-config", headers={"If-None-Match": default.headers["ETag"]}).status_code == 304
+
+    result_url = f"/api/results/{response.json()['result_id']}"
+    result = client.get(result_url, params={"fields": "summary"})
+    assert result.headers["Cache-Control"].startswith("public")
+    assert client.get(result_url, params={"fields": "summary"},
+                      headers={"If-None-Match": result.headers["ETag"]}).status_code == 304
+    assert client.get(result_url, headers={"If-None-Match": result.headers["ETag"]}).status_code == 200
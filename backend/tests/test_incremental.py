@@ -0,0 +1,112 @@
+"""
+增量重算测试
+"""
+
+import pytest
+from src.models.config import SimulationConfig, BudgetConfig, DefaultParams, RegionOverride
+from src.core.simulator import run_simulation
+from src.core.compiled import compile_config
+from src.core.incremental import IncrementalSimulator, first_divergent_day
+
+
+def _dump(result):
+    return result.model_dump(exclude={"execution_time_ms"})
+
+
+@pytest.fixture
+def basic_config():
+    """基础配置（2025-01-01 起 150 天）"""
+    return SimulationConfig(
+        simulation_days=150,
+        budget=BudgetConfig(
+            base_ratio=1.0,
+            additional_by_month={"1": 1000},
+            region_distribution={"JP": 0.6, "US": 0.4}
+        ),
+        defaults=DefaultParams(initial_dau=2000, cpi=2.0, arpu_iap=0.02, arpu_ad=0.01),
+        global_fixed_cost=100.0,
+        start_date="2025-01-01",
+    )
+
+
+class TestFirstDivergentDay:
+    """输入差异定位测试"""
+
+    def test_monthly_override(self, basic_config):
+        """测试月份覆盖只影响该月起的天数"""
+        modified = basic_config.model_copy(deep=True)
+        modified.monthly_overrides = {"04": {"JP": RegionOverride(cpi=2.5)}}
+        # 4 月 1 日为第 90 天（下标）
+        assert first_divergent_day(compile_config(basic_config), compile_config(modified)) == 90
+
+    def test_start_change(self, basic_config):
+        """测试影响开始状态的修改"""
+        modified = basic_config.model_copy(deep=True)
+        modified.defaults.initial_dau = 3000
+        assert first_divergent_day(compile_config(basic_config), compile_config(modified)) == 0
+
+
+class TestIncrementalSimulator:
+    """增量模拟器测试"""
+
+    def test_resume_matches_full_run(self, basic_config):
+        """测试复用前缀后的结果与完整重算一致"""
+        simulator = IncrementalSimulator(checkpoint_interval=30)
+        simulator.simulate(basic_config)
+
+        modified = basic_config.model_copy(deep=True)
+        modified.budget.additional_by_month["5"] = 4000
+        result, reused = simulator.simulate_with_info(modified)
+
+        # 5 月 1 日为第 120 天，最近的检查点为第 120 天
+        assert reused == 120
+        assert _dump(result) == _dump(run_simulation(modified))
+
+    def test_extend_horizon(self, basic_config):
+        """测试延长模拟天数时复用结束检查点"""
+        simulator = IncrementalSimulator(checkpoint_interval=30)
+        simulator.simulate(basic_config)
+
+        longer = basic_config.model_copy(update={"simulation_days": 200})
+        result, reused = simulator.simulate_with_info(longer)
+        assert reused == 150
+        assert _dump(result) == _dump(run_simulation(longer))
+
+    def test_resume_from_inherited_checkpoint(self, basic_config):
+        """测试从继承的检查点恢复时前缀时序取自来源条目"""
+        simulator = IncrementalSimulator(max_entries=1, checkpoint_interval=30)
+        simulator.simulate(basic_config)
+
+        # april 继承第一个配置第 30–90 天的检查点，第一个配置随即被淘汰
+        april = basic_config.model_copy(deep=True)
+        april.budget.additional_by_month["4"] = 3000
+        assert simulator.simulate_with_info(april)[1] == 90
+
+        march = april.model_copy(deep=True)
+        march.budget.additional_by_month["3"] = 2000
+        result, reused = simulator.simulate_with_info(march)
+        assert reused == 30
+        assert _dump(result) == _dump(run_simulation(march))
+
+    def test_cache_hit_and_eviction(self, basic_config):
+        """测试相同配置命中缓存及 LRU 淘汰"""
+        simulator = IncrementalSimulator(max_entries=1)
+        first = simulator.simulate(basic_config)
+        second, reused = simulator.simulate_with_info(basic_config)
+        assert reused == basic_config.simulation_days
+        assert _dump(first) == _dump(second)
+
+        simulator.simulate(basic_config.model_copy(update={"global_fixed_cost": 0.0}))
+        assert simulator.simulate_with_info(basic_config)[1] == 0
+
+
+def test_compiled_digest(basic_config):
+    """测试编译摘要只取决于展开后的参数"""
+    digest = compile_config(basic_config).digest()
+    # 覆盖取值与默认值相同：指纹不同，摘要相同
+    same = basic_config.model_copy(update={"regions": {"JP": RegionOverride(cpi=2.0)}})
+    assert same.fingerprint() != basic_config.fingerprint()
+    assert compile_config(same).digest() == digest
+
+    changed = basic_config.model_copy(update={"regions": {"JP": RegionOverride(cpi=2.5)}})
+    assert compile_config(changed).digest() != digest
@@ -0,0 +1,137 @@
+"""
+后台任务测试
+"""
+
+import pytest
+from pydantic import ValidationError
+from src.models.config import SimulationConfig, DefaultParams, MonteCarloConfig, Distribution, SweepConfig
+from src.core import montecarlo, sweep
+from src.core.jobs import Job, JobManager
+from src.core.montecarlo import run_monte_carlo
+from src.core.sweep import run_sweep
+from src.core.simulator import run_simulation
+from src.utils.workqueue import FileWorkQueue
+
+
+@pytest.fixture
+def basic_config():
+    """基础配置"""
+    return SimulationConfig(
+        simulation_days=60,
+        defaults=DefaultParams(initial_dau=1000, cpi=2.0, arpu_iap=0.01, arpu_ad=0.005),
+        start_date="2025-01-01",
+    )
+
+
+@pytest.fixture
+def small_shards(monkeypatch):
+    """缩小分片与批次，使少量样本也能分成多个分片"""
+    monkeypatch.setattr(montecarlo, "CHUNKS_PER_SHARD", 2)
+    monkeypatch.setattr(sweep, "POINTS_PER_SHARD", 4)
+    monkeypatch.setattr(sweep, "SWEEP_CHUNK_SIZE", 2)
+
+
+class TestJobs:
+    """后台任务测试"""
+
+    def test_results_match_direct_runs(self, basic_config, small_shards):
+        """测试任务结果与直接运行一致"""
+        mc_config = MonteCarloConfig(
+            config=basic_config, samples=50, chunk_size=10,
+            distributions={"defaults.cpi": Distribution(type="normal", mean=2.0, std=0.3)},
+        )
+        sweep_config = SweepConfig(config=basic_config, grid={"defaults.cpi": [1.0, 1.5, 2.0, 2.5, 3.0]})
+
+        manager = JobManager(max_workers=2, queue_dir=None)
+        jobs = {
+            "simulate": manager.submit("simulate", basic_config.model_dump(mode="json")),
+            "monte_carlo": manager.submit("monte_carlo", mc_config.model_dump(mode="json")),
+            "sweep": manager.submit("sweep", sweep_config.model_dump(mode="json")),
+        }
+        manager.shutdown(wait=True)
+
+        expected = {
+            "simulate": run_simulation(basic_config),
+            "monte_carlo": run_monte_carlo(mc_config),
+            "sweep": run_sweep(sweep_config),
+        }
+        for kind, job in jobs.items():
+            status = job.to_dict()
+            assert status["status"] == "succeeded", status["error"]
+            assert status["percent"] == 100.0
+            assert {k: v for k, v in job.result.items() if k != "execution_time_ms"} == \
+                expected[kind].model_dump(mode="json", exclude={"execution_time_ms"})
+
+    def test_cancel_between_chunks(self, basic_config, small_shards):
+        """测试运行中取消：在当前批次完成后停止，保留已完成分片的部分结果"""
+        grid = {"defaults.cpi": [1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5]}
+        sweep_config = SweepConfig(config=basic_config, grid=grid)
+        manager = JobManager(max_workers=1, queue_dir=None)
+        job = Job("job", "sweep", sweep_config.model_dump(mode="json"))
+
+        advance = job.advance
+
+        def cancel_mid_shard(count):
+            if job.done + count >= 6:
+                job._cancel.set()
+            advance(count)
+
+        job.advance = cancel_mid_shard
+        manager._run(job)
+        assert job.status == "cancelled"
+        assert job.done == 6 and job.total == 8
+        assert job.partial["points"] == 4
+        assert job.result is None
+
+    def test_validation_error(self):
+        """测试请求校验失败"""
+        manager = JobManager(queue_dir=None)
+        with pytest.raises(ValidationError):
+            manager.submit("simulate", {"simulation_days": 0})
+        with pytest.raises(ValueError):
+            manager.submit("optimize", {})
+
+
+def test_persistent_queue(tmp_path, basic_config):
+    """测试持久化队列：已结束的任务在重启后可查询，未运行的任务在重启后运行"""
+    queue_dir = str(tmp_path / "jobs")
+    manager = JobManager(max_workers=1, queue_dir=queue_dir)
+    job = manager.submit("simulate", basic_config.model_dump(mode="json"))
+    manager.shutdown(wait=True)
+
+    # 模拟重启前尚未运行的任务
+    FileWorkQueue(queue_dir).put("queued", {"kind": "simulate", "request": basic_config.model_dump(mode="json")})
+
+    restarted = JobManager(max_workers=1, queue_dir=queue_dir)
+    restarted.shutdown(wait=True)
+    assert restarted.get(job.job_id).status == "succeeded"
+    assert restarted.get(job.job_id).result == job.result
+    assert restarted.get("queued").status == "succeeded"
+    assert FileWorkQueue(queue_dir).progress()["pending"] == 0
+
+
+def test_finished_jobs_evicted(tmp_path, basic_config):
+    """测试已结束任务的保留上限：内存中只保留状态，结果与已淘汰的任务从 done/ 读取"""
+    request = basic_config.model_dump(mode="json")
+    manager = JobManager(max_workers=1, queue_dir=None, max_finished=2)
+    jobs = [manager.submit("simulate", request) for _ in range(3)]
+    manager.shutdown(wait=True)
+    assert [job.job_id for job in manager.list()] == [job.job_id for job in jobs[1:]]
+    with pytest.raises(KeyError):
+        manager.get(jobs[0].job_id)
+
+    queue_dir = str(tmp_path / "jobs")
+    manager = JobManager(max_workers=1, queue_dir=queue_dir, max_finished=2)
+    jobs = [manager.submit("simulate", request) for _ in range(3)]
+    manager.shutdown(wait=True)
+    assert all(job._result is None for job in jobs)
+    assert jobs[2].result["summary"] == run_simulation(basic_config).model_dump(mode="json")["summary"]
+    assert len(manager.list()) == 2
+    evicted = manager.get(jobs[0].job_id)
+    assert evicted.status == "succeeded" and evicted.result["summary"] == jobs[2].result["summary"]
+
+    restarted = JobManager(max_workers=1, queue_dir=queue_dir, max_finished=1)
+    restarted.shutdown(wait=True)
+    assert [job.job_id for job in restarted.list()] == [jobs[2].job_id]
+    assert restarted.list()[0]._result is None
+    assert restarted.get(jobs[0].job_id).status == "succeeded"
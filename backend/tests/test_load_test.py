@@ -0,0 +1,73 @@
+"""
+本地压测工具测试
+"""
+
+import os
+
+import pytest
+
+from benchmarks.load_test import (
+    DEFAULT_MIX, make_variants, parse_mix, process_usage, run_load_test, start_server, stop_server, summarize,
+)
+from src.models.config import SimulationConfig
+
+
+class TestRequests:
+    """请求体与请求比例测试"""
+
+    def test_variants(self):
+        """测试变体为合法配置且可复现"""
+        variants = make_variants(10, seed=1)
+        assert len(variants) == 10
+        assert variants == make_variants(10, seed=1)
+        configs = [SimulationConfig.model_validate(variant) for variant in variants]
+        assert len({config.fingerprint() for config in configs}) == 10
+        assert configs[0].simulation_days == 180
+
+    def test_parse_mix(self):
+        """测试请求比例解析"""
+        assert parse_mix("simulate=6,validate=3,export=1") == DEFAULT_MIX
+        assert parse_mix("simulate") == {"simulate": 1.0}
+        with pytest.raises(ValueError):
+            parse_mix("delete=1")
+        with pytest.raises(ValueError):
+            parse_mix("simulate=0")
+
+
+def test_summarize():
+    """测试延迟分位数只统计成功请求，错误率统计全部请求"""
+    records = [("simulate", 200, (i + 1) / 1000, 0.0, 10) for i in range(100)]
+    records += [("simulate", 429, 5.0, 0.0, 0), ("validate", 0, 9.0, 0.0, 0)]
+    report = summarize(records, elapsed=2.0)
+
+    simulate = report["by_endpoint"]["simulate"]
+    assert simulate["requests"] == 101 and simulate["errors"] == 1
+    assert simulate["status_codes"] == {"200": 100, "429": 1}
+    assert simulate["p50_ms"] == pytest.approx(50.5)
+    assert simulate["max_ms"] == pytest.approx(100.0)
+    assert "p50_ms" not in report["by_endpoint"]["validate"]
+    assert report["total"]["throughput_rps"] == 51.0
+    assert report["total"]["error_rate"] == pytest.approx(2 / 102, abs=1e-4)
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/stat"), reason="需要 /proc")
+def test_process_usage():
+    """测试读取进程 CPU 时间与 RSS"""
+    cpu, rss = process_usage(os.getpid())
+    assert cpu > 0 and rss > 1024 * 1024
+
+
+def test_load_test_end_to_end():
+    """测试启动本地服务并完成固定数量的请求"""
+    process, base_url, data_dir = start_server(env={"PL_WARMUP_DEPTH": "none"})
+    try:
+        report = run_load_test(
+            base_url, concurrency=2, requests=12, variants=3, pid=process.pid, sample_interval=0.05,
+        )
+    finally:
+        stop_server(process, data_dir)
+
+    assert report["total"]["requests"] == 12
+    assert report["total"]["errors"] == 0
+    assert set(report["by_endpoint"]) <= set(DEFAULT_MIX)
+    assert process.poll() is not None and not os.path.exists(data_dir.name)
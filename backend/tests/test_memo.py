@@ -0,0 +1,65 @@
+"""
+记忆化缓存测试
+"""
+
+import pytest
+
+from src.core.retention import fit_retention_params
+from src.core.simulator import run_simulation
+from src.models.config import SimulationConfig
+from src.utils.memo import MemoCache
+
+
+class TestMemoCache:
+    """MemoCache 测试"""
+
+    def test_hit_and_eviction(self):
+        """测试命中、LRU 淘汰与统计"""
+        cache = MemoCache(maxsize=2)
+        calls = []
+
+        def compute(key):
+            return lambda: calls.append(key) or key * 10
+
+        assert cache.get_or_compute(1, compute(1)) == 10
+        assert cache.get_or_compute(2, compute(2)) == 20
+        assert cache.get_or_compute(1, compute(1)) == 10
+        cache.get_or_compute(3, compute(3))  # 淘汰最久未使用的 2
+        assert 1 in cache and 2 not in cache and 3 in cache
+        assert calls == [1, 2, 3]
+
+        stats = cache.stats
+        assert stats["hits"] == 1 and stats["misses"] == 3 and stats["evictions"] == 1
+        assert stats["size"] == 2 and stats["hit_rate"] == 0.25
+
+        cache.clear()
+        assert len(cache) == 0 and cache.stats["misses"] == 0
+
+    def test_errors_not_cached(self):
+        """测试计算失败不缓存"""
+        cache = MemoCache()
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            cache.get_or_compute("key", fail)
+        assert "key" not in cache
+        assert cache.get_or_compute("key", lambda: 1) == 1
+
+        with pytest.raises(ValueError):
+            MemoCache(maxsize=0)
+
+    def test_simulation_keyed_on_fingerprint(self):
+        """测试内容相同的配置共用缓存条目"""
+        cache = MemoCache()
+        a = SimulationConfig(simulation_days=30, start_date="2025-01-01")
+        b = SimulationConfig.model_validate(a.model_dump(mode="json"))
+        first = cache.get_or_compute(a.fingerprint(), lambda: run_simulation(a))
+        second = cache.get_or_compute(b.fingerprint(), lambda: run_simulation(b))
+        assert second is first
+        assert cache.stats["hits"] == 1
+
+        points = (0.4, 0.3, 0.25, 0.18, 0.14, 0.1, 0.07)
+        fitted = cache.get_or_compute(points, lambda: fit_retention_params(*points))
+        assert fitted == fit_retention_params(*points)
@@ -0,0 +1,118 @@
+"""
+批量引擎与蒙特卡洛模拟测试
+"""
+
+import pytest
+import numpy as np
+from src.models.config import SimulationConfig, BudgetConfig, DefaultParams, MonteCarloConfig
+from src.core.simulator import run_simulation
+from src.core.compiled import compile_config
+from src.core.batch import simulate_batch
+from src.core.aggregate import QuantileSketch
+from src.core.montecarlo import run_monte_carlo
+
+
+@pytest.fixture
+def basic_config():
+    """基础配置"""
+    return SimulationConfig(
+        simulation_days=90,
+        budget=BudgetConfig(
+            base_ratio=1.0,
+            additional_by_month={"2": 500},
+            region_distribution={"JP": 0.5, "US": 0.5}
+        ),
+        defaults=DefaultParams(initial_dau=1000, cpi=2.0, arpu_iap=0.01, arpu_ad=0.005),
+        regions={"JP": {"cpi": 3.0}},
+        global_fixed_cost=100.0,
+        start_date="2025-01-15",
+    )
+
+
+class TestBatchEngine:
+    """批量引擎测试"""
+
+    def test_matches_run_simulation(self, basic_config):
+        """测试无替换时与 run_simulation 逐位一致"""
+        result = run_simulation(basic_config)
+        batch = simulate_batch(compile_config(basic_config), samples=2, include_regions=True)
+
+        totals = result.timeseries.totals
+        for s in range(2):
+            assert batch.dau[s].tolist() == totals.dau
+            assert batch.revenue[s].tolist() == totals.revenue
+            assert batch.profit[s].tolist() == totals.profit
+        assert batch.total_cost[0] == result.summary.cumulative_metrics.total_cost
+        assert batch.peak_dau_day[0] == result.summary.milestones.peak_dau_day
+        assert batch.by_region["dau"][0, 0].tolist() == result.timeseries.by_region["JP"].dau
+
+    def test_override_matches_modified_config(self, basic_config):
+        """测试字段替换与直接修改配置一致"""
+        modified = basic_config.model_copy(deep=True)
+        modified.regions["JP"].cpi = 2.5
+        result = run_simulation(modified)
+
+        batch = simulate_batch(
+            compile_config(basic_config), samples=1, overrides={"regions.JP.cpi": np.array([2.5])}
+        )
+        assert batch.dau[0].tolist() == result.timeseries.totals.dau
+
+    def test_unknown_override(self, basic_config):
+        """测试未被引用的字段"""
+        with pytest.raises(ValueError):
+            simulate_batch(compile_config(basic_config), overrides={"regions.US.cpi": np.array([2.5])})
+
+
+class TestMonteCarlo:
+    """蒙特卡洛模拟测试"""
+
+    @pytest.fixture
+    def mc_config(self, basic_config):
+        return MonteCarloConfig(
+            config=basic_config,
+            distributions={
+                "defaults.cpi": {"type": "lognormal", "mean": 2.0, "std": 0.3},
+                "defaults.arpu_iap": {"type": "uniform", "low": 0.008, "high": 0.012},
+            },
+            samples=300,
+            seed=7,
+            chunk_size=64,
+        )
+
+    def test_bands_ordered(self, mc_config):
+        """测试分位数区间有序"""
+        result = run_monte_carlo(mc_config)
+
+        assert result.samples == 300
+        for band in result.bands.values():
+            assert len(band.p50) == mc_config.config.simulation_days
+            assert all(lo <= mid <= hi for lo, mid, hi in zip(band.p5, band.p50, band.p95))
+        assert 0.0 <= result.break_even_probability <= 1.0
+
+    def test_deterministic(self, mc_config):
+        """测试相同种子结果一致"""
+        first = run_monte_carlo(mc_config)
+        second = run_monte_carlo(mc_config)
+        assert first.bands == second.bands
+        assert first.summary == second.summary
+
+    def test_invalid_distribution(self):
+        """测试分布参数缺失"""
+        with pytest.raises(ValueError):
+            MonteCarloConfig(distributions={"defaults.cpi": {"type": "normal", "mean": 2.0}})
+
+
+class TestQuantileSketch:
+    """分位数草图测试"""
+
+    def test_accuracy_with_fixed_memory(self):
+        """测试压缩后的分位数精度"""
+        rng = np.random.default_rng(0)
+        data = rng.normal(size=(5000, 3))
+        sketch = QuantileSketch(3, size=128)
+        for start in range(0, 5000, 250):
+            sketch.update(data[start:start + 250])
+
+        assert sketch.values.shape == (3, 128)
+        expected = np.quantile(data, [0.05, 0.5, 0.95], axis=0)
+        np.testing.assert_allclose(sketch.quantile([0.05, 0.5, 0.95]), expected, atol=0.05)
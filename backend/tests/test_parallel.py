@@ -0,0 +1,108 @@
+"""
+网格扫描与多进程分片执行测试
+"""
+
+import pytest
+from src.models.config import SimulationConfig, DefaultParams, MonteCarloConfig, SweepConfig
+from src.core import montecarlo, sweep
+from src.core.montecarlo import run_monte_carlo
+from src.core.sweep import run_sweep
+from src.core.parallel import run_monte_carlo_parallel, run_sweep_parallel
+
+
+@pytest.fixture
+def basic_config():
+    """基础配置"""
+    return SimulationConfig(
+        simulation_days=60,
+        defaults=DefaultParams(initial_dau=1000, cpi=2.0, arpu_iap=0.01, arpu_ad=0.005),
+        global_fixed_cost=50.0,
+        start_date="2025-01-01",
+    )
+
+
+@pytest.fixture
+def small_shards(monkeypatch):
+    """缩小分片，使少量样本也能分成多个分片"""
+    monkeypatch.setattr(montecarlo, "CHUNKS_PER_SHARD", 2)
+    monkeypatch.setattr(sweep, "POINTS_PER_SHARD", 10)
+
+
+class TestSweep:
+    """网格扫描测试"""
+
+    def test_best_sorted(self, basic_config):
+        """测试最优点按目标排序且取值来自网格"""
+        sweep_config = SweepConfig(
+            config=basic_config,
+            grid={"defaults.cpi": [1.0, 2.0, 3.0], "defaults.arpu_iap": [0.005, 0.01]},
+            top_k=3,
+        )
+        result = run_sweep(sweep_config)
+
+        assert result.points == 6
+        values = [point.metrics["net_profit"] for point in result.best]
+        assert values == sorted(values, reverse=True)
+        for point in result.best:
+            assert point.params["defaults.cpi"] in (1.0, 2.0, 3.0)
+            assert point.params["defaults.arpu_iap"] in (0.005, 0.01)
+
+    def test_empty_grid(self):
+        """测试空网格"""
+        with pytest.raises(ValueError):
+            SweepConfig(grid={"defaults.cpi": []})
+
+
+class TestParallel:
+    """多进程执行测试"""
+
+    def test_monte_carlo_matches_sequential(self, basic_config, small_shards):
+        """测试多进程蒙特卡洛与单进程逐位一致"""
+        mc_config = MonteCarloConfig(
+            config=basic_config,
+            distributions={"defaults.cpi": {"type": "lognormal", "mean": 2.0, "std": 0.3}},
+            samples=200,
+            seed=11,
+            chunk_size=16,
+        )
+        expected = run_monte_carlo(mc_config)
+        for workers in (1, 3):
+            result = run_monte_carlo_parallel(mc_config, workers)
+            assert result.bands == expected.bands
+            assert result.summary == expected.summary
+
+    def test_sweep_matches_sequential(self, basic_config, small_shards):
+        """测试多进程网格扫描与单进程逐位一致"""
+        sweep_config = SweepConfig(
+            config=basic_config,
+            grid={"defaults.cpi": [1.0, 1.5, 2.0, 2.5, 3.0], "budget.base_ratio": [0.5, 0.8, 1.0, 1.2, 1.5]},
+            top_k=5,
+        )
+        expected = run_sweep(sweep_config)
+        result = run_sweep_parallel(sweep_config, workers=2)
+        assert result.best == expected.best
+        assert result.summary == expected.summary
+
+
+def test_sweep_api_limits(monkeypatch, basic_config):
+    """测试 /api/sweep 拒绝超过上限的网格，工作进程数不超过 CPU 核数"""
+    from fastapi.testclient import TestClient
+    from main import app
+    from src.api import routes
+
+    calls = []
+    monkeypatch.setattr(routes, "MAX_SWEEP_POINTS", 4)
+    monkeypatch.setattr(routes, "default_workers", lambda: 1)
+    monkeypatch.setattr(routes, "run_sweep_parallel", lambda *args: calls.append(args))
+    client = TestClient(app)
+    request = {"config": basic_config.model_dump(mode="json"), "grid": {"defaults.cpi": [1.0, 2.0, 3.0]}}
+
+    request["grid"]["budget.base_ratio"] = [0.5, 1.0]
+    response = client.post("/api/sweep", json=request)
+    assert response.status_code == 400
+    assert "/api/jobs" in response.json()["detail"]["message"]
+
+    del request["grid"]["budget.base_ratio"]
+    response = client.post("/api/sweep?workers=64", json=request)
+    assert response.status_code == 200
+    assert response.json()["points"] == 3 and calls == []
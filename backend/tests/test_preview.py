@@ -0,0 +1,98 @@
+"""
+周步长预览测试
+"""
+
+import numpy as np
+import pytest
+from src.models.config import SimulationConfig, BudgetConfig, RegionOverride
+from src.core.compiled import compile_config
+from src.core.preview import block_retention_kernel, estimate_error, run_preview, simulate_preview
+from src.core.retention import retention_table
+from src.core.simulator import run_simulation
+
+
+@pytest.fixture
+def config():
+    return SimulationConfig(
+        simulation_days=180,
+        start_date="2025-01-01",
+        budget=BudgetConfig(base_ratio=0.8, additional_by_month={"1": 20000, "3": 50000},
+                            region_distribution={"JP": 0.6, "US": 0.4}),
+        regions={"JP": RegionOverride(cpi=3.0)},
+        global_fixed_cost=200.0,
+    )
+
+
+class TestKernel:
+    """块留存核测试"""
+
+    def test_daily_kernel_is_retention_table(self):
+        """测试步长为 1 时即为逐日留存率表"""
+        alpha, beta, gamma = np.array([0.4]), np.array([-0.5]), np.array([0.98])
+        kernel = block_retention_kernel(alpha, beta, gamma, 1, 50)
+        np.testing.assert_allclose(kernel, retention_table(alpha, beta, gamma, 50))
+
+    def test_block_kernel(self):
+        """测试块核等于块内逐日留存率之和"""
+        alpha, beta, gamma = np.array([0.4]), np.array([-0.5]), np.array([0.98])
+        step, n_blocks = 7, 6
+        table = retention_table(alpha, beta, gamma, (n_blocks + 1) * step)[0]
+        kernel = block_retention_kernel(alpha, beta, gamma, step, n_blocks)[0]
+        for lag in range(n_blocks):
+            expected = sum(
+                table[lag * step + t - s] for s in range(step) for t in range(step) if lag * step + t >= s
+            ) / step
+            assert kernel[lag] == pytest.approx(expected)
+
+
+class TestPreview:
+    """预览模拟测试"""
+
+    def test_close_to_exact(self, config):
+        """测试预览与逐日精确结果的汇总指标接近"""
+        exact = run_simulation(config).summary
+        preview = run_preview(config).summary
+        assert preview.final_metrics.total_dau == pytest.approx(exact.final_metrics.total_dau, rel=0.02)
+        assert preview.cumulative_metrics.total_revenue == pytest.approx(exact.cumulative_metrics.total_revenue, rel=0.02)
+        assert preview.cumulative_metrics.total_cost == pytest.approx(exact.cumulative_metrics.total_cost, rel=0.02)
+        assert preview.cumulative_metrics.cost_fixed == exact.cumulative_metrics.cost_fixed
+
+        errors = estimate_error(compile_config(config))
+        assert set(errors) == {"final_dau", "peak_dau", "total_revenue", "total_cost", "net_profit"}
+        assert all(0 <= value < 0.05 for value in errors.values())
+
+    @pytest.mark.parametrize("days", [180, 365, 730])
+    def test_error_estimate_bounds_exact_difference(self, days):
+        """测试估计误差不小于预览与 run_simulation 的实际差异"""
+        config = SimulationConfig(simulation_days=days, start_date="2025-01-01")
+        errors = estimate_error(compile_config(config))
+        exact = run_simulation(config).summary
+        preview = run_preview(config).summary
+        pairs = {
+            "final_dau": (preview.final_metrics.total_dau, exact.final_metrics.total_dau),
+            "peak_dau": (preview.milestones.peak_dau_value, exact.milestones.peak_dau_value),
+            "total_revenue": (preview.cumulative_metrics.total_revenue, exact.cumulative_metrics.total_revenue),
+            "total_cost": (preview.cumulative_metrics.total_cost, exact.cumulative_metrics.total_cost),
+            "net_profit": (preview.cumulative_metrics.net_profit, exact.cumulative_metrics.net_profit),
+        }
+        for name, (approx, actual) in pairs.items():
+            scale = max(abs(actual), exact.cumulative_metrics.total_cost) if name == "net_profit" else abs(actual)
+            # 预览结果的 DAU 取整到整数，允许 1 个用户的差异
+            assert abs(approx - actual) / scale <= errors[name] + 1 / scale
+
+    def test_result_shape(self, config):
+        """测试预览结果结构与块内常数时序"""
+        result = run_preview(config)
+        assert result.status == "preview"
+        totals = result.timeseries.totals
+        assert len(totals.dau) == len(result.timeseries.dates) == 180
+        assert set(result.timeseries.by_region) == {"JP", "US"}
+        assert len(set(totals.dau[7:14])) == 1
+
+        batch = simulate_preview(compile_config(config))
+        cumulative = result.summary.cumulative_metrics
+        assert cumulative.total_revenue == pytest.approx(batch.revenue[0].sum())
+        assert cumulative.total_cost == pytest.approx(batch.cost[0].sum())
+
+        with pytest.raises(ValueError):
+            simulate_preview(compile_config(config), 0)
@@ -91,3 +91,22 @@ class TestEdgeCases:
         # 应该能正常拟合
         assert alpha > 0
         assert beta < 0
+
+
+class TestLazyImport:
+    """延迟导入与拟合缓存测试"""
+
+    def test_startup_does_not_import_scipy(self):
+        """测试启动 API 服务与命令行工具时不导入 scipy / pandas"""
+        from benchmarks.import_time import heavy_imports, measure_imports
+        for target in ("main", "sweep_cli"):
+            imported = heavy_imports(measure_imports(target))
+            assert "scipy" not in imported and "pandas" not in imported, (target, imported)
+
+    def test_fit_cached(self):
+        """测试相同留存节点只拟合一次"""
+        points = (0.45, 0.36, 0.31, 0.24, 0.19, 0.14, 0.09)
+        first = fit_retention_params(*points)
+        hits = fit_retention_params.cache_info().hits
+        assert fit_retention_params(*points) == first
+        assert fit_retention_params.cache_info().hits == hits + 1
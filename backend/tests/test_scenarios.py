@@ -0,0 +1,96 @@
+"""
+场景库测试
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from src.api import routes
+from src.models.config import SimulationConfig
+from src.core.simulator import run_simulation
+from src.store.scenarios import ScenarioLibrary
+
+
+@pytest.fixture
+def library(tmp_path):
+    """保存三个 60 天场景（CPI 不同）"""
+    library = ScenarioLibrary(str(tmp_path / "scenarios.sqlite3"))
+    for cpi in (1.0, 2.0, 4.0):
+        config = SimulationConfig(simulation_days=60, start_date="2025-01-01", defaults={"cpi": cpi})
+        library.save(config, run_simulation(config), name=f"cpi {cpi}")
+    return library
+
+
+class TestScenarioLibrary:
+    """场景库测试"""
+
+    def test_query_sort_and_paginate(self, library):
+        """测试排序与分页"""
+        total, rows = library.query(sort_by="net_profit", descending=True, limit=2)
+        assert total == 3
+        assert len(rows) == 2
+        assert rows[0]["net_profit"] >= rows[1]["net_profit"]
+        assert "timeseries" not in rows[0]
+
+        _, rest = library.query(sort_by="net_profit", descending=True, limit=2, offset=2)
+        assert rest[0]["net_profit"] <= rows[1]["net_profit"]
+
+    def test_filters(self, library):
+        """测试按汇总指标筛选"""
+        _, rows = library.query()
+        threshold = sorted(row["final_dau"] for row in rows)[1]
+        total, filtered = library.query([("final_dau", ">=", threshold)])
+        assert total == 2
+        assert all(row["final_dau"] >= threshold for row in filtered)
+
+        with pytest.raises(ValueError):
+            library.query([("config_json", "=", "x")])
+        with pytest.raises(ValueError):
+            library.query(sort_by="timeseries")
+
+    def test_get_roundtrip_and_delete(self, library):
+        """测试读取的配置与时序和重新模拟一致"""
+        config = SimulationConfig(simulation_days=60, start_date="2025-01-01", defaults={"cpi": 2.0})
+        summary, stored_config, stored = library.get(config.fingerprint())
+        assert summary["name"] == "cpi 2.0"
+        assert stored_config == config
+
+        result = run_simulation(config)
+        assert stored.to_result().timeseries == result.timeseries
+
+        assert library.delete(config.fingerprint())
+        assert not library.delete(config.fingerprint())
+        with pytest.raises(KeyError):
+            library.get(config.fingerprint())
+
+
+def test_creates_database_directory(tmp_path):
+    """测试数据库所在目录不存在时自动创建"""
+    path = tmp_path / "data" / "scenarios.sqlite3"
+    library = ScenarioLibrary(str(path))
+    assert path.exists()
+    assert library.query()[0] == 0
+
+
+def test_scenario_api(tmp_path, monkeypatch):
+    """测试场景库接口"""
+    monkeypatch.setattr(routes, "scenario_library", ScenarioLibrary(str(tmp_path / "api.sqlite3")))
+    client = TestClient(app)
+
+    config = SimulationConfig(simulation_days=60, start_date="2025-01-01").model_dump(mode="json")
+    saved = client.post("/api/scenarios", json={"config": config, "name": "base"})
+    assert saved.status_code == 200
+    scenario_id = saved.json()["id"]
+
+    listing = client.get("/api/scenarios", params={"sort_by": "roi", "min_final_dau": 0}).json()
+    assert listing["total"] == 1
+    assert listing["items"][0]["name"] == "base"
+
+    detail = client.get(f"/api/scenarios/{scenario_id}", params={"fields": "timeseries.totals.dau"}).json()
+    assert len(detail["result"]["timeseries"]["totals"]["dau"]) == 60
+    assert detail["config"]["simulation_days"] == 60
+
+    assert client.get("/api/scenarios", params={"sort_by": "config_json"}).status_code == 422
+    assert client.delete(f"/api/scenarios/{scenario_id}").status_code == 200
+    assert client.get(f"/api/scenarios/{scenario_id}").status_code == 404
@@ -0,0 +1,80 @@
+"""
+敏感度分析测试
+"""
+
+import pytest
+from src.models.config import SimulationConfig, BudgetConfig, DefaultParams, RetentionConfig
+from src.core.simulator import run_simulation
+from src.core.sensitivity import run_sensitivity
+
+
+@pytest.fixture
+def basic_config():
+    """基础配置"""
+    return SimulationConfig(
+        simulation_days=60,
+        budget=BudgetConfig(
+            base_ratio=1.0,
+            region_distribution={"JP": 0.5, "US": 0.5}
+        ),
+        defaults=DefaultParams(
+            initial_dau=1000,
+            cpi=2.0,
+            arpu_iap=0.01,
+            arpu_ad=0.005,
+            retention=RetentionConfig(
+                day1=0.50,
+                day2=0.40,
+                day3=0.35,
+                day7=0.28,
+                day14=0.22,
+                day30=0.16,
+                day60=0.10,
+            )
+        ),
+        global_fixed_cost=100.0,
+    )
+
+
+class TestSensitivity:
+    """敏感度分析测试"""
+
+    def test_metrics_match_simulation(self, basic_config):
+        """测试指标值与 run_simulation 完全一致"""
+        result = run_simulation(basic_config)
+        sensitivity = run_sensitivity(basic_config, ["defaults.cpi"])
+
+        cum = result.summary.cumulative_metrics
+        assert sensitivity.metrics["final_dau"] == result.summary.final_metrics.total_dau
+        assert sensitivity.metrics["total_revenue"] == cum.total_revenue
+        assert sensitivity.metrics["total_cost"] == cum.total_cost
+        assert sensitivity.metrics["roi"] == cum.roi
+
+    def test_fixed_cost_gradient(self, basic_config):
+        """测试固定成本的梯度等于模拟天数"""
+        sensitivity = run_sensitivity(basic_config, ["global_fixed_cost"])
+
+        assert sensitivity.gradients["cost_fixed"]["global_fixed_cost"] == basic_config.simulation_days
+        assert sensitivity.gradients["net_profit"]["global_fixed_cost"] == -basic_config.simulation_days
+
+    def test_arpu_gradient_without_budget(self, basic_config):
+        """测试零预算时 IAP 收入对 ARPU 的梯度等于累计 DAU"""
+        basic_config.budget.base_ratio = 0.0
+        result = run_simulation(basic_config)
+        sensitivity = run_sensitivity(basic_config, ["defaults.arpu_iap", "regions.JP.arpu_iap"])
+
+        grad = sensitivity.gradients["revenue_iap"]
+        assert grad["defaults.arpu_iap"] == pytest.approx(sum(result.timeseries.totals.dau))
+        # JP 没有地区覆盖，字段未被引用
+        assert grad["regions.JP.arpu_iap"] == 0.0
+
+    def test_cpi_gradient_sign(self, basic_config):
+        """测试 CPI 上升时 DAU 下降"""
+        sensitivity = run_sensitivity(basic_config, ["defaults.cpi"])
+
+        assert sensitivity.gradients["final_dau"]["defaults.cpi"] < 0
+
+    def test_unsupported_input(self, basic_config):
+        """测试不支持的输入字段"""
+        with pytest.raises(ValueError):
+            run_sensitivity(basic_config, ["defaults.retention.day1"])
@@ -135,3 +135,14 @@ class TestSimulatorEdgeCases:
         
         # 无预算时，付费新增应该为 0
         assert all(dnu == 0 for dnu in result.timeseries.totals.dnu_paid)
+
+    def test_retention_cached_beyond_window(self):
+        """测试超出预计算窗口的留存率首次计算后缓存，且与直接计算一致"""
+        from src.core.dau import DAUCalculator
+        from src.core.retention import calc_retention_new
+
+        calculator = DAUCalculator(1000, 0.5, -0.3, 0.98, retention_window=10)
+        for _ in range(30):
+            calculator.calculate_dau(100)
+        assert len(calculator._retention_cache) == 29
+        assert calculator._retention_cache[25] == calc_retention_new(25, 0.5, -0.3, 0.98)
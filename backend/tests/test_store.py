@@ -0,0 +1,79 @@
+"""
+结果存储测试
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+from src.models.config import SimulationConfig
+from src.core.simulator import run_simulation
+from src.store.results import ResultStore, StoredResult
+
+
+@pytest.fixture
+def stored(tmp_path):
+    """保存一个 90 天结果"""
+    config = SimulationConfig(simulation_days=90, start_date="2025-01-01")
+    result = run_simulation(config)
+    store = ResultStore(str(tmp_path))
+    store.put(config.fingerprint(), result)
+    return result, store.get(config.fingerprint())
+
+
+class TestResultStore:
+    """结果存储测试"""
+
+    def test_roundtrip(self, stored):
+        """测试重建的结果与原结果一致"""
+        result, stored_result = stored
+        rebuilt = stored_result.to_result()
+        assert rebuilt.model_dump(exclude={"result_id"}) == result.model_dump(exclude={"result_id"})
+
+    def test_projection_and_range(self, stored):
+        """测试字段投影与日期区间分页"""
+        result, stored_result = stored
+        i0, i1 = stored_result.day_range(date(2025, 2, 1), date(2025, 2, 28), offset=5, limit=10)
+        assert (i0, i1) == (36, 46)
+
+        output = stored_result.project(["timeseries.totals.dau", "summary.milestones"], i0, i1)
+        assert output["timeseries"]["totals"]["dau"] == result.timeseries.totals.dau[36:46]
+        assert output["timeseries"]["dates"][0] == "2025-02-06"
+        assert output["summary"] == {"milestones": result.summary.milestones.model_dump()}
+        assert "by_region" not in output["timeseries"]
+
+        with pytest.raises(KeyError):
+            stored_result.project(["summary.unknown"], i0, i1)
+
+    def test_csv_cumulative_profit(self, stored):
+        """测试分段导出的累计利润与完整导出一致"""
+        _, stored_result = stored
+        full = "".join(stored_result.iter_csv(0, 90)).splitlines()
+        part = "".join(stored_result.iter_csv(30, 40)).splitlines()
+        assert part[1:] == full[31:41]
+
+    def test_from_result_matches_stored(self, stored):
+        """测试由内存结果构建的数组与存储中读取的一致"""
+        result, stored_result = stored
+        in_memory = StoredResult.from_result("id", result)
+        expected = stored_result.project(None, 0, 90, arrays=True)
+        output = in_memory.project(None, 0, 90, arrays=True)
+        assert output["summary"] == expected["summary"]
+        for region in [None] + stored_result.regions:
+            for name in ("dau", "revenue"):
+                np.testing.assert_array_equal(in_memory.series(name, region), stored_result.series(name, region))
+
+    def test_missing(self, tmp_path):
+        """测试结果不存在"""
+        with pytest.raises(KeyError):
+            ResultStore(str(tmp_path)).get("missing")
+
+    def test_result_id_includes_engine_version(self, monkeypatch):
+        """测试引擎版本变化后结果 ID 随之变化（旧版本的结果不再命中）"""
+        from src.store import results
+
+        config = SimulationConfig(simulation_days=30, start_date="2025-01-01")
+        current = results.result_id_for(config)
+        assert current.isalnum() and current != config.fingerprint()
+        monkeypatch.setattr(results, "ENGINE_VERSION", "next")
+        assert results.result_id_for(config) != current
@@ -0,0 +1,65 @@
+"""
+流式模拟测试
+"""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from main import app
+from src.models.config import SimulationConfig
+from src.core.simulator import SimulationEngine, run_simulation
+
+
+def _events(body: str):
+    """解析 SSE 消息"""
+    events = []
+    for message in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in message.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestIterBatches:
+    """生成器接口测试"""
+
+    def test_monthly_batches(self):
+        """测试按自然月分批且拼接结果与完整模拟一致"""
+        config = SimulationConfig(simulation_days=70, start_date="2025-01-15")
+        engine = SimulationEngine(config)
+        batches = list(engine.iter_batches("month"))
+
+        assert [(b["start_day"], b["end_day"]) for b in batches] == [(1, 17), (18, 45), (46, 70)]
+        assert batches[1]["dates"][0] == "2025-02-01"
+
+        expected = run_simulation(config)
+        dau = [value for b in batches for value in b["totals"]["dau"]]
+        assert dau == expected.timeseries.totals.dau
+        assert batches[-1]["milestones"]["peak_dau_value"] == expected.summary.milestones.peak_dau_value
+        assert engine.result().summary == expected.summary
+
+    def test_stop_early(self):
+        """测试停止迭代后不再继续模拟"""
+        engine = SimulationEngine(SimulationConfig(simulation_days=60, start_date="2025-01-01"))
+        next(engine.iter_batches("week"))
+        assert engine.day == 7
+
+
+def test_stream_endpoint():
+    """测试 SSE 接口"""
+    client = TestClient(app)
+    config = SimulationConfig(simulation_days=30, start_date="2025-01-01").model_dump(mode="json")
+    response = client.post("/api/simulate/stream", params={"batch": "week"}, json=config)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = _events(response.text)
+    assert events[0][0] == "start"
+    assert [name for name, _ in events[1:-1]] == ["batch"] * 5
+    assert events[-1][0] == "done"
+    assert client.get(f"/api/results/{events[-1][1]['result_id']}").status_code == 200
+
+    response = client.get("/api/simulate/stream", params={"config": json.dumps(config), "batch": "month"})
+    assert [name for name, _ in _events(response.text)] == ["start", "batch", "done"]
+
+    assert client.get("/api/simulate/stream", params={"config": "{\"simulation_days\": 0}"}).status_code == 400
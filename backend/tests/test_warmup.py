@@ -0,0 +1,80 @@
+"""
+启动预热测试
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from src.api import routes
+from src.core.warmup import WarmupState, warm_up
+
+
+class TestWarmUp:
+    """warm_up 测试"""
+
+    def test_phases_by_depth(self):
+        """测试各预热深度执行的阶段"""
+        assert warm_up("none")["phases_ms"] == {}
+        assert list(warm_up("basic")["phases_ms"]) == ["imports", "config", "retention_fit", "compile"]
+
+        report = warm_up("full", days=10)
+        assert list(report["phases_ms"]) == [
+            "imports", "config", "retention_fit", "compile", "simulate", "batch", "preview",
+        ]
+        assert report["days"] == 10
+        assert report["duration_ms"] >= sum(report["phases_ms"].values()) - 1
+
+    def test_invalid_depth(self):
+        """测试未知的预热深度"""
+        with pytest.raises(ValueError):
+            warm_up("deep")
+
+
+class TestWarmupState:
+    """WarmupState 测试"""
+
+    def test_start_and_wait(self):
+        """测试后台预热完成后就绪"""
+        state = WarmupState()
+        assert not state.ready and state.to_dict()["status"] == "pending"
+        state.start("basic").join(timeout=30)
+        assert state.wait(0)
+        info = state.to_dict()
+        assert info["status"] == "ready" and info["ready"]
+        assert info["report"]["depth"] == "basic" and info["error"] is None
+
+    def test_failure_counts_as_ready(self):
+        """测试预热失败时仍视为就绪并记录错误"""
+        state = WarmupState()
+        state.run("deep")
+        info = state.to_dict()
+        assert info["status"] == "failed" and info["ready"]
+        assert "deep" in info["error"]
+
+
+def test_ready_endpoint(monkeypatch):
+    """测试 /ready 在预热完成前返回 503，完成后返回 200"""
+    state = WarmupState()
+    monkeypatch.setattr(routes, "warmup_state", state)
+    client = TestClient(main.app)
+
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "pending"
+    assert client.get("/health").status_code == 200
+
+    state.run("none")
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["report"]["depth"] == "none"
+    assert client.get("/api/metrics").json()["warmup"]["status"] == "ready"
+
+
+def test_lifespan_starts_warmup(monkeypatch):
+    """测试服务启动时开始预热"""
+    state = WarmupState()
+    monkeypatch.setattr(routes, "warmup_state", state)
+    monkeypatch.setattr(state, "start", lambda: state.run("none"))
+    with TestClient(main.app) as client:
+        assert client.get("/ready").status_code == 200
@@ -24,19 +24,25 @@ if backend_dir_str not in sys.path:
 import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
+import numpy as np
 from datetime import date, timedelta
 from calendar import month_name
+import hashlib
 import json
+from concurrent.futures import ThreadPoolExecutor, wait
 
 # 导入后端模块（使用 src.models 和 src.core）
-# 强制重新加载模块（解决缓存问题）
-import importlib
-import src.models.config
-import src.core.simulator
-import src.core.retention
-importlib.reload(src.models.config)
-importlib.reload(src.core.simulator)
-importlib.reload(src.core.retention)
+# 默认每个进程只导入一次；开发时设置 PL_DEV_RELOAD=1 可在每次重跑时重新加载后端模块，
+# 修改后端代码后无需重启即可生效（会重建 pydantic 模型类并使模块级缓存失效）
+DEV_RELOAD = os.environ.get("PL_DEV_RELOAD", "").lower() in ("1", "true", "yes")
+if DEV_RELOAD:
+    import importlib
+    import src.models.config
+    import src.core.simulator
+    import src.core.retention
+    importlib.reload(src.models.config)
+    importlib.reload(src.core.simulator)
+    importlib.reload(src.core.retention)
 
 from src.models.config import (
     SimulationConfig,
@@ -45,8 +51,132 @@ from src.models.config import (
     RetentionConfig,
     RegionOverride,
 )
-from src.core.simulator import run_simulation
+from src.core.simulator import ENGINE_VERSION, run_simulation
 from src.core.retention import fit_retention_params
+from src.core.compiled import compile_config
+from src.core.preview import PREVIEW_STEP, estimate_error, run_preview
+from src.utils.memo import MemoCache
+
+
+# 记忆化缓存：跨脚本重跑（及会话）保留，输入未变化的重跑不再运行引擎
+@st.cache_resource
+def get_simulation_cache():
+    return MemoCache(maxsize=16)
+
+
+@st.cache_resource
+def get_compiled_cache():
+    return MemoCache(maxsize=16)
+
+
+@st.cache_resource
+def get_retention_fit_cache():
+    return MemoCache(maxsize=64)
+
+
+# 热重载时缓存键不变（ENGINE_VERSION 与配置指纹），每次重跑清空记忆化缓存，避免返回重新加载前代码的结果
+if DEV_RELOAD:
+    for cache in (get_simulation_cache(), get_compiled_cache(), get_retention_fit_cache()):
+        cache.clear()
+
+
+# 精确模拟的后台线程（渐进式预览模式）
+@st.cache_resource
+def get_background_executor():
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="pl-exact")
+
+
+# 提交后台精确模拟后，最多等待该秒数；超时则先显示周步长预览
+EXACT_WAIT_SECONDS = 0.1
+
+# 客户端模式：设置 PL_BACKEND_URL（如 http://localhost:8000）后，精确模拟通过连接池调用 FastAPI 后端，
+# 多个会话共用后端的结果缓存与工作线程；未设置、未安装 httpx 或后端不可用时在进程内模拟
+BACKEND_URL = os.environ.get("PL_BACKEND_URL", "").strip()
+
+
+@st.cache_resource
+def get_backend_client():
+    if not BACKEND_URL:
+        return None
+    from src.utils.client import BackendClient, has_httpx
+    if not has_httpx():
+        return None
+    return BackendClient(BACKEND_URL)
+
+
+backend_client = get_backend_client()
+
+
+def run_exact(config):
+    """逐日精确模拟：客户端模式下调用后端，后端繁忙或不可用时退回进程内模拟"""
+    if backend_client is not None:
+        from src.utils.client import BackendBusy, BackendUnavailable
+        try:
+            return backend_client.simulate(config)
+        except (BackendBusy, BackendUnavailable):
+            pass
+    return run_simulation(config)
+
+
+def simulate_cached(config, caches=None):
+    """
+    记忆化的模拟
+
+    先按规范化配置内容（指纹）查找；未命中时编译配置，按编译后的参数表摘要再查找一次，
+    配置写法变化但展开后的输入不变时（如覆盖值与默认值相同）也不重新模拟。
+    caches 为 (指纹缓存, 编译输入缓存)，在后台线程中调用时由脚本线程传入
+    """
+    simulation_cache, compiled_cache = caches or (get_simulation_cache(), get_compiled_cache())
+    key = (ENGINE_VERSION, config.fingerprint())
+    return simulation_cache.get_or_compute(key, lambda: _simulate_compiled(config, compiled_cache))
+
+
+def _simulate_compiled(config, compiled_cache):
+    key = (ENGINE_VERSION, compile_config(config).digest(), config.output_options.model_dump_json())
+    result = compiled_cache.get_or_compute(key, lambda: run_exact(config))
+    return result.model_copy(update={"config_hash": hashlib.md5(config.model_dump_json().encode()).hexdigest()[:8]})
+
+
+def simulate_progressive(config):
+    """
+    渐进式模拟
+
+    精确结果已缓存时直接返回；否则把精确模拟提交到后台线程，先返回周步长预览，
+    精确结果算完后由 await_exact_result 触发重跑替换预览。
+    本会话中尚未开始的过期请求（滑块拖动途中的中间取值）会被取消。
+
+    Returns:
+        (结果, 后台精确模拟的 Future；结果已是精确值时为 None)
+    """
+    caches = (get_simulation_cache(), get_compiled_cache())
+    key = (ENGINE_VERSION, config.fingerprint())
+    if key in caches[0]:
+        return simulate_cached(config, caches), None
+
+    pending = st.session_state.setdefault("pending_simulations", {})
+    for stale_key in [k for k in pending if k != key]:
+        pending.pop(stale_key).cancel()
+    future = pending.get(key)
+    if future is None:
+        future = pending[key] = get_background_executor().submit(simulate_cached, config, caches)
+
+    wait([future], timeout=EXACT_WAIT_SECONDS)
+    if future.done():
+        pending.pop(key, None)
+        return future.result(), None
+    return run_preview(config), future
+
+
+@st.fragment(run_every=0.5)
+def await_exact_result(future):
+    """轮询后台精确模拟，完成后重跑整个脚本以显示精确结果"""
+    if future.done():
+        st.rerun()
+
+
+def fit_retention_cached(*points):
+    """按 7 个留存节点记忆化的留存拟合"""
+    return get_retention_fit_cache().get_or_compute(points, lambda: fit_retention_params(*points))
 
 # 加载默认配置
 def load_default_config():
@@ -525,7 +655,7 @@ with st.sidebar:
         
         # 显示拟合参数预览
         try:
-            alpha, beta, gamma = fit_retention_params(
+            alpha, beta, gamma = fit_retention_cached(
                 retention_day1, retention_day2, retention_day3,
                 retention_day7, retention_day14, retention_day30, retention_day60
             )
@@ -771,9 +901,15 @@ else:
         },
     )
 
-# 运行模拟
-with st.spinner("🔄 正在运行模拟..."):
-    result = run_simulation(config)
+# 运行模拟（精确结果未缓存时先显示周步长预览，精确结果在后台计算）
+result, exact_future = simulate_progressive(config)
+if exact_future is not None:
+    preview_error = max(estimate_error(compile_config(config)).values())
+    st.info(
+        f"⚡ 当前为预览结果（{PREVIEW_STEP} 天步长近似，估计误差约 {preview_error:.1%}），"
+        "正在后台计算逐日精确结果，完成后自动替换"
+    )
+    await_exact_result(exact_future)
 
 # ============ 显示结果 ============
 
@@ -837,211 +973,213 @@ with st.expander("📋 详细指标"):
 st.divider()
 
 # 图表展示
-# 方案1不显示地区对比标签页
-if config_mode_key == "global":
-    tab1, tab2, tab3 = st.tabs(["📈 DAU & DNU 趋势", "💰 收入/成本/利润趋势", "📊 P&L 累计曲线"])
-else:
-    tab1, tab2, tab3, tab4 = st.tabs(["📈 DAU & DNU 趋势", "💰 收入/成本/利润趋势", "📊 P&L 累计曲线", "🌍 地区对比"])
+# 序列点数超过该值时使用 WebGL 折线（Scattergl），长周期、多地区时重绘不随点数变慢
+WEBGL_MIN_POINTS = 365
 
-with tab1:
-    st.subheader("DAU & DNU 趋势")
-    
-    # DAU 和 DNU 趋势图（统一坐标轴）
-    fig = go.Figure()
-    
-    # DAU
-    fig.add_trace(go.Scatter(
-        x=result.timeseries.days,
-        y=result.timeseries.totals.dau,
-        name="DAU",
-        mode="lines",
-        line=dict(color="#1890ff", width=2),
-        fill="tonexty",
-        fillcolor="rgba(24, 144, 255, 0.1)",
-    ))
-    
-    # DNU 自然
-    fig.add_trace(go.Scatter(
-        x=result.timeseries.days,
-        y=result.timeseries.totals.dnu_organic,
-        name="DNU (自然)",
-        mode="lines",
-        line=dict(color="#52c41a", width=2, dash="dash"),
-    ))
-    
-    # DNU 付费
-    fig.add_trace(go.Scatter(
-        x=result.timeseries.days,
-        y=result.timeseries.totals.dnu_paid,
-        name="DNU (付费)",
-        mode="lines",
-        line=dict(color="#fa8c16", width=2, dash="dash"),
-    ))
-    
-    # DNU 总计
-    dnu_total = [o + p for o, p in zip(result.timeseries.totals.dnu_organic, result.timeseries.totals.dnu_paid)]
-    fig.add_trace(go.Scatter(
-        x=result.timeseries.days,
-        y=dnu_total,
-        name="DNU (总计)",
-        mode="lines",
-        line=dict(color="#722ed1", width=2, dash="dot"),
-    ))
-    
-    fig.update_layout(
-        xaxis_title="天数",
-        yaxis_title="用户数",
-        hovermode="x unified",
-        height=400,
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
 
-with tab2:
-    st.subheader("收入/成本/利润趋势")
-    
-    # 计算每日收入和成本
-    daily_revenue = result.timeseries.totals.revenue
-    daily_cost = result.timeseries.totals.cost
-    daily_profit = result.timeseries.totals.profit
-    
-    fig = go.Figure()
-    
-    # 收入
-    fig.add_trace(go.Scatter(
-        x=result.timeseries.days,
-        y=daily_revenue,
-        name="收入",
-        mode="lines",
-        line=dict(color="#52c41a", width=2),
-        fill="tonexty",
-        fillcolor="rgba(82, 196, 26, 0.1)",
-    ))
-    
-    # 成本
-    fig.add_trace(go.Scatter(
-        x=result.timeseries.days,
-        y=daily_cost,
-        name="成本",
-        mode="lines",
-        line=dict(color="#ff4d4f", width=2),
-        fill="tonexty",
-        fillcolor="rgba(255, 77, 79, 0.1)",
-    ))
-    
-    # 利润
-    fig.add_trace(go.Scatter(
-        x=result.timeseries.days,
-        y=daily_profit,
-        name="利润",
-        mode="lines",
-        line=dict(color="#1890ff", width=2, dash="dash"),
-    ))
-    
-    # 零线
-    fig.add_hline(y=0, line_dash="dot", line_color="gray", opacity=0.5)
-    
-    fig.update_layout(
-        xaxis_title="天数",
-        yaxis_title="金额 ($)",
-        hovermode="x unified",
-        height=400,
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+def series_arrays(series):
+    """RegionTimeseries -> {指标: NumPy 数组}"""
+    return {name: np.asarray(getattr(series, name)) for name in type(series).model_fields}
 
-with tab3:
-    st.subheader("P&L 累计曲线")
-    
-    # 计算累计利润
-    cumulative_profit = []
-    cumulative = 0
-    for profit in result.timeseries.totals.profit:
-        cumulative += profit
-        cumulative_profit.append(cumulative)
-    
-    # P&L 曲线
-    fig = go.Figure()
-    
-    # 累计利润曲线
-    colors = ["#ff4d4f" if p < 0 else "#52c41a" for p in cumulative_profit]
-    fig.add_trace(go.Scatter(
-        x=result.timeseries.days,
-        y=cumulative_profit,
-        name="累计利润",
-        mode="lines",
-        line=dict(width=2),
-        marker=dict(color=colors),
-        fill="tonexty",
-        fillcolor="rgba(82, 196, 26, 0.1)",
-    ))
-    
-    # 盈亏平衡线
-    if result.summary.milestones.break_even_day:
-        be_day = result.summary.milestones.break_even_day
-        fig.add_vline(
-            x=be_day,
-            line_dash="dash",
-            line_color="#faad14",
-            annotation_text=f"盈亏平衡 Day {be_day}",
+
+def line_trace(x, y, **kwargs):
+    """折线：长序列使用 WebGL"""
+    trace = go.Scattergl if len(x) > WEBGL_MIN_POINTS else go.Scatter
+    return trace(x=x, y=y, mode="lines", **kwargs)
+
+
+# 图表区域为独立片段：图表内的控件（如地区指标切换）只重跑该片段，直接使用已算好的结果，
+# 不重新解析侧边栏、构建配置或运行模拟
+@st.fragment
+def render_charts(result, config_mode_key, region_names):
+    # 方案1不显示地区对比标签页
+    if config_mode_key == "global":
+        tab1, tab2, tab3 = st.tabs(["📈 DAU & DNU 趋势", "💰 收入/成本/利润趋势", "📊 P&L 累计曲线"])
+    else:
+        tab1, tab2, tab3, tab4 = st.tabs(["📈 DAU & DNU 趋势", "💰 收入/成本/利润趋势", "📊 P&L 累计曲线", "🌍 地区对比"])
+
+    # 一次性转换为列式数组，后续派生序列均为向量运算
+    days = np.asarray(result.timeseries.days)
+    totals = series_arrays(result.timeseries.totals)
+
+    with tab1:
+        st.subheader("DAU & DNU 趋势")
+
+        # DAU 和 DNU 趋势图（统一坐标轴）
+        fig = go.Figure()
+        fig.add_trace(line_trace(
+            days, totals["dau"],
+            name="DAU",
+            line=dict(color="#1890ff", width=2),
+            fill="tonexty",
+            fillcolor="rgba(24, 144, 255, 0.1)",
+        ))
+        fig.add_trace(line_trace(
+            days, totals["dnu_organic"],
+            name="DNU (自然)",
+            line=dict(color="#52c41a", width=2, dash="dash"),
+        ))
+        fig.add_trace(line_trace(
+            days, totals["dnu_paid"],
+            name="DNU (付费)",
+            line=dict(color="#fa8c16", width=2, dash="dash"),
+        ))
+        fig.add_trace(line_trace(
+            days, totals["dnu_organic"] + totals["dnu_paid"],
+            name="DNU (总计)",
+            line=dict(color="#722ed1", width=2, dash="dot"),
+        ))
+
+        fig.update_layout(
+            xaxis_title="天数",
+            yaxis_title="用户数",
+            hovermode="x unified",
+            height=400,
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
         )
-    
-    # 零线
-    fig.add_hline(y=0, line_dash="dot", line_color="gray")
-    
-    fig.update_layout(
-        xaxis_title="天数",
-        yaxis_title="累计利润 ($)",
-        hovermode="x unified",
-        height=400,
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
 
-if config_mode_key == "regional":
-    with tab4:
-        st.subheader("地区贡献度")
-        
-        if result.timeseries.by_region:
-            # 选择指标
-            metric_type = st.radio(
-                "选择指标",
-                ["DAU", "收入", "成本"],
-                horizontal=True,
+        st.plotly_chart(fig, use_container_width=True)
+
+    with tab2:
+        st.subheader("收入/成本/利润趋势")
+
+        fig = go.Figure()
+        fig.add_trace(line_trace(
+            days, totals["revenue"],
+            name="收入",
+            line=dict(color="#52c41a", width=2),
+            fill="tonexty",
+            fillcolor="rgba(82, 196, 26, 0.1)",
+        ))
+        fig.add_trace(line_trace(
+            days, totals["cost"],
+            name="成本",
+            line=dict(color="#ff4d4f", width=2),
+            fill="tonexty",
+            fillcolor="rgba(255, 77, 79, 0.1)",
+        ))
+        fig.add_trace(line_trace(
+            days, totals["profit"],
+            name="利润",
+            line=dict(color="#1890ff", width=2, dash="dash"),
+        ))
+
+        # 零线
+        fig.add_hline(y=0, line_dash="dot", line_color="gray", opacity=0.5)
+
+        fig.update_layout(
+            xaxis_title="天数",
+            yaxis_title="金额 ($)",
+            hovermode="x unified",
+            height=400,
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        )
+
+        st.plotly_chart(fig, use_container_width=True)
+
+    with tab3:
+        st.subheader("P&L 累计曲线")
+
+        cumulative_profit = np.cumsum(totals["profit"])
+
+        # 累计利润曲线（亏损段红色、盈利段绿色）
+        fig = go.Figure()
+        fig.add_trace(line_trace(
+            days, cumulative_profit,
+            name="累计利润",
+            line=dict(width=2),
+            marker=dict(color=np.where(cumulative_profit < 0, "#ff4d4f", "#52c41a")),
+            fill="tonexty",
+            fillcolor="rgba(82, 196, 26, 0.1)",
+        ))
+
+        # 盈亏平衡线
+        if result.summary.milestones.break_even_day:
+            be_day = result.summary.milestones.break_even_day
+            fig.add_vline(
+                x=be_day,
+                line_dash="dash",
+                line_color="#faad14",
+                annotation_text=f"盈亏平衡 Day {be_day}",
             )
-            
-            # 计算各地区数据
-            region_data = []
-            for region, data in result.timeseries.by_region.items():
-                if metric_type == "DAU":
-                    value = data.dau[-1] if data.dau else 0
-                elif metric_type == "收入":
-                    value = sum(data.revenue) if data.revenue else 0
+
+        # 零线
+        fig.add_hline(y=0, line_dash="dot", line_color="gray")
+
+        fig.update_layout(
+            xaxis_title="天数",
+            yaxis_title="累计利润 ($)",
+            hovermode="x unified",
+            height=400,
+        )
+
+        st.plotly_chart(fig, use_container_width=True)
+
+    if config_mode_key == "regional":
+        with tab4:
+            st.subheader("地区贡献度")
+
+            by_region = result.timeseries.by_region
+            if by_region:
+                # 选择指标
+                metric_type = st.radio(
+                    "选择指标",
+                    ["DAU", "收入", "成本"],
+                    horizontal=True,
+                )
+
+                # 各地区数据：(地区, 天) 矩阵一次取最终值或按天求和
+                field = {"DAU": "dau", "收入": "revenue", "成本": "cost"}[metric_type]
+                matrix = np.array([getattr(data, field) for data in by_region.values()], dtype=np.float64)
+                if matrix.shape[1] == 0:
+                    values = np.zeros(len(by_region))
+                elif metric_type == "DAU":
+                    values = matrix[:, -1]
                 else:
-                    value = sum(data.cost) if data.cost else 0
-                
-                region_data.append({
-                    "地区": region_names.get(region, region),
-                    "值": value,
-                })
-            
-            # 饼图
-            if region_data:
+                    values = matrix.sum(axis=1)
+                names = [region_names.get(region, region) for region in by_region]
+
+                # 饼图
                 fig = px.pie(
-                    values=[d["值"] for d in region_data],
-                    names=[d["地区"] for d in region_data],
+                    values=values,
+                    names=names,
                     title=f"各地区 {metric_type} 贡献度",
                 )
                 st.plotly_chart(fig, use_container_width=True)
-                
+
                 # 数据表
                 st.dataframe(
-                    region_data,
+                    {"地区": names, "值": values},
                     use_container_width=True,
                     hide_index=True,
                 )
 
+render_charts(result, config_mode_key, region_names)
+
 # 执行时间
-st.caption(f"⏱️ 模拟执行时间: {result.execution_time_ms}ms")
+if exact_future is None:
+    st.caption(f"⏱️ 模拟执行时间: {result.execution_time_ms}ms")
+else:
+    st.caption(f"⏱️ 预览执行时间: {result.execution_time_ms}ms")
+
+# 调试面板：记忆化缓存命中情况
+with st.expander("🛠️ 缓存统计", expanded=False):
+    caches = (
+        ("模拟结果（配置指纹）", get_simulation_cache()),
+        ("模拟结果（编译输入）", get_compiled_cache()),
+        ("留存拟合", get_retention_fit_cache()),
+    )
+    for label, cache in caches:
+        stats = cache.stats
+        st.write(
+            f"{label}: 命中 {stats['hits']} / 未命中 {stats['misses']} "
+            f"（命中率 {stats['hit_rate']:.0%}），条目 {stats['size']}/{stats['maxsize']}，淘汰 {stats['evictions']}"
+        )
+    if backend_client is None:
+        st.write("模拟方式: 进程内")
+    else:
+        stats = backend_client.stats
+        st.write(
+            f"模拟方式: 后端 {backend_client.base_url}（{backend_client.media_type}），"
+            f"请求 {stats['requests']} / 失败 {stats['errors']} / 繁忙 {stats['busy']}，下载 {stats['bytes']:,} 字节"
+        )